@@ -0,0 +1,372 @@
+"""
+nandsim 벤치마크 스위트.
+
+- topology 크기(dies/planes/blocks/pages_per_block), run_until_us 길이, bootstrap on/off,
+  phase_conditional 믹스를 축별로 바꾼 고정 시나리오를 실행한다 (축 하나씩, 나머지는 BASE).
+- 시나리오마다 새 프로세스(spawn)에서 실행해 peak RSS 가 서로 섞이지 않게 한다.
+- 지표: events/s, sim-µs per wall-second, peak RSS, scheduled ops (+ events, propose_calls, wall_s).
+- 결과는 JSON({"meta": 환경/커밋, "results": [...]}) 으로 저장해 커밋 간 비교에 쓴다.
+- 비교 모드(--compare): 이전 결과 대비 throughput 하락, peak RSS/propose 지연 증가가 임계치를 넘거나
+  timeline(nand_timeline.csv 와 같은 CSV 직렬화)의 sha256 이 달라지면 회귀로 보고 종료 코드 1.
+- 기동 시간(--startup N): 새 인터프리터에서 `import nandsim_demo` 만 한 경우(headless)와
+  pandas/matplotlib 까지 올린 경우(예전 eager import 와 동일)의 import 시간/RSS 를 N 회씩 측정.
+
+사용 예:
+    python nandsim_bench.py --suite quick --out bench.json
+    python nandsim_bench.py --suite full --only 'topo.blocks=*' --repeat 3
+    python nandsim_bench.py --suite quick --out new.json --compare bench.json --max-throughput-drop 0.15
+    python nandsim_bench.py --startup 20
+"""
+from __future__ import annotations
+import argparse, copy, fnmatch, hashlib, json, os, platform, subprocess, sys, time
+import multiprocessing as mp
+from typing import Any, Dict, List, Optional
+
+import nandsim_demo as nd
+
+# 축별 시나리오의 기준점 (run 길이는 짧게: 축 하나만 바꿨을 때의 스케일링을 본다)
+BASE_OVERRIDES: Dict[str, Any] = {
+    "topology.dies": 1, "topology.planes": 4, "topology.blocks": 32, "topology.pages_per_block": 40,
+    "policy.run_until_us": 5000.0, "bootstrap.enabled": False,
+}
+
+# phase_conditional 믹스: op base 별 가중치 배율 (적용 후 분포마다 재정규화)
+MIXES: Dict[str, Dict[str, float]] = {
+    "default": {},
+    "read_heavy": {"READ": 4.0},
+    "program_heavy": {"PROGRAM": 4.0},
+    "erase_heavy": {"ERASE": 4.0},
+    "no_sr": {"SR": 0.0},
+}
+
+SUITES: Dict[str, Dict[str, List[Any]]] = {
+    "quick": {
+        "topology.dies": [1, 4],
+        "topology.blocks": [32, 512],
+        "policy.run_until_us": [2000.0, 10000.0],
+        "bootstrap.enabled": [False, True],
+        "mix": ["default", "read_heavy"],
+    },
+    "full": {
+        "topology.dies": [1, 2, 4, 8, 16],
+        "topology.planes": [1, 2, 4, 6],
+        "topology.blocks": [8, 64, 512, 4096],
+        "topology.pages_per_block": [40, 200, 2000],
+        "policy.run_until_us": [1000.0, 5000.0, 20000.0, 50000.0],
+        "bootstrap.enabled": [False, True],
+        "mix": list(MIXES),
+    },
+}
+
+_SHORT = {"topology.": "topo.", "policy.run_until_us": "run_until_us", "bootstrap.enabled": "bootstrap"}
+
+def _short(key: str) -> str:
+    for a, b in _SHORT.items():
+        if key.startswith(a):
+            return b + key[len(a):]
+    return key
+
+def scenarios(suite: str) -> List[Dict[str, Any]]:
+    """suite 의 축별 값마다 시나리오 1개 ({"name", "overrides", "mix"}). 축 값이 BASE 와 같아도 포함."""
+    out: List[Dict[str, Any]] = []
+    for axis, values in SUITES[suite].items():
+        for v in values:
+            ov = dict(BASE_OVERRIDES); mix = "default"
+            if axis == "mix":
+                mix = v
+            else:
+                ov[axis] = v
+            out.append({"name": f"{_short(axis)}={v}", "overrides": ov, "mix": mix})
+    return out
+
+def apply_mix(cfg: Dict[str, Any], mix: Dict[str, float]):
+    """phase_conditional 각 분포에서 op base 별 배율을 곱하고 합 1 로 재정규화 (전부 0 이 되는 분포는 유지)."""
+    for key, dist in cfg.get("phase_conditional", {}).items():
+        new = {op: float(w) * float(mix.get(nd._op_base_from_alias(op) or op, 1.0)) for op, w in dist.items()}
+        s = sum(new.values())
+        if s > 0.0:
+            cfg["phase_conditional"][key] = {op: w / s for op, w in new.items()}
+
+def build_cfg(scn: Dict[str, Any], base_cfg: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    cfg = copy.deepcopy(base_cfg if base_cfg is not None else nd.CFG)
+    for k, v in scn["overrides"].items():
+        nd.set_cfg_path(cfg, k, v)
+    apply_mix(cfg, MIXES[scn["mix"]])
+    return cfg
+
+# --------------------------------------------------------------------------
+# Worker (fresh process)
+def _peak_rss_mb() -> float:
+    import resource
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kb / (1024.0 * 1024.0) if sys.platform == "darwin" else kb / 1024.0
+
+def _bench_worker(conn, cfg: Dict[str, Any], log_level: str):
+    try:
+        cfg["logging"] = dict(cfg.get("logging", {}), level=log_level)
+        devnull = open(os.devnull, "w")
+        nd.configure_logging(cfg, stream=devnull)
+        t0 = time.perf_counter()
+        sim = nd.Simulator(cfg)
+        t_build = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        res = sim.run()
+        wall = time.perf_counter() - t0
+        nd.shutdown_logging()
+        st = res.stats
+        csv_text = res.to_dataframe().to_csv(index=False)
+        conn.send({"status": "ok", "error": "",
+                   "t_end_us": res.t_end, "build_s": round(t_build, 4), "wall_s": round(wall, 4),
+                   "events": st["events"], "propose_calls": st["propose_calls"], "scheduled": st["scheduled"],
+                   "events_per_s": round(st["events"] / wall, 1) if wall > 0 else 0.0,
+                   "sim_us_per_wall_s": round(res.t_end / wall, 1) if wall > 0 else 0.0,
+                   "avg_propose_us": round(st["propose_time_s"] / st["propose_calls"] * 1e6, 3) if st["propose_calls"] else 0.0,
+                   "peak_rss_mb": round(_peak_rss_mb(), 1),
+                   "rng_seed": cfg.get("rng_seed"),
+                   "timeline_rows": len(res.rows),
+                   "timeline_sha256": hashlib.sha256(csv_text.encode("utf-8")).hexdigest()})
+    except Exception as e:
+        conn.send({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+def run_scenario(scn: Dict[str, Any], base_cfg: Optional[Dict[str, Any]] = None, log_level: str = "WARNING",
+                 timeout_s: Optional[float] = None) -> Dict[str, Any]:
+    """시나리오 1회를 spawn 프로세스에서 실행 → 지표 dict. timeout 시 status=timeout."""
+    ctx = mp.get_context("spawn")
+    a, b = ctx.Pipe(duplex=False)
+    cfg = build_cfg(scn, base_cfg)
+    cfg_sha = hashlib.sha256(json.dumps(cfg, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    p = ctx.Process(target=_bench_worker, args=(b, cfg, log_level), daemon=True)
+    p.start(); b.close()
+    if a.poll(timeout_s):
+        try:
+            out = a.recv()
+        except EOFError:
+            out = {"status": "error", "error": f"worker exited with code {p.exitcode}"}
+    else:
+        p.terminate()
+        out = {"status": "timeout", "error": f"> {timeout_s}s"}
+    p.join()
+    out["cfg_sha256"] = cfg_sha
+    return out
+
+# --------------------------------------------------------------------------
+# Suite
+def _git_rev() -> Optional[str]:
+    try:
+        here = os.path.dirname(os.path.abspath(__file__))
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=here, capture_output=True, text=True, timeout=10)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=here,
+                               capture_output=True, text=True, timeout=10)
+        return rev.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "") if rev.returncode == 0 else None
+    except Exception:
+        return None
+
+def run_suite(scns: List[Dict[str, Any]], base_cfg: Optional[Dict[str, Any]] = None, repeat: int = 1,
+              log_level: str = "WARNING", timeout_s: Optional[float] = None) -> Dict[str, Any]:
+    """시나리오를 순차 실행(측정 간섭 방지). repeat>1 이면 wall 이 가장 짧은 회차를 채택."""
+    results: List[Dict[str, Any]] = []
+    for scn in scns:
+        best: Optional[Dict[str, Any]] = None
+        for _ in range(max(1, repeat)):
+            r = run_scenario(scn, base_cfg, log_level=log_level, timeout_s=timeout_s)
+            if r["status"] != "ok":
+                best = r; break
+            if best is None or r["wall_s"] < best["wall_s"]:
+                best = r
+        row = {"name": scn["name"], "overrides": scn["overrides"], "mix": scn["mix"]}
+        row.update(best or {})
+        results.append(row)
+        if row["status"] == "ok":
+            print(f"[BENCH] {row['name']:28s} wall={row['wall_s']:8.3f}s events/s={row['events_per_s']:10.1f} "
+                  f"sim_us/s={row['sim_us_per_wall_s']:10.1f} rss={row['peak_rss_mb']:7.1f}MB scheduled={row['scheduled']}")
+        else:
+            print(f"[BENCH] {row['name']:28s} {row['status']}: {row['error']}")
+    meta = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "git_rev": _git_rev(),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "repeat": repeat, "log_level": log_level}
+    return {"meta": meta, "results": results}
+
+# --------------------------------------------------------------------------
+# Startup (import time)
+STARTUP_MODES: Dict[str, str] = {
+    "headless": "import nandsim_demo",
+    "with_viz": "import nandsim_demo; import pandas, matplotlib.pyplot, mpl_toolkits.mplot3d",
+}
+_STARTUP_PROBE = (
+    "import json, sys, time; t0 = time.perf_counter(); {stmt}; dt = time.perf_counter() - t0\n"
+    "import resource; kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "print(json.dumps({{'import_s': dt, 'rss_kb': kb, "
+    "'heavy': sorted(m for m in ('pandas', 'matplotlib', 'numpy') if m in sys.modules)}}))"
+)
+
+def bench_startup(repeat: int = 10) -> Dict[str, Dict[str, Any]]:
+    """모드별로 새 인터프리터를 repeat 회 띄워 import 시간(중앙값/최소)과 peak RSS, 로드된 무거운 모듈을 측정."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in (here, os.environ.get("PYTHONPATH")) if p),
+               MPLBACKEND="Agg")
+    out: Dict[str, Dict[str, Any]] = {}
+    for mode, stmt in STARTUP_MODES.items():
+        runs = []
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            r = subprocess.run([sys.executable, "-c", _STARTUP_PROBE.format(stmt=stmt)], cwd=here, env=env,
+                               capture_output=True, text=True)
+            wall = time.perf_counter() - t0
+            if r.returncode != 0:
+                out[mode] = {"status": "error", "error": r.stderr.strip().splitlines()[-1:]}
+                break
+            d = json.loads(r.stdout.strip().splitlines()[-1]); d["proc_s"] = wall
+            runs.append(d)
+        if not runs or mode in out:
+            continue
+        imp = sorted(d["import_s"] for d in runs); proc = sorted(d["proc_s"] for d in runs)
+        kb = max(d["rss_kb"] for d in runs)
+        out[mode] = {"status": "ok", "repeat": len(runs),
+                     "import_ms_median": round(imp[len(imp) // 2] * 1e3, 1), "import_ms_min": round(imp[0] * 1e3, 1),
+                     "process_ms_median": round(proc[len(proc) // 2] * 1e3, 1),
+                     "peak_rss_mb": round(kb / (1024.0 * 1024.0) if sys.platform == "darwin" else kb / 1024.0, 1),
+                     "heavy_modules": runs[0]["heavy"]}
+    return out
+
+def print_startup(res: Dict[str, Dict[str, Any]]):
+    print(f"{'mode':10s} {'import_ms(med)':>14s} {'import_ms(min)':>14s} {'process_ms':>10s} {'rss_mb':>7s}  heavy modules")
+    for mode, r in res.items():
+        if r["status"] != "ok":
+            print(f"{mode:10s} error: {r['error']}"); continue
+        print(f"{mode:10s} {r['import_ms_median']:14.1f} {r['import_ms_min']:14.1f} {r['process_ms_median']:10.1f} "
+              f"{r['peak_rss_mb']:7.1f}  {', '.join(r['heavy_modules']) or '-'}")
+
+# --------------------------------------------------------------------------
+# Compare (regression gate)
+DEFAULT_THRESHOLDS: Dict[str, float] = {
+    "throughput_drop": 0.10,      # events_per_s, sim_us_per_wall_s 상대 하락 허용치
+    "rss_increase": 0.10,         # peak_rss_mb 상대 증가 허용치
+    "propose_increase": 0.15,     # avg_propose_us 상대 증가 허용치
+}
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], thresholds: Optional[Dict[str, float]] = None,
+            check_timeline: bool = True, only: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    같은 이름의 시나리오끼리 비교 → 항목별 dict 리스트 (regression=True 인 항목이 있으면 게이트 실패).
+    timeline 해시는 양쪽 rng_seed 가 같고(None 이 아님) 시나리오 cfg 해시도 같을 때만 비교한다.
+    rng_seed 가 서로 다르면 비교 자체가 무의미하므로 별도 항목(metric=rng_seed)으로 실패시키고,
+    cfg 해시만 다르면(기본 CFG 변경 등) timeline 비교를 건너뛰고 note 로 남긴다.
+    baseline 에 있는데 current 에 없는 시나리오는 회귀로 본다 (only(fnmatch 리스트)를 주면 매칭되는 것만).
+    """
+    thr = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    base_by = {r["name"]: r for r in baseline.get("results", [])}
+    out: List[Dict[str, Any]] = []
+    checks = [("events_per_s", -1, thr["throughput_drop"]), ("sim_us_per_wall_s", -1, thr["throughput_drop"]),
+              ("peak_rss_mb", +1, thr["rss_increase"]), ("avg_propose_us", +1, thr["propose_increase"])]
+    for cur in current.get("results", []):
+        name = cur["name"]; base = base_by.get(name)
+        if base is None:
+            out.append({"name": name, "metric": "-", "regression": False, "note": "not in baseline"}); continue
+        if cur.get("status") != "ok" or base.get("status") != "ok":
+            bad = cur.get("status") != "ok"
+            out.append({"name": name, "metric": "status", "base": base.get("status"), "cur": cur.get("status"),
+                        "regression": bad, "note": cur.get("error", "")}); continue
+        for metric, sign, limit in checks:
+            b, c = base.get(metric), cur.get(metric)
+            if not b or c is None:
+                continue
+            change = (c - b) / b          # +: 증가
+            out.append({"name": name, "metric": metric, "base": b, "cur": c, "change": round(change, 4),
+                        "regression": (sign * change) > limit, "note": ""})
+        if base.get("rng_seed") != cur.get("rng_seed"):
+            out.append({"name": name, "metric": "rng_seed", "base": base.get("rng_seed"), "cur": cur.get("rng_seed"),
+                        "regression": True, "note": "seed mismatch; results are not comparable"})
+            continue
+        if base.get("cfg_sha256") and cur.get("cfg_sha256") and base["cfg_sha256"] != cur["cfg_sha256"]:
+            out.append({"name": name, "metric": "cfg_sha256", "base": base["cfg_sha256"][:12],
+                        "cur": cur["cfg_sha256"][:12], "regression": False,
+                        "note": "scenario cfg changed; timeline not compared"})
+            continue
+        if check_timeline and cur.get("rng_seed") is not None and base.get("timeline_sha256"):
+            same = (cur.get("timeline_sha256") == base.get("timeline_sha256"))
+            out.append({"name": name, "metric": "timeline_sha256", "base": base["timeline_sha256"][:12],
+                        "cur": (cur.get("timeline_sha256") or "")[:12], "regression": not same,
+                        "note": "" if same else "generated timeline changed"})
+    cur_names = {r["name"] for r in current.get("results", [])}
+    for name in base_by:
+        if name in cur_names or (only and not any(fnmatch.fnmatch(name, g) for g in only)):
+            continue
+        out.append({"name": name, "metric": "status", "base": base_by[name].get("status"), "cur": "missing",
+                    "regression": True, "note": "missing from current results"})
+    return out
+
+def print_comparison(items: List[Dict[str, Any]]):
+    print("\n=== Benchmark Comparison ===")
+    for it in items:
+        flag = "REGRESSION" if it["regression"] else "ok"
+        if "change" in it:
+            print(f"{it['name']:28s} {it['metric']:18s} {it['base']:>12} -> {it['cur']:>12} ({it['change']:+.1%}) {flag}")
+        else:
+            print(f"{it['name']:28s} {it['metric']:18s} {str(it.get('base', '')):>12} -> {str(it.get('cur', '')):>12} {flag} {it['note']}")
+    n = sum(1 for it in items if it["regression"])
+    print(f"regressions: {n}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="nandsim benchmark suite")
+    ap.add_argument("--suite", choices=sorted(SUITES), default="quick")
+    ap.add_argument("--only", action="append", default=[], metavar="GLOB",
+                    help="시나리오 이름 필터 (fnmatch, 반복 지정 가능). 예: 'topo.dies=*'")
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--timeout", type=float, default=None, help="시나리오당 제한 시간(초)")
+    ap.add_argument("--log-level", default="WARNING")
+    ap.add_argument("--base", help="base cfg JSON 파일 (기본: nandsim_demo.CFG)")
+    ap.add_argument("--out", default="bench.json")
+    ap.add_argument("--list", action="store_true", help="시나리오 이름만 출력")
+    ap.add_argument("--startup", type=int, default=0, metavar="N",
+                    help="시나리오 대신 기동(import) 시간 벤치마크를 N 회씩 실행 (결과는 --out 에 저장)")
+    ap.add_argument("--compare", metavar="BASELINE_JSON", help="이전 결과와 비교, 회귀 시 종료 코드 1")
+    ap.add_argument("--current", metavar="RESULT_JSON", help="실행 대신 저장된 결과를 --compare 대상으로 사용")
+    ap.add_argument("--max-throughput-drop", type=float, default=DEFAULT_THRESHOLDS["throughput_drop"])
+    ap.add_argument("--max-rss-increase", type=float, default=DEFAULT_THRESHOLDS["rss_increase"])
+    ap.add_argument("--max-propose-increase", type=float, default=DEFAULT_THRESHOLDS["propose_increase"])
+    ap.add_argument("--allow-timeline-change", action="store_true", help="timeline 해시 변경을 회귀로 보지 않음")
+    args = ap.parse_args(argv)
+
+    scns = scenarios(args.suite)
+    if args.only:
+        scns = [s for s in scns if any(fnmatch.fnmatch(s["name"], g) for g in args.only)]
+    if args.list:
+        for s in scns:
+            print(s["name"])
+        return 0
+    if args.startup:
+        res = bench_startup(args.startup)
+        print_startup(res)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "git_rev": _git_rev(),
+                                "python": platform.python_version(), "platform": platform.platform()},
+                       "startup": res}, f, indent=2)
+        return 0 if all(r["status"] == "ok" for r in res.values()) else 1
+    if args.current:
+        with open(args.current, encoding="utf-8") as f:
+            report = json.load(f)
+    else:
+        base = None
+        if args.base:
+            with open(args.base, encoding="utf-8") as f:
+                base = json.load(f)
+        report = run_suite(scns, base_cfg=base, repeat=args.repeat, log_level=args.log_level, timeout_s=args.timeout)
+        report["meta"]["suite"] = args.suite
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[BENCH] saved {len(report['results'])} scenario(s) to {args.out}")
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    items = compare(baseline, report, thresholds={"throughput_drop": args.max_throughput_drop,
+                                                  "rss_increase": args.max_rss_increase,
+                                                  "propose_increase": args.max_propose_increase},
+                    check_timeline=not args.allow_timeline_change, only=args.only or None)
+    print_comparison(items)
+    return 1 if any(it["regression"] for it in items) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
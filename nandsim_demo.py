@@ -4,37 +4,207 @@
 # - Latch/DOUT 중 SR 예약 금지 케이스를 bus/excl에서 일관되게 차단
 
 from __future__ import annotations
-import heapq, random, sys, os, time
-from dataclasses import dataclass, field
+import atexit, bisect, copy, gzip, heapq, logging, logging.handlers, operator, pickle, queue, random, sys, os, threading, time, types
+from dataclasses import dataclass, field, fields
 from enum import Enum, auto
-from typing import List, Dict, Any, Optional, Tuple, Set
-from collections import defaultdict
+from typing import List, Dict, Any, Mapping, Optional, Tuple, Set
+from collections import defaultdict, deque
+from functools import partial
 import csv
+import numpy as np
 from viz_tools import TimelineLogger, plot_gantt, plot_gantt_by_die, plot_block_page_sequence_3d, plot_block_page_sequence_3d_by_die
 from viz_tools import validate_timeline, print_validation_report, violations_to_dataframe
 from viz_tools import export_patterns, pattern_preview_dataframe
 from viz_tools import plot_target_heatmap
 from viz_tools import compute_block_usage_stats, save_block_usage_stats, print_block_usage_summary
 
+# --------------------------------------------------------------------------
+# Logging
+# component 별 logger (<module>.sched/.addr/.obl/.state/.run). 이벤트 단위 라인(SCHED/START/END, PRECCHK,
+# OBLIG created, SR bus debug)은 DEBUG, 실행 요약/통계는 INFO, schedule-time 충돌 등은 WARNING.
+# INFO 이상이면 이벤트 단위 메시지는 포맷/인자 계산 없이 건너뛴다 (hot path 는 isEnabledFor 로 가드).
+LOG = logging.getLogger(__name__)
+LOG_SCHED = logging.getLogger(f"{__name__}.sched")
+LOG_ADDR = logging.getLogger(f"{__name__}.addr")
+LOG_OBL = logging.getLogger(f"{__name__}.obl")
+LOG_STATE = logging.getLogger(f"{__name__}.state")
+LOG_RUN = logging.getLogger(f"{__name__}.run")
+DEBUG = logging.DEBUG
+
+class _BatchWriter(logging.Handler):
+    """포맷된 라인을 모아 batch_lines 개마다(또는 flush 시) stream 에 한 번에 write."""
+    def __init__(self, stream, batch_lines: int = 512, owns: bool = False):
+        super().__init__()
+        self.stream = stream; self.batch_lines = max(1, int(batch_lines)); self.owns = owns
+        self.buf: List[str] = []
+
+    def emit(self, record):
+        try:
+            self.buf.append(self.format(record))
+        except Exception:
+            self.handleError(record); return
+        if len(self.buf) >= self.batch_lines:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.buf:
+                self.stream.write("\n".join(self.buf) + "\n")
+                self.buf.clear()
+            if self.stream is not None and hasattr(self.stream, "flush"):
+                self.stream.flush()
+        finally:
+            self.release()
+
+    def close(self):
+        try:
+            self.flush()
+            if self.owns:
+                self.stream.close()
+        finally:
+            super().close()
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    # 같은 프로세스 안의 writer 스레드가 소비하므로 record 를 그대로 넘김 (포맷은 writer 스레드에서)
+    def prepare(self, record):
+        return record
+
+class _LogWriterThread(threading.Thread):
+    """queue 의 record 를 writer 핸들러로 넘기는 백그라운드 스레드. flush_interval_s 동안 입력이 없으면 flush."""
+    def __init__(self, q, handlers: List[logging.Handler], flush_interval_s: float):
+        super().__init__(name="nandsim-log-writer", daemon=True)
+        self.q = q; self.handlers = handlers; self.flush_interval_s = max(0.01, float(flush_interval_s))
+
+    def run(self):
+        while True:
+            try:
+                rec = self.q.get(timeout=self.flush_interval_s)
+            except queue.Empty:
+                for h in self.handlers: h.flush()
+                continue
+            if rec is None:
+                break
+            if isinstance(rec, threading.Event):
+                for h in self.handlers: h.flush()
+                rec.set(); continue
+            for h in self.handlers:
+                if rec.levelno >= h.level:
+                    h.handle(rec)
+        for h in self.handlers: h.flush()
+
+# 현재 설정 (pid: fork 된 자식에서는 부모의 핸들러/스트림을 닫지 않고 버림)
+_LOG_STATE: Dict[str, Any] = {"pid": None, "handlers": [], "queue": None, "thread": None}
+
+def _level(v) -> int:
+    return v if isinstance(v, int) else logging.getLevelName(str(v).upper())
+
+def configure_logging(cfg: Dict[str, Any], stream=None, path: Optional[str] = None):
+    """
+    cfg["logging"] 과 cfg["export"](log_to_file/log_path/log_tee) 로 모듈 logger 를 설정 (기존 설정은 교체).
+    - 출력: stream 이 주어지면 그 stream, 아니면 log_to_file 시 path(기본 export.log_path) 파일
+      (+ log_tee 면 stdout), 아니면 stdout. 출력마다 _BatchWriter 하나.
+    - logging.async=True 면 QueueHandler → 백그라운드 writer 스레드에서 포맷/쓰기.
+    """
+    shutdown_logging()
+    lc = cfg.get("logging", {}); exp = cfg.get("export", {})
+    batch = int(lc.get("batch_lines", 512))
+    writers: List[logging.Handler] = []
+    if stream is not None:
+        writers.append(_BatchWriter(stream, batch))
+    else:
+        if bool(exp.get("log_to_file", False)):
+            f = open(path or str(exp.get("log_path", "run.log")), "w", encoding="utf-8", newline="")
+            writers.append(_BatchWriter(f, batch, owns=True))
+        if not writers or bool(exp.get("log_tee", True)):
+            writers.append(_BatchWriter(sys.stdout, batch))
+    fmt = logging.Formatter("%(message)s")
+    for w in writers: w.setFormatter(fmt)
+
+    LOG.setLevel(_level(lc.get("level", "INFO")))
+    LOG.propagate = False
+    for comp, lv in lc.get("levels", {}).items():
+        logging.getLogger(f"{__name__}.{comp}").setLevel(_level(lv))
+    if bool(lc.get("async", True)):
+        q = queue.SimpleQueue()
+        th = _LogWriterThread(q, writers, float(lc.get("flush_interval_s", 0.5)))
+        th.start()
+        LOG.addHandler(_LazyQueueHandler(q))
+        _LOG_STATE.update(queue=q, thread=th)
+    else:
+        for w in writers: LOG.addHandler(w)
+    _LOG_STATE.update(pid=os.getpid(), handlers=writers)
+
+def flush_logging():
+    """writer 스레드가 지금까지 들어온 record 를 모두 쓰고 flush 할 때까지 대기."""
+    if _LOG_STATE["pid"] != os.getpid():
+        return
+    th = _LOG_STATE["thread"]
+    if th is not None and th.is_alive():
+        ev = threading.Event(); _LOG_STATE["queue"].put(ev); ev.wait()
+    else:
+        for h in _LOG_STATE["handlers"]: h.flush()
+
+def shutdown_logging():
+    """writer 스레드 종료, 남은 라인 flush, 핸들러 제거/닫기."""
+    for h in list(LOG.handlers):
+        LOG.removeHandler(h)
+    if _LOG_STATE["pid"] == os.getpid():
+        th = _LOG_STATE["thread"]
+        if th is not None and th.is_alive():
+            _LOG_STATE["queue"].put(None); th.join()
+        for h in _LOG_STATE["handlers"]:
+            h.close()
+    _LOG_STATE.update(pid=None, handlers=[], queue=None, thread=None)
+
+atexit.register(shutdown_logging)
+
 # --------------------------------------------------------------------------
 # Simulation resolution
 SIM_RES_US = 0.01
 def quantize(t: float) -> float:
     return round(t / SIM_RES_US) * SIM_RES_US
 
+# Fixed-point time: integer ticks of SIM_RES_US
+def to_ticks(t: float) -> int:
+    return round(t / SIM_RES_US)
+
+def from_ticks(ticks: int) -> float:
+    return ticks * SIM_RES_US
+
+class TimeBase:
+    """
+    시뮬레이션 시각 표현 (저장값). 코어 상태는 모두 이 단위로 들고 계산한다: Scheduler.now/event key,
+    plane available/reservation, bus reservation, exclusion window, obligation deadline, latch, StateTimeline,
+    op state 기간(StateSeg.dur_k), CompiledCfg 의 *_k 기간. µs 변환은 로그/timeline row/내보내기에서만.
+    - "float": quantize()된 µs float (기존 방식). 합은 norm()=quantize 로 격자에 다시 맞춘다
+    - "ticks": SIM_RES_US 단위 정수 tick. 정수 합이라 norm()=round 는 값을 그대로 돌려준다
+      (비교/정렬이 정확하고, 큰 now 에서도 drift 없음)
+    key(t_us) -> 저장값, us(v) -> µs, dur(d_us) -> 기간 저장값, norm(v) -> 격자 위 저장값, res = 격자 한 칸.
+    코어 레코드의 *_us 필드(PhaseHook.time_us, Obligation.deadline_us, StateInterval.start_us/end_us)는
+    이름만 예전 그대로이고 값은 저장값이다.
+    from_ticks(to_ticks(t)) == quantize(t) 라 보통 두 모드는 같은 타임라인을 만든다. 다만 float 합이 격자
+    경계를 살짝 넘는 경우(2551.0+0.2 -> 2551.2000000000003) 경계 비교가 갈릴 수 있고, 이때는 ticks 쪽이 정확하다.
+    """
+    def __init__(self, mode: str = "float"):
+        mode = str(mode).lower()
+        if mode not in ("float", "ticks"):
+            raise ValueError(f"unknown time_base: {mode} (use float|ticks)")
+        self.mode = mode
+        self.ticks = (mode == "ticks")
+        self.key = to_ticks if self.ticks else quantize
+        self.us = from_ticks if self.ticks else float
+        self.dur = to_ticks if self.ticks else float
+        self.norm = round if self.ticks else quantize
+        self.res = 1 if self.ticks else SIM_RES_US
+
+    @classmethod
+    def from_cfg(cls, cfg: Dict[str, Any]) -> "TimeBase":
+        return cls(cfg.get("time_base", "float"))
+
 # --------------------------------------------------------------------------
 # Config
-# --- Patches: RNG seed + fixed-duration enforcement for validate_timeline ---
-def _seed_rng_from_cfg(cfg):
-    import random
-    try:
-        seed = cfg.get("rng_seed", None)
-        if seed is not None:
-            random.seed(int(seed))
-            print(f"[INIT] random.seed({seed})")
-    except Exception as e:
-        print(f"[INIT] random.seed skipped: {e}")
-
+# --- Patches: fixed-duration enforcement for validate_timeline ---
 def _coerce_states_to_fixed(cfg):
     """
     Ensure all op_specs.states use fixed durations; if not, convert using representative stats.
@@ -63,16 +233,13 @@ def _coerce_states_to_fixed(cfg):
                 st["dist"] = {"kind":"fixed", "value": float(val)}
                 converted += 1
     if converted:
-        print(f"[INIT] coerced {converted} state dists to fixed for validation")
+        LOG_RUN.info("[INIT] coerced %d state dists to fixed for validation", converted)
 
 def _validate_phase_conditional_cfg(cfg):
     """
     Ensure each phase_conditional distribution has no negative weights and
     normalize to sum to 1.0 if necessary (within epsilon). Log when normalization occurs.
     """
-    import logging
-    logger = logging.getLogger(__name__)
-
     pc = cfg.get("phase_conditional", {})
     eps = 1e-6
     for key, dist in pc.items():
@@ -92,18 +259,29 @@ def _validate_phase_conditional_cfg(cfg):
             factor = 1.0 / s
             for k in list(dist.keys()):
                 dist[k] = float(dist[k]) * factor
-            logger.warning(f"[CFG] normalized phase_conditional[%s]: sum %.6f -> 1.0", key, s)
+            LOG_RUN.warning("[CFG] normalized phase_conditional[%s]: sum %.6f -> 1.0", key, s)
 
 CFG = {
     "rng_seed": 12345,
     "policy": {
         "queue_refill_period_us": 50.0,
+        # 제안 트리거: periodic(queue_refill_period_us 마다 모든 die×plane 에 REFILL.NUDGE) |
+        # wakeup(주기 sweep 없음. (die, plane) 별 EV_WAKEUP: 빈손 propose 뒤 막힌 자원(plane/bus/exclusion)이 풀리거나
+        # 의무가 ready 되거나 같은 die 의 op 가 끝날 때 다시 propose, 그 외는 period×2^k backoff. 확실히 빈손인 die 의 훅은 생략).
+        # 막힌 propose 가 다음 주기 대신 해제 시각에 재시도되므로 op 출력은 periodic 과 다르다 (같은 seed 에서 결정적)
+        "refill_mode": "periodic",
         "run_until_us": 2000.0,
         "planner_max_tries": 8,
         "hookscreen": {"startplane_scan": 2, "horizon_us": 0.30, "global_obl_iters": 1},
         # PHASE_HOOK 차단: op.kind 기준 훅 생성 비활성화(빈 리스트면 비활성화 없음)
         # 예: ["DOUT", "SR"]
         "phase_hook_disabled_kinds": ["SR"],
+        # PHASE_HOOK 솎아내기/병합 (enabled):
+        # - drop_idle: 발화 시 propose 가 확실히 빈손인 훅은 propose 없이 drop (op 출력 불변)
+        #   = phase_conditional 이 막혀 있고(off 또는 bootstrap 대기) 이 die 의 의무가 아직 horizon 밖
+        # - bucket_us>0: 같은 (die, plane, bucket, label) 훅은 하나로 병합, per_die_budget>0: die 별 대기 훅 수 상한(초과분 drop)
+        #   둘은 훅 흐름(=workload)을 바꾸므로 op 출력이 달라진다 (기본 off)
+        "hook_coalesce": {"enabled": False, "bucket_us": 0.0, "per_die_budget": 0, "drop_idle": True},
         # bootstrap 러닝타임 여유 = last_deadline_boot + margin_per_ob * num_bootstrap_obligations
         "run_until_bootstrap_margin_per_ob_us": 5.0,
         "enable_phase_conditional": True,
@@ -301,11 +479,45 @@ CFG = {
     },
 
     "export": {"tu_us": 0.01, "nop_symbol": "NOP", "wait_as_nop": True, "drift_correction": True,
-                "log_to_file": False, "log_path": "run.log", "log_tee": True},
+                "log_to_file": False, "log_path": "run.log", "log_tee": True,
+                # False: TimelineLogger/분리 로깅 버퍼에 row 를 쌓지 않음 (Scheduler.iter_ops/subscribe 스트림으로만 소비)
+                "buffer_timeline": True,
+                # False: reject/obligation creation row 를 쌓지 않고(stage/reason 카운트만 유지), StateTimeline 의 닫힌 segment 와
+                # exclusion 창 중 now 이전에 끝난 것을 주기적으로 버림 → buffer_timeline=False 와 함께 장기 스트리밍 메모리 일정
+                "buffer_history": True},
+
+    # stage 프로파일: propose/schedule 파이프라인 stage 별 호출 수/누적 시간 (stats["profile"], print_stats 표).
+    # path 를 주면 Simulator.run 종료 시 저장 (.json 이면 JSON, 아니면 CSV)
+    "profile": {"enabled": False, "path": None},
+
+    # 실행 중 텔레메트리(JSONL): wall_interval_s(벽시계) 또는 sim_interval_us(시뮬 시각) 마다 1줄 + run_until 종료 시 final.
+    # 0 이면 해당 기준 비활성. 벽시계는 check_every_events 이벤트마다만 확인 (hot path 비용 최소화)
+    # memory=True 면 record 에 memory_report 의 subsystem 별 bytes 를 추가 (객체 그래프 순회라 무거움)
+    "telemetry": {"enabled": False, "path": "telemetry.jsonl", "wall_interval_s": 5.0, "sim_interval_us": 0.0,
+                  "check_every_events": 256, "memory": False},
+
+    # subsystem 별 메모리 보고 (stats["memory"], print_stats 표). path 를 주면 Simulator.run 종료 시 JSON 저장
+    "memory_report": {"enabled": False, "path": None},
+
+    # 로깅 (configure_logging): 기본 INFO 는 이벤트 단위 DEBUG 라인(SCHED/START/END/PRECCHK/OBLIG)을 생략.
+    # 이벤트 추적이 필요하면 level="DEBUG" (또는 CLI --log-level DEBUG).
+    # levels: component(sched/addr/obl/state/run) 별 override. async: 백그라운드 writer 스레드에서 포맷/쓰기.
+    "logging": {"level": "INFO", "levels": {}, "async": True, "batch_lines": 512, "flush_interval_s": 0.5},
+
+    # die 병렬 실행 (run_parallel_dies) — 근사 모드: workers>1 이면 결과가 직렬(workers=1)과 같지 않다.
+    # partition 마다 RNG stream 이 따로이고, 뒤 partition 의 bus 예약/bootstrap 종료는 배리어에서 늦게 보인다.
+    # op 구성/개수 분포만 직렬과 비슷하고 row 단위 비교/회귀 기준으로는 쓸 수 없다 (stats["parallel"]["approximate"]).
+    # die 를 workers 개 partition 으로 나눠 워커 프로세스에서 window_us 단위 배리어 진행 (partition w 는 window k 를
+    # round k+2w 에, bus 예약 끝은 window k+1 끝 이하). 배리어마다 bus 예약/남은 의무 source/deadline 연장을 교환.
+    # window_us 는 op 의 최대 bus 구간 끝 이상이어야 함. GLOBAL scope exclusion 이 있으면 사용 불가. workers=0 이면 die 수만큼.
+    "parallel": {"enabled": False, "workers": 0, "window_us": 50.0},
 
     # Address initial state: -1=ERASED, -2=initial(not erased)
     "address_init_state": -1,
 
+    # Core time representation: float(quantized µs) | ticks(integer ticks of SIM_RES_US, µs only at log/export)
+    "time_base": "float",
+
     # Bootstrap (disabled by default)
     "bootstrap": {
         "enabled": False,
@@ -338,6 +550,12 @@ CFG = {
         "write_head": {
             # to_erased_block | round_robin_next | stay
             "on_erase": "round_robin_next"
+        },
+        "read": {
+            # READ page 가 여러 block 에 있을 때 plane 별 block 선택
+            # lowest: 가장 작은 block (bitmap, O(1)) | set_order: 예전 (block, page) set 순회 순서의 첫 block
+            # (예전 패턴 재현용 호환 모드; 기록 page 수 비례 메모리와 READ 선택 비용)
+            "block_pick": "lowest"
         }
     },
 }
@@ -384,18 +602,20 @@ CFG["pattern_export"] = {
 
 # --------------------------------------------------------------------------
 # Alias mapping for policy/external naming
-OP_ALIAS = {}
-for op, spec in CFG.get("op_specs", {}).items():
-    OP_ALIAS[op] = {"base": spec.get("base", op), "fanout": spec.get("fanout", ("eq",1))}
-
-MAPPING_OP_BASE = {}
-CANDIDATES_OP_BASE = {}
-for op_name, spec in CFG.get("op_specs", {}).items():
-    base = spec.get("base", op_name)
-    MAPPING_OP_BASE[op_name] = base
-    if op_name not in CANDIDATES_OP_BASE:
-        CANDIDATES_OP_BASE[base] = []
-    CANDIDATES_OP_BASE[base].append(op_name)
+def _build_alias_tables(cfg: Dict[str, Any]):
+    op_alias = {}
+    for op, spec in cfg.get("op_specs", {}).items():
+        op_alias[op] = {"base": spec.get("base", op), "fanout": spec.get("fanout", ("eq",1))}
+
+    mapping_op_base = {}
+    candidates_op_base = {}
+    for op_name, spec in cfg.get("op_specs", {}).items():
+        base = spec.get("base", op_name)
+        mapping_op_base[op_name] = base
+        if op_name not in candidates_op_base:
+            candidates_op_base[base] = []
+        candidates_op_base[base].append(op_name)
+    return op_alias, mapping_op_base, candidates_op_base
 
 # --------------------------------------------------------------------------
 # Models
@@ -410,8 +630,6 @@ def _build_opkind_from_cfg(cfg: Dict[str, Any]) -> Enum:
     bases = sorted(bases)
     return Enum("OpKind", bases)  # values = 1..N, names = base strings
 
-OpKind = _build_opkind_from_cfg(CFG)
-
 # Build opcode_map dynamically using OpKind and aliasing rules
 def _build_opcode_map_from_opkind(cfg: Dict[str, Any], opkind: Enum) -> Dict[str, int]:
     mapping: Dict[str, int] = {}
@@ -436,40 +654,460 @@ def _build_opcode_map_from_opkind(cfg: Dict[str, Any], opkind: Enum) -> Dict[str
                 mapping[key] = next_code; next_code += 1
     return mapping
 
+class SimTables:
+    """
+    cfg.op_specs 에서 컴파일한 이름 테이블 묶음 (Simulator 인스턴스마다 하나).
+    - op_alias / mapping_op_base / candidates_op_base : alias <-> base 매핑
+    - opkind     : base 이름으로 만든 OpKind Enum (Operation.base 값)
+    - opcode_map : pattern_export 용 opcode 매핑
+    """
+    def __init__(self, cfg: Dict[str, Any]):
+        self.op_alias, self.mapping_op_base, self.candidates_op_base = _build_alias_tables(cfg)
+        self.opkind = _build_opkind_from_cfg(cfg)
+        self.opcode_map = _build_opcode_map_from_opkind(cfg, self.opkind)
+
+# 모듈 기본 CFG 기준 테이블 (tables 를 받지 않은 컴포넌트/헬퍼의 기본값)
+_DEFAULT_TABLES = SimTables(CFG)
+OP_ALIAS = _DEFAULT_TABLES.op_alias
+MAPPING_OP_BASE = _DEFAULT_TABLES.mapping_op_base
+CANDIDATES_OP_BASE = _DEFAULT_TABLES.candidates_op_base
+OpKind = _DEFAULT_TABLES.opkind
+
 # apply dynamic opcode map
-CFG["pattern_export"]["opcode_map"] = _build_opcode_map_from_opkind(CFG, OpKind)
+CFG["pattern_export"]["opcode_map"] = _DEFAULT_TABLES.opcode_map
 
 class Scope(Enum):
     NONE=0; PLANE_SET=1; DIE_WIDE=2
 
-@dataclass(frozen=True)
+# 레코드 타입은 slots=True: run 당 수백만 개 생성되므로 인스턴스 __dict__ 제거 (메모리/속성 접근 비용)
+@dataclass(frozen=True, slots=True)
 class Address:
     die:int; plane:int; block:int; page:Optional[int]=None
+    # 불변 값 객체: 복사 시 공유 (Simulator.fork 의 구조 공유)
+    def __copy__(self): return self
+    def __deepcopy__(self, memo): return self
 
-@dataclass
+@dataclass(slots=True)
 class PhaseHook:
-    time_us: float
+    time_us: float          # TimeBase 저장값
     label: str
     die:int; plane:int
+    reg: Any = field(default=None, repr=False, compare=False)   # hook coalescing 등록 slot (병합 없으면 ())
 
-@dataclass
+@dataclass(slots=True)
 class StateSeg:
     name:str
     dur_us: float
     bus: bool = False
+    dur_k: Any = None      # dur_us 의 TimeBase 기간 저장값 (build_operation 에서 채움)
 
-@dataclass
+@dataclass(slots=True)
 class Operation:
     name: str
     base: Enum
     targets: List[Address]
     states: List[StateSeg]
     movable: bool = True
-    meta: Dict[str,Any] = field(default_factory=dict)
+    # propose/schedule 단계에서 채우는 메타데이터 (예전 meta dict 키)
+    scope: Optional[str] = None                  # Scope 이름 (op_specs.scope)
+    plane_list: Optional[List[int]] = None
+    arity: int = 1
+    uid: Optional[int] = None                    # 예약 시 부여 (Scheduler)
+    source: Optional[str] = None                 # "bootstrap" | "policy.phase_conditional" | obligation source
+    alias_used: Optional[str] = None
+    phase_key_used: Optional[str] = None
+    state_key_at_schedule: Optional[str] = None
+    obligation: Optional["Obligation"] = None
+    skip_dout_creation: bool = False
+    start_us: Optional[float] = None             # subscriber 가 있을 때만 기록 (Scheduler._emit)
+    end_us: Optional[float] = None
+
+# --------------------------------------------------------------------------
+# Compiled config (hot path 조회용 불변 구조)
+_EMPTY_SET: frozenset = frozenset()
+
+@dataclass(frozen=True)
+class OpSpecC:
+    """op_specs 항목 하나의 컴파일 결과 (nominal 값은 fixed dist 의 value 기준)."""
+    name: str
+    base: Enum                               # OpKind 멤버
+    scope: Scope
+    states: Tuple[Tuple[str, float, bool], ...]   # (state, nominal dur_us, bus)
+    nominal_us: float
+    nominal_k: float                         # nominal_us 의 TimeBase 기간 저장값
+    bus_offsets: Tuple[Tuple[float, float], ...]  # nominal 기준 bus 세그먼트 (op 시작 기준 offset)
+    bus_states: frozenset
+    ignore: frozenset
+    arity_min: int                           # fanout ("eq"|"ge", n) 의 n
+    arity_max: Optional[int]                 # eq: n, ge: None (상한 없음; planner 가 plane 수까지 줄여 시도)
+
+@dataclass(frozen=True)
+class CompiledCfg:
+    """
+    cfg 를 한 번 검증/컴파일한 불변 구조. AddressManager/PolicyEngine/Scheduler 의 hot path 는
+    중첩 dict 대신 이 속성을 읽는다. 필드는 tuple/frozenset/MappingProxyType 이고 cfg 하위 객체를 참조하지
+    않으므로 컴파일 뒤 cfg 를 바꿔도 영향 없다 (바꾼 cfg 를 쓰려면 compile_cfg 로 다시 만들어 교체).
+    실행 중 cfg 에서 읽는 항목(phase_conditional, admission delta, selection, obligations)은 포함하지 않음.
+    *_k 필드는 같은 이름 *_us 의 TimeBase 기간 저장값 (hot path 는 이쪽만 쓴다).
+    """
+    ops: Mapping[str, OpSpecC]               # op name -> OpSpecC (MappingProxyType)
+    timeline_affects: Mapping[str, bool]     # base -> bool (state_timeline.affects, MappingProxyType)
+    # policy
+    planner_max_tries: int
+    queue_refill_period_us: float
+    queue_refill_period_k: float
+    enable_phase_conditional: bool
+    hook_horizon_us: float
+    hook_horizon_k: float
+    startplane_scan: int
+    global_obl_iters: int
+    phase_hook_disabled_kinds: frozenset
+    read_requires_committed: bool
+    read_allow_future_program: bool
+    read_future_program_guard_us: float
+    read_erase_guard_margin_us: float
+    program_erase_conflict_guard_us: float
+    read_future_program_guard_k: float
+    read_erase_guard_margin_k: float
+    program_erase_conflict_guard_k: float
+    # addressing
+    program_search_order: str
+    erase_pick_strategy: str
+    write_head_on_erase: str
+    read_block_pick: str
+    # admission / bootstrap
+    obligation_bypass: bool
+    bs_disable_timeline_logging: bool
+    bs_split_timeline_logging: bool
+    bs_reduce_phase_hooks: bool
+    bs_hook_margin_us: float
+    bs_hook_margin_k: float
+
+    def ignore_of(self, op_name: str) -> frozenset:
+        o = self.ops.get(op_name)
+        return o.ignore if o is not None else _EMPTY_SET
+
+    def __reduce__(self):
+        # MappingProxyType 은 pickle/deepcopy 불가 → plain dict 로 내보내고 _compiled_cfg_from_state 에서 다시 감싼다
+        st = {f.name: getattr(self, f.name) for f in fields(self)}
+        st["ops"] = dict(self.ops); st["timeline_affects"] = dict(self.timeline_affects)
+        return (_compiled_cfg_from_state, (st,))
+
+def _compiled_cfg_from_state(st: Dict[str, Any]) -> CompiledCfg:
+    st = dict(st, ops=types.MappingProxyType(dict(st["ops"])),
+              timeline_affects=types.MappingProxyType(dict(st["timeline_affects"])))
+    return CompiledCfg(**st)
+
+def compile_cfg(cfg: Dict[str, Any], tables: Optional[SimTables] = None) -> CompiledCfg:
+    """cfg 검증 + CompiledCfg 생성. 잘못된 op_specs(scope/states/duration/fanout 범위)는 ValueError."""
+    tables = tables or _DEFAULT_TABLES
+    dur_k = TimeBase.from_cfg(cfg).dur
+    planes = int(cfg["topology"]["planes"])
+    ops: Dict[str, OpSpecC] = {}
+    for name, spec in cfg.get("op_specs", {}).items():
+        scope_name = str(spec.get("scope", "PLANE_SET"))
+        if scope_name not in Scope.__members__:
+            raise ValueError(f"op_specs[{name}].scope must be one of {list(Scope.__members__)}: {scope_name}")
+        states = []; bus_offsets = []; t = 0.0
+        for st in spec.get("states", []):
+            if "name" not in st:
+                raise ValueError(f"op_specs[{name}].states entry without name: {st}")
+            dur = float(st.get("dist", {}).get("value", 0.0)); bus = bool(st.get("bus", False))
+            if dur < 0.0:
+                raise ValueError(f"op_specs[{name}].states[{st['name']}] duration must be >= 0: {dur}")
+            states.append((str(st["name"]), dur, bus))
+            if bus: bus_offsets.append((t, t + dur))
+            t += dur
+        nominal = 0.0
+        for _, dur, _ in states:
+            nominal += dur
+        base_name = tables.mapping_op_base.get(name, spec.get("base", name))
+        if base_name not in tables.opkind.__members__:
+            raise ValueError(f"op_specs[{name}] base not in OpKind: {base_name}")
+        fan = tables.op_alias.get(name, {}).get("fanout", ("eq", 1))
+        if not isinstance(fan, (tuple, list)) or len(fan) != 2:
+            raise ValueError(f"op_specs[{name}].fanout must be (eq|ge, n): {fan!r}")
+        mode, n = fan
+        if mode not in ("eq", "ge"):
+            raise ValueError(f"op_specs[{name}].fanout mode must be eq|ge: {mode}")
+        if isinstance(n, bool) or not isinstance(n, int) or n < 1:
+            raise ValueError(f"op_specs[{name}].fanout arity must be an integer >= 1: {n!r}")
+        if mode == "eq" and n > planes:
+            raise ValueError(f"op_specs[{name}].fanout ('eq', {n}) exceeds topology.planes={planes}")
+        if scope_name == "NONE" and (mode != "eq" or n != 1):
+            raise ValueError(f"op_specs[{name}] scope NONE requires fanout ('eq', 1): {fan!r}")
+        ops[name] = OpSpecC(name=name, base=tables.opkind[base_name], scope=Scope[scope_name],
+                            states=tuple(states), nominal_us=nominal, nominal_k=dur_k(nominal), bus_offsets=tuple(bus_offsets),
+                            bus_states=frozenset(nm for nm, _, b in states if b),
+                            ignore=frozenset(spec.get("ignore", [])),
+                            arity_min=n, arity_max=(n if mode == "eq" else None))
+    pol = cfg.get("policy", {}); hs = pol.get("hookscreen", {}); adr = cfg.get("addressing", {})
+    bs = cfg.get("bootstrap", {})
+    read_block_pick = str(adr.get("read", {}).get("block_pick", "lowest")).lower()
+    if read_block_pick not in ("set_order", "lowest"):
+        raise ValueError(f"addressing.read.block_pick must be set_order|lowest: {read_block_pick}")
+    refill_us = float(pol["queue_refill_period_us"]); horizon_us = float(hs.get("horizon_us", 10.0))
+    rfp_guard = float(pol.get("read_future_program_guard_us", 0.01))
+    rer_guard = float(pol.get("read_erase_guard_margin_us", 0.0))
+    pec_guard = float(pol.get("program_erase_conflict_guard_us", 0.0))
+    hook_margin = float(bs.get("hook_margin_us", 0.1))
+    return CompiledCfg(
+        ops=types.MappingProxyType(ops),
+        timeline_affects=types.MappingProxyType(dict(cfg.get("state_timeline", {}).get("affects", {}))),
+        planner_max_tries=int(pol["planner_max_tries"]),
+        queue_refill_period_us=refill_us,
+        queue_refill_period_k=dur_k(refill_us),
+        enable_phase_conditional=bool(pol.get("enable_phase_conditional", True)),
+        hook_horizon_us=horizon_us,
+        hook_horizon_k=dur_k(horizon_us),
+        startplane_scan=max(1, int(hs.get("startplane_scan", 1))),
+        global_obl_iters=max(1, int(hs.get("global_obl_iters", 1))),
+        phase_hook_disabled_kinds=frozenset(str(k).upper() for k in pol.get("phase_hook_disabled_kinds", [])),
+        read_requires_committed=bool(pol.get("read_requires_committed", False)),
+        read_allow_future_program=bool(pol.get("read_allow_future_program", True)),
+        read_future_program_guard_us=rfp_guard,
+        read_erase_guard_margin_us=rer_guard,
+        program_erase_conflict_guard_us=pec_guard,
+        read_future_program_guard_k=dur_k(rfp_guard),
+        read_erase_guard_margin_k=dur_k(rer_guard),
+        program_erase_conflict_guard_k=dur_k(pec_guard),
+        program_search_order=str(adr.get("program", {}).get("search_order", "ascending")).lower(),
+        erase_pick_strategy=str(adr.get("erase", {}).get("pick_strategy", "ascending_non_erased")).lower(),
+        write_head_on_erase=str(adr.get("write_head", {}).get("on_erase", "to_erased_block")).lower(),
+        read_block_pick=read_block_pick,
+        obligation_bypass=bool(cfg.get("admission", {}).get("obligation_bypass", True)),
+        bs_disable_timeline_logging=bool(bs.get("disable_timeline_logging", False)),
+        bs_split_timeline_logging=bool(bs.get("split_timeline_logging", False)),
+        bs_reduce_phase_hooks=bool(bs.get("reduce_phase_hooks", False)),
+        bs_hook_margin_us=hook_margin,
+        bs_hook_margin_k=dur_k(hook_margin),
+    )
+
+# --------------------------------------------------------------------------
+# Stage profiling (per-stage call count + cumulative perf_counter_ns)
+_ns = time.perf_counter_ns
+
+class StageProfiler:
+    """
+    propose/schedule 파이프라인 stage 별 호출 수와 누적 시간(ns).
+    호출부 패턴: `if prof: tp=_ns()` ... `if prof: prof.add("gate.bus", tp)`.
+    비활성(profile.enabled=False)이면 컴포넌트의 prof 가 None 이라 분기 하나만 남는다.
+    stage 이름은 '.' 로 계층 표기 (propose ⊃ obl.pop_urgent/phase.*/plan_multiplane/gate.*,
+    schedule ⊃ sched.*/state_timeline.reserve_op).
+    """
+    def __init__(self):
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.ns: Dict[str, int] = defaultdict(int)
+
+    def add(self, stage: str, t0: int):
+        self.ns[stage] += _ns() - t0
+        self.calls[stage] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {k: {"calls": self.calls[k], "ns": self.ns[k]} for k in self.calls}
+
+def profile_rows(prof: Dict[str, Dict[str, int]]) -> List[Dict[str, Any]]:
+    """snapshot(또는 병합된 stats["profile"]) → 누적 시간 내림차순 row 리스트."""
+    rows = []
+    for stage, d in prof.items():
+        calls, ns = int(d["calls"]), int(d["ns"])
+        rows.append({"stage": stage, "calls": calls, "total_ms": round(ns / 1e6, 3),
+                     "avg_us": round(ns / 1e3 / calls, 3) if calls else 0.0})
+    rows.sort(key=lambda r: -r["total_ms"])
+    return rows
+
+def save_profile(prof: Dict[str, Dict[str, int]], path: str):
+    """확장자가 .json 이면 JSON, 아니면 CSV 로 저장."""
+    rows = profile_rows(prof)
+    if path.lower().endswith(".json"):
+        import json
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=["stage", "calls", "total_ms", "avg_us"])
+            w.writeheader(); w.writerows(rows)
+
+# --------------------------------------------------------------------------
+# Memory accounting (retained size / object count per subsystem)
+_MEM_SKIP = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+             Enum, random.Random)
+
+def _deep_size(root: Any, seen: Set[int]) -> Tuple[int, int]:
+    """root 에서 닿는 객체의 sys.getsizeof 합과 개수. seen 에 있는 객체는 건너뛰고, 센 객체는 seen 에 추가."""
+    size = 0; n = 0; stack = [root]
+    while stack:
+        o = stack.pop()
+        i = id(o)
+        if i in seen or isinstance(o, _MEM_SKIP):
+            continue
+        seen.add(i)
+        size += sys.getsizeof(o); n += 1
+        if isinstance(o, (str, bytes, int, float, bool)) or o is None:
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys()); stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(o)
+        else:
+            d = getattr(o, "__dict__", None)
+            if d is not None:
+                stack.append(d)
+            for cls in type(o).__mro__:
+                sl = cls.__dict__.get("__slots__", ())
+                for name in ((sl,) if isinstance(sl, str) else sl):
+                    if name not in ("__dict__", "__weakref__") and hasattr(o, name):
+                        stack.append(getattr(o, name))
+    return size, n
+
+def memory_report(sch: "Scheduler") -> Dict[str, Dict[str, int]]:
+    """
+    subsystem 별 {"bytes", "objects"}. 여러 구조가 공유하는 객체(예: plane/die/global index 의 StateInterval,
+    이벤트 큐와 훅이 가리키는 Operation)는 아래 순서에서 먼저 닿은 subsystem 에만 계상되므로 합계가 곧 총량이다.
+    cfg, SimTables, CompiledCfg, Enum/클래스/모듈/RNG 는 제외.
+    """
+    seen: Set[int] = set()
+    for shared in (sch.cfg, sch.tables, sch.cc, sch.SPE.cc, sch.addr.cc):
+        _deep_size(shared, seen)     # 설정 그래프는 먼저 seen 에 넣어 어느 subsystem 에도 계상하지 않음
+    st = sch.state_timeline; addr = sch.addr; excl = sch.excl; obl = sch.obl
+    cl = getattr(obl, "creation_logger", None)
+    parts: List[Tuple[str, Any]] = [
+        ("timeline_rows", [sch.logger.rows, getattr(sch, "_timeline_rows_bootstrap", None),
+                           getattr(sch, "_timeline_rows_policy", None)]),
+        ("reject_rows", sch.SPE.rejlog.rows),
+        ("creation_rows", cl.rows if cl is not None else None),
+        ("state_timeline.plane", [st.by_plane, st._starts_by_plane, st.last_end_idx] if st is not None else None),
+        ("state_timeline.die", [st._die_index, st._die_starts] if st is not None else None),
+        ("state_timeline.global", [st._global_index, st._global_starts] if st is not None else None),
+        ("addr.resv", addr.resv),
+        ("addr.bus_resv", addr.bus_resv),
+        ("addr.future", [addr.future_erase_by_block, addr.future_program_by_page]),
+        ("addr.other", addr),
+        ("excl.windows", [excl.global_windows, excl.die_windows]),
+        ("obl.heap", obl.heap),
+        ("obl.other", obl),
+        ("event_queue", sch.ev),
+    ]
+    out: Dict[str, Dict[str, int]] = {}
+    for name, obj in parts:
+        b, n = _deep_size(obj, seen) if obj is not None else (0, 0)
+        out[name] = {"bytes": b, "objects": n}
+    return out
+
+def format_memory_report(mem: Dict[str, Dict[str, int]]) -> List[str]:
+    total = sum(v["bytes"] for v in mem.values()) or 1
+    lines = [f"{'subsystem':24s} {'MB':>9s} {'objects':>10s} {'share':>7s}"]
+    for name, v in sorted(mem.items(), key=lambda kv: -kv[1]["bytes"]):
+        lines.append(f"{name:24s} {v['bytes']/2**20:9.2f} {v['objects']:10d} {100.0*v['bytes']/total:6.1f}%")
+    return lines
+
+# --------------------------------------------------------------------------
+# Run telemetry (periodic JSONL records while the scheduler advances)
+def _rss_mb() -> float:
+    """현재 RSS(MB). /proc/self/statm 이 없으면 peak RSS(ru_maxrss)로 대체."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        import resource
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return kb / (1024.0 * 1024.0) if sys.platform == "darwin" else kb / 1024.0
+
+class TelemetryWriter:
+    """
+    Scheduler.advance 중 주기적으로 상태 스냅샷을 JSONL 로 기록.
+    record: sim_us, wall_s, events, events_per_s/sim_us_per_wall_s(직전 record 이후 구간), event_queue,
+            obl_heap/obl_assigned, state_segments(+max per plane), plane_resv(+max), bus_resv, excl_windows,
+            propose_calls, scheduled, accept_ratio, rss_mb, final
+    checkpoint 복원 시 파일 핸들은 버리고 같은 path 에 이어 쓴다 (wall 기준은 복원 시점부터 다시).
+    fork 분기는 branch() 로 분기별 path 에 새로 쓴다.
+    """
+    def __init__(self, cfg: Dict[str, Any]):
+        tc = cfg.get("telemetry", {})
+        self.path = str(tc.get("path", "telemetry.jsonl"))
+        self.wall_interval_s = float(tc.get("wall_interval_s", 5.0))
+        self.sim_interval_us = float(tc.get("sim_interval_us", 0.0))
+        self.check_every = max(1, int(tc.get("check_every_events", 256)))
+        self.memory = bool(tc.get("memory", False))
+        self.tb = TimeBase.from_cfg(cfg)
+        self._sim_interval_k = max(self.tb.dur(self.sim_interval_us), self.tb.res)   # sch.now 과 같은 저장값 단위
+        self._fh = open(self.path, "w", encoding="utf-8")
+        self._reset_clock()
+        self._next_sim = self._sim_interval_k
+        self.records = 0
+
+    def _reset_clock(self):
+        self._t0 = time.perf_counter()
+        self._next_wall = self._t0 + self.wall_interval_s
+        self._n = 0
+        self._last = None   # (wall_s, events, sim_us)
+
+    def __getstate__(self):
+        st = self.__dict__.copy(); st["_fh"] = None
+        return st
+
+    def __setstate__(self, st):
+        self.__dict__.update(st)
+        self._reset_clock()
+
+    def branch(self, path: str):
+        """복사본(fork)이 원본 파일에 섞여 쓰지 않도록 path 를 바꾸고 새 파일로 시작."""
+        self.close()
+        self.path = path; self.records = 0
+        self._fh = open(self.path, "w", encoding="utf-8")
+
+    def tick(self, sch: "Scheduler"):
+        """이벤트 1개 처리 후 호출."""
+        if self.sim_interval_us > 0.0 and sch.now >= self._next_sim:
+            self._next_sim = (sch.now // self._sim_interval_k + 1) * self._sim_interval_k
+            self.emit(sch); return
+        if self.wall_interval_s > 0.0:
+            self._n += 1
+            if self._n >= self.check_every:
+                self._n = 0
+                if time.perf_counter() >= self._next_wall:
+                    self.emit(sch)
+
+    def emit(self, sch: "Scheduler", final: bool = False):
+        import json
+        now_w = time.perf_counter()
+        self._next_wall = now_w + self.wall_interval_s
+        wall = now_w - self._t0
+        segs = [len(v) for v in sch.state_timeline.by_plane.values()] if sch.state_timeline is not None else []
+        resv = [len(v) for v in sch.addr.resv.values()]
+        ev_n, sim = sch.stat_events, self.tb.us(sch.now)
+        if self._last is not None and wall > self._last[0]:
+            dw = wall - self._last[0]
+            eps = (ev_n - self._last[1]) / dw; sps = (sim - self._last[2]) / dw
+        else:
+            eps = ev_n / wall if wall > 0 else 0.0; sps = sim / wall if wall > 0 else 0.0
+        self._last = (wall, ev_n, sim)
+        calls = sch.stat_propose_calls
+        rec = {
+            "sim_us": round(sim, 2), "wall_s": round(wall, 3), "events": ev_n,
+            "events_per_s": round(eps, 1), "sim_us_per_wall_s": round(sps, 1),
+            "event_queue": len(sch.ev), "obl_heap": len(sch.obl.heap), "obl_assigned": len(sch.obl.assigned),
+            "state_segments": sum(segs), "state_segments_max": max(segs, default=0),
+            "plane_resv": sum(resv), "plane_resv_max": max(resv, default=0), "bus_resv": len(sch.addr.bus_resv),
+            "excl_windows": len(sch.excl.global_windows) + sum(len(v) for v in sch.excl.die_windows.values()),
+            "propose_calls": calls, "scheduled": sch.stat_scheduled,
+            "accept_ratio": round(sch.stat_scheduled / calls, 4) if calls else 0.0,
+            "rss_mb": round(_rss_mb(), 1), "final": final,
+        }
+        if self.memory:
+            rec["memory"] = {k: v["bytes"] for k, v in memory_report(sch).items()}
+        if self._fh is None:
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.write(json.dumps(rec) + "\n"); self._fh.flush()
+        self.records += 1
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close(); self._fh = None
 
 # --------------------------------------------------------------------------
 # Rejection logging (per-attempt structured log + aggregated stats)
-@dataclass
+@dataclass(slots=True)
 class RejectEvent:
     now_us: float
     die: int
@@ -487,10 +1125,11 @@ class RejectEvent:
     ob_id: Optional[int] = None
 
 class RejectionLogger:
-    def __init__(self):
+    def __init__(self, keep_rows: bool = True):
+        self.keep_rows = keep_rows
         self.rows: List[RejectEvent] = []
         # nested counts: stage -> reason -> count
-        self.stats = defaultdict(lambda: defaultdict(int))
+        self.stats = defaultdict(partial(defaultdict, int))
         # stage-wise attempts/accepts
         self.stage_attempts = defaultdict(int)
         self.stage_accepts  = defaultdict(int)
@@ -502,7 +1141,8 @@ class RejectionLogger:
         self.stage_accepts[stage] += 1
 
     def log_reject(self, ev: RejectEvent):
-        self.rows.append(ev)
+        if self.keep_rows:
+            self.rows.append(ev)
         self.stats[ev.stage][ev.reason] += 1
 
     def to_csv(self, path: str = "reject_log.csv"):
@@ -589,7 +1229,7 @@ class RejectionLogger:
 
 # --------------------------------------------------------------------------
 # Obligation creation logger
-@dataclass
+@dataclass(slots=True)
 class CreateEvent:
     id: int
     require: str
@@ -607,10 +1247,14 @@ class CreateEvent:
     created_at_us: Optional[float] = None
 
 class CreationLogger:
-    def __init__(self):
+    def __init__(self, keep_rows: bool = True, tb: Optional[TimeBase] = None):
+        self.keep_rows = keep_rows
+        self.tb = tb or TimeBase()   # ob.deadline_us(저장값) -> µs
         self.rows: List[CreateEvent] = []
 
     def log(self, ob: "Obligation", context: str, stripe: Optional[int]=None, page_index: Optional[int]=None, created_at_us: Optional[float]=None):
+        if not self.keep_rows:
+            return
         planes = sorted({t.plane for t in ob.targets})
         blocks = sorted({t.block for t in ob.targets})
         pages  = sorted({t.page for t in ob.targets if t.page is not None})
@@ -623,7 +1267,7 @@ class CreationLogger:
             planes=planes,
             blocks=blocks,
             pages=pages,
-            deadline_us=ob.deadline_us,
+            deadline_us=self.tb.us(ob.deadline_us),
             hard_slot=ob.hard_slot,
             arity=len(planes),
             context=context,
@@ -658,13 +1302,13 @@ class CreationLogger:
                 ])
 # --------------------------------------------------------------------------
 # Utils
-def sample_dist(d: Dict[str, Any]) -> float:
+def sample_dist(d: Dict[str, Any], rng=random) -> float:
     k = d["kind"]
     if k == "fixed": return float(d["value"])
     if k == "normal":
         m, s, mn = d["mean"], d["std"], d.get("min", 0.0)
-        v = random.gauss(m, s); return max(v, mn)
-    if k == "exp": return random.expovariate(d["lambda"])
+        v = rng.gauss(m, s); return max(v, mn)
+    if k == "exp": return rng.expovariate(d["lambda"])
     raise ValueError(f"unknown dist kind: {k}")
 
 def parse_hook_key(label: str):
@@ -687,21 +1331,21 @@ def get_phase_dist(cfg: Dict[str,Any], hook_label: str):
         if dist and sum(dist.values())>0: return dist, key
     return None, None
 
-def roulette_pick(dist: Dict[str, float], allow: set) -> Optional[str]:
+def roulette_pick(dist: Dict[str, float], allow: set, rng=random) -> Optional[str]:
     items=[(n,p) for n,p in dist.items() if n in allow and p>0]
     if not items: return None
-    tot=sum(p for _,p in items); r=random.random()*tot; acc=0.0; pick=items[-1][0]
+    tot=sum(p for _,p in items); r=rng.random()*tot; acc=0.0; pick=items[-1][0]
     for n,p in items:
         acc+=p
         if r<=acc: pick=n; break
     return pick
 
 # --- alias/base helpers for hook label resolution ---
-def _op_alias_candidates(kind: str) -> List[str]:
-    return CANDIDATES_OP_BASE.get(kind, [])
+def _op_alias_candidates(kind: str, tables: Optional[SimTables] = None) -> List[str]:
+    return (tables or _DEFAULT_TABLES).candidates_op_base.get(kind, [])
 
-def _op_base_from_alias(op: str) -> Optional[str]:
-    return MAPPING_OP_BASE.get(op, None)
+def _op_base_from_alias(op: str, tables: Optional[SimTables] = None) -> Optional[str]:
+    return (tables or _DEFAULT_TABLES).mapping_op_base.get(op, None)
 
 def get_admission_delta(cfg: Dict[str,Any], hook_label: str, op_base: str) -> float:
     adm = cfg.get("admission", {})
@@ -711,15 +1355,22 @@ def get_admission_delta(cfg: Dict[str,Any], hook_label: str, op_base: str) -> fl
 
 # --------------------------------------------------------------------------
 # Builders
-def build_operation(name:str, kind: Enum, cfg_op: Dict[str, Any], targets: List[Address]) -> Operation:
+def build_operation(name:str, kind: Enum, cfg_op: Dict[str, Any], targets: List[Address], rng=random,
+                    tb: Optional[TimeBase] = None) -> Operation:
+    dur_k = tb.dur if tb is not None else float
     states=[]
     for s in cfg_op["states"]:
-        states.append(StateSeg(name=s["name"], dur_us=sample_dist(s["dist"]), bus=bool(s.get("bus", False))))
+        dur = sample_dist(s["dist"], rng)
+        states.append(StateSeg(name=s["name"], dur_us=dur, bus=bool(s.get("bus", False)), dur_k=dur_k(dur)))
     return Operation(name=name, base=kind, targets=targets, states=states)
 
 def get_op_duration(op: Operation) -> float:
     return sum(seg.dur_us for seg in op.states)
 
+def get_op_duration_k(op: Operation) -> float:
+    """get_op_duration 의 TimeBase 기간 저장값 (state 별 dur_k 합)."""
+    return sum(seg.dur_k for seg in op.states)
+
 def get_nominal_duration(cfg: Dict[str,Any], op_name: str) -> float:
     """Sum of nominal state durations for an op kind from cfg.op_specs (assumes fixed)."""
     spec = cfg.get("op_specs", {}).get(op_name, {})
@@ -730,48 +1381,306 @@ def get_nominal_duration(cfg: Dict[str,Any], op_name: str) -> float:
         total += float(dist.get("value", 0.0))
     return total
 
+# --------------------------------------------------------------------------
+# Page bitmaps (programmed page 집합)
+def iter_bits(mask: int):
+    """mask 의 set bit 위치를 오름차순으로."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def _set_in_order(items: List[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+    """빈 set 에 items 를 순서대로 넣은 set (같은 삽입 순서면 순회 순서도 같다)."""
+    s: Set[Tuple[int, int]] = set()
+    for pp in items:
+        s.add(pp)
+    return s
+
+class PageBitmap:
+    """
+    (die, block) 별 programmed page bitmap (Python int, bit p = page p) + READ 대상 인덱스.
+    - page_blocks[die][plane][page] : 그 page 가 기록된 plane stripe block 의 bitmap (bit b = block b)
+    - plane_mask[die][plane]        : page_blocks 가 비어있지 않은 page 의 bitmap (0<->비0 전이 때만 갱신)
+    - common_pages(die, planes)     : plane set 모두에 있는 page 의 정렬 리스트. (die, plane set) 별로 캐시하고
+                                      그 die 의 plane_mask 가 바뀌면(gen 증가) 다시 계산
+    - order[die] (track_order=True 일 때만) : 예전 Set[(block, page)] 를 같은 연산 순서로 유지.
+                                      first_block_in_order 가 예전 READ block 선택(set 순회 첫 원소)을 재현.
+                                      set 순회 순서는 복사/pickle 로 재구성하면 달라지므로 그 set 을 만든 삽입
+                                      순서(order_log)를 두고 복원 시 다시 넣는다 (fork/checkpoint 후에도 같은 선택).
+                                      clear_block 은 set 을 새로 만들므로 order_log 도 그때 남은 원소로 줄어든다
+    포함 검사/page 별 최소 block 은 O(1), block/die 지우기는 기록된 page 수 비례.
+    """
+    __slots__ = ("planes", "bits", "plane_mask", "page_blocks", "gen", "_common", "order", "order_log")
+
+    def __init__(self, dies: int, planes: int, blocks: int, pages: int, track_order: bool = False):
+        self.planes = planes
+        self.order: Optional[List[Set[Tuple[int, int]]]] = [set() for _ in range(dies)] if track_order else None
+        self.order_log: Optional[List[List[Tuple[int, int]]]] = [[] for _ in range(dies)] if track_order else None
+        self.bits: List[List[int]] = [[0] * blocks for _ in range(dies)]
+        self.plane_mask: List[List[int]] = [[0] * planes for _ in range(dies)]
+        self.page_blocks: List[List[List[int]]] = [[[0] * pages for _ in range(planes)] for _ in range(dies)]
+        self.gen: List[int] = [0] * dies
+        self._common: Dict[Tuple[int, Tuple[int, ...]], Tuple[int, List[int]]] = {}
+
+    def add(self, die: int, block: int, page: int):
+        if self.order is not None and (block, page) not in self.order[die]:
+            self.order[die].add((block, page)); self.order_log[die].append((block, page))
+        m = 1 << page; row = self.bits[die]
+        if row[block] & m:
+            return
+        row[block] |= m
+        pl = block % self.planes; pb = self.page_blocks[die][pl]
+        if not pb[page]:
+            self.plane_mask[die][pl] |= m
+            self.gen[die] += 1
+        pb[page] |= 1 << block
+
+    def contains(self, die: int, block: int, page: int) -> bool:
+        return (self.bits[die][block] >> page) & 1 == 1
+
+    def clear_block(self, die: int, block: int):
+        if self.order is not None:
+            # 예전 코드의 set comprehension 재구성과 같은 순서로 다시 넣은 set. 기록은 그 삽입 순서로 교체
+            keep = [pp for pp in self.order[die] if pp[0] != block]
+            self.order[die] = _set_in_order(keep); self.order_log[die] = keep
+        row = self.bits[die]; mask = row[block]
+        if not mask:
+            return
+        row[block] = 0
+        pl = block % self.planes; pb = self.page_blocks[die][pl]; bm = ~(1 << block); gone = 0
+        for page in iter_bits(mask):
+            pb[page] &= bm
+            if not pb[page]:
+                gone |= 1 << page
+        if gone:
+            self.plane_mask[die][pl] &= ~gone
+            self.gen[die] += 1
+
+    def clear_die(self, die: int):
+        if self.order is not None:
+            self.order[die].clear(); self.order_log[die].clear()
+        row = self.bits[die]
+        for b in range(len(row)):
+            row[b] = 0
+        for pl in range(self.planes):
+            self.plane_mask[die][pl] = 0
+            pb = self.page_blocks[die][pl]
+            for i in range(len(pb)):
+                pb[i] = 0
+        self.gen[die] += 1
+
+    def plane_pages(self, die: int, plane: int) -> int:
+        return self.plane_mask[die][plane]
+
+    def __getstate__(self):
+        st = {k: getattr(self, k) for k in self.__slots__ if k != "order"}
+        st["_common"] = {}
+        return st
+
+    def __deepcopy__(self, memo):
+        # 원소가 모두 int/tuple(불변)이라 컨테이너만 복사
+        new = PageBitmap.__new__(PageBitmap); memo[id(self)] = new
+        new.__setstate__({
+            "planes": self.planes, "bits": [row[:] for row in self.bits],
+            "plane_mask": [row[:] for row in self.plane_mask],
+            "page_blocks": [[pb[:] for pb in row] for row in self.page_blocks],
+            "gen": self.gen[:], "_common": {},
+            "order_log": [log[:] for log in self.order_log] if self.order_log is not None else None,
+        })
+        return new
+
+    def __setstate__(self, st):
+        for k, v in st.items():
+            setattr(self, k, v)
+        self.order = [_set_in_order(log) for log in self.order_log] if self.order_log is not None else None
+
+    def common_pages(self, die: int, planes: List[int]) -> List[int]:
+        """planes 모두의 stripe 에 기록된 page (오름차순). 빈 planes 면 []."""
+        key = (die, tuple(planes))
+        hit = self._common.get(key)
+        if hit is not None and hit[0] == self.gen[die]:
+            return hit[1]
+        m = -1 if planes else 0
+        for pl in planes:
+            m &= self.plane_mask[die][pl]
+            if not m:
+                break
+        pages = list(iter_bits(m))
+        self._common[key] = (self.gen[die], pages)
+        return pages
+
+    def first_block_with_page(self, die: int, plane: int, page: int) -> Optional[int]:
+        """plane stripe 에서 page 가 기록된 가장 작은 block."""
+        m = self.page_blocks[die][plane][page]
+        return (m & -m).bit_length() - 1 if m else None
+
+    def first_block_in_order(self, die: int, plane: int, page: int) -> Optional[int]:
+        """order[die] 순회 순서로 plane stripe 에서 page 가 기록된 첫 block (track_order 필요)."""
+        planes = self.planes
+        for (b, p) in self.order[die]:
+            if p == page and b % planes == plane:
+                return b
+        return None
+
+    def pairs(self, die: int) -> Set[Tuple[int, int]]:
+        """예전 Set[(block, page)] 형태 (디버그/내보내기용)."""
+        return {(b, p) for b, m in enumerate(self.bits[die]) for p in iter_bits(m)}
+
+    def __len__(self) -> int:
+        return sum(m.bit_count() for row in self.bits for m in row)
+
+class IntervalIndex:
+    """
+    [start, end) 예약 구간 집합. start 정렬 리스트 + 남아 있는 구간의 최대 길이(max_len).
+    - 겹침 질의: start 가 [a0-max_len, a1) 인 후보만 bisect 로 잘라 검사
+    - retire(watermark): start+max_len <= watermark 인 앞부분(=end <= watermark 보장)을 버리고 남은 구간으로
+      max_len 을 다시 계산 (긴 ERASE/suspend 창 하나가 끝난 뒤까지 질의 범위를 넓히지 않게).
+      watermark 이후에 시작하는 질의에는 영향 없음.
+    시각 단위는 호출부(TimeBase key) 그대로.
+    """
+    __slots__ = ("starts", "ends", "max_len", "retired")
+
+    def __init__(self):
+        self.starts: List[Any] = []; self.ends: List[Any] = []
+        self.max_len = 0; self.retired = 0
+
+    def add(self, start, end):
+        if end - start > self.max_len:
+            self.max_len = end - start
+        starts = self.starts
+        if not starts or start >= starts[-1]:
+            starts.append(start); self.ends.append(end)
+        else:
+            i = bisect.bisect_right(starts, start)
+            starts.insert(i, start); self.ends.insert(i, end)
+
+    def _span(self, a0, a1) -> Tuple[int, int]:
+        starts = self.starts
+        return bisect.bisect_left(starts, a0 - self.max_len), bisect.bisect_left(starts, a1)
+
+    def first_overlap(self, a0, a1) -> Optional[Tuple[Any, Any]]:
+        """s < a1 and a0 < e 인 첫 구간 (a0 == a1 이면 a0 를 안쪽에 포함하는 구간)."""
+        i, n = self._span(a0, a1); ends = self.ends
+        for j in range(i, n):
+            if ends[j] > a0:
+                return self.starts[j], ends[j]
+        return None
+
+    def max_end_overlapping(self, a0, a1) -> Optional[Any]:
+        i, n = self._span(a0, a1); ends = self.ends
+        out = None
+        for j in range(i, n):
+            e = ends[j]
+            if e > a0 and (out is None or e > out):
+                out = e
+        return out
+
+    def next_end(self, t) -> Optional[Any]:
+        """t 이후에 끝나는 가장 이른 end (없으면 None)."""
+        return min((e for e in self.ends if e > t), default=None)
+
+    def retire(self, watermark) -> int:
+        k = bisect.bisect_right(self.starts, watermark - self.max_len)
+        if k:
+            del self.starts[:k]; del self.ends[:k]
+            self.retired += k
+            self.max_len = max(map(operator.sub, self.ends, self.starts), default=0)
+        return k
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __deepcopy__(self, memo):
+        new = IntervalIndex.__new__(IntervalIndex); memo[id(self)] = new
+        new.starts = self.starts[:]; new.ends = self.ends[:]
+        new.max_len = self.max_len; new.retired = self.retired
+        return new
+
 # --------------------------------------------------------------------------
 # Address & Bus Managers (with block/plane redefinition + state rails)
 class AddressManager:
     """
     v2 상태 모델 (block-scoped):
-    - addr_state_committed[(die, block)] : int  # last committed program page (-1=ERASED, -2=initial)
-    - addr_state_future[(die, block)]    : int  # future after reservations
-    - programmed_committed[(die)] : Set[(block, page)]
-    - write_head[(die, plane)] : int  # block index assigned to plane (block % planes == plane)
+    - addr_state_committed[die, block] : int  # last committed program page (-1=ERASED, -2=initial)
+    - addr_state_future[die, block]    : int  # future after reservations
+    - programmed_committed / programmed_future : PageBitmap ((die, block) page bitmap + plane 요약)
+    - write_head[die, plane] : int  # block index assigned to plane (block % planes == plane)
+    - resv[(die,plane)] / bus_resv : IntervalIndex. 모든 시각(available, 예약, future 창, last_*_end)은
+      TimeBase 저장값(float µs 또는 정수 tick) 이고 메서드 인자/반환도 같은 단위.
+      Scheduler 가 주기적으로(_prune_history) now 를 watermark 로 retire() 를 불러 지난 예약을 버린다
+      (후보 시작은 항상 now 이후라 늦게 버려도 결과 불변).
+    block/plane 단위 상태는 numpy 배열: (dies, blocks) = addr_state_committed/addr_state_future/last_erase_end,
+    (dies, planes) = write_head. available[die][plane] 은 hot path 에서 plane 몇 개만 보므로 Python list. plane stripe(block % planes == plane)는 arr[die, plane::planes]
+    strided view 로 한 번에 검사. 밖으로 내보내는 값(Address 필드, 시각)은 Python int/float 로 변환.
+    PROGRAM/ERASE 대상 선택용 future 인덱스 (register_future 에서 증분 갱신, _set_future 경유):
+    - fut_blocks[die][plane][fut]  : 정렬된 block 리스트 (next page = fut+1, fut==-1 이면 erased free list)
+    - non_erased[die][plane]       : fut>=0 인 정렬된 block 리스트
+    ascending = 리스트 첫 원소, cyclic = bisect 로 start_block 이상 첫 원소(없으면 첫 원소로 wrap).
     """
-    def __init__(self, cfg: Dict[str, Any]):
+    def __init__(self, cfg: Dict[str, Any], tables: Optional[SimTables] = None, rng=random,
+                 cc: Optional[CompiledCfg] = None):
         topo=cfg["topology"]; self.cfg=cfg
+        self.kinds=(tables or _DEFAULT_TABLES).opkind; self.rng=rng
+        self.cc = cc or compile_cfg(cfg, tables)
+        self.tb=TimeBase.from_cfg(cfg)
         self.dies=topo["dies"]; self.planes=topo["planes"]
         self.blocks=topo["blocks"]; self.pages_per_block=topo["pages_per_block"]
 
-        self.available={(die,p):0.0 for p in range(self.planes) for die in range(self.dies)}  # per-plane availability time
-        self.resv={(die,p):[] for p in range(self.planes) for die in range(self.dies)}        # per-plane reservations: (start,end,block)
-        self.bus_resv: List[Tuple[float,float]] = []            # global bus reservations
+        # per-plane availability time (ticks 모드는 정수 tick). die 당 plane 몇 개라 numpy 대신 list (scalar 변환 없음)
+        self.available: List[List[float]] = [[self.tb.key(0.0)] * self.planes for _ in range(self.dies)]
+        self.resv={(die,p):IntervalIndex() for p in range(self.planes) for die in range(self.dies)}  # per-plane reservations
+        self.bus_resv = IntervalIndex()                         # global bus reservations
+        self._retire_k = None                                   # 마지막 retire watermark (TimeBase key)
+        self.bus_log: Optional[List[Tuple[float,float]]] = None  # parallel: 배리어 사이에 새로 잡은 bus 예약 (교환용)
+        self.bus_horizon: Optional[float] = None                 # parallel: bus 예약 끝 상한 (partition lookahead)
 
         # ---- content validity tracking (future + last-commit times) ----
-        # Scheduled-but-not-committed windows
+        # Scheduled-but-not-committed windows (창이 생긴 block/page 만 key 로 가짐)
         self.future_erase_by_block: Dict[Tuple[int,int], List[Tuple[float,float]]] = {}
         self.future_program_by_page: Dict[Tuple[int,int,int], List[Tuple[float,float]]] = {}
         # Last committed times
-        self.last_erase_end: Dict[Tuple[int,int], float] = {}
+        self.last_erase_end = np.full((self.dies, self.blocks), -np.inf, dtype=np.float64)
         self.last_program_end: Dict[Tuple[int,int,int], float] = {}
 
         init_state = int(cfg.get("address_init_state", -2))
-        self.addr_state_committed: Dict[Tuple[int,int], int] = {}
-        self.addr_state_future:    Dict[Tuple[int,int], int] = {}
-        self.programmed_committed: Dict[Tuple[int], Set[Tuple[int,int]]] = {(die,): set() for die in range(self.dies)}
-        self.programmed_future:    Dict[Tuple[int], Set[Tuple[int,int]]] = {(die,): set() for die in range(self.dies)}
-        self.write_head: Dict[Tuple[int,int], int] = {}  # (die,plane)->block
-
-        for die in range(self.dies):
-            for b in range(self.blocks):
-                self.addr_state_committed[(die,b)] = init_state
-                self.addr_state_future[(die,b)]    = init_state
-                self.future_erase_by_block[(die,b)] = []
-                self.last_erase_end[(die,b)] = float('-inf')
-            for p in range(self.planes):
-                self.write_head[(die,p)] = p  # first block of that plane stripe
+        self.addr_state_committed = np.full((self.dies, self.blocks), init_state, dtype=np.int32)
+        self.addr_state_future    = np.full((self.dies, self.blocks), init_state, dtype=np.int32)
+        self.programmed_committed = PageBitmap(self.dies, self.planes, self.blocks, self.pages_per_block)
+        self.programmed_future    = PageBitmap(self.dies, self.planes, self.blocks, self.pages_per_block,
+                                               track_order=(self.cc.read_block_pick == "set_order"))
+        # (die,plane)->block: 처음엔 각 plane stripe 의 첫 block
+        self.write_head = np.tile(np.arange(self.planes, dtype=np.int32), (self.dies, 1))
+        # future 상태별 block 인덱스 (plane stripe 단위)
+        self.fut_blocks: List[List[Dict[int, List[int]]]] = [
+            [{init_state: list(self.iter_blocks_of_plane(p))} for p in range(self.planes)] for _ in range(self.dies)]
+        self.non_erased: List[List[List[int]]] = [
+            [list(self.iter_blocks_of_plane(p)) if init_state >= 0 else [] for p in range(self.planes)]
+            for _ in range(self.dies)]
+
+
+    def __deepcopy__(self, memo):
+        """fork 용: numpy 배열은 memcpy, 불변 원소(int/tuple/float)만 담은 컨테이너는 얕은 복사, 나머지는 deepcopy."""
+        new = AddressManager.__new__(AddressManager); memo[id(self)] = new
+        fast = {
+            "future_erase_by_block": lambda v: {k: w[:] for k, w in v.items()},
+            "future_program_by_page": lambda v: {k: w[:] for k, w in v.items()},
+            "last_program_end": dict,
+            "available": lambda v: [row[:] for row in v],
+            "fut_blocks": lambda v: [[{f: bl[:] for f, bl in m.items()} for m in row] for row in v],
+            "non_erased": lambda v: [[bl[:] for bl in row] for row in v],
+        }
+        for k, v in self.__dict__.items():
+            if isinstance(v, np.ndarray):
+                new.__dict__[k] = v.copy()
+            elif k in fast:
+                new.__dict__[k] = fast[k](v)
+            else:
+                new.__dict__[k] = copy.deepcopy(v, memo)
+        return new
 
     # ---- helpers for plane/block mapping ----
     def plane_of(self, block:int) -> int:
@@ -781,119 +1690,152 @@ class AddressManager:
         for b in range(plane, self.blocks, self.planes):
             yield b
 
-    def _blocks_of_plane_list(self, plane:int) -> List[int]:
-        return list(self.iter_blocks_of_plane(plane))
+    # ---- stripe (strided view) helpers ----
+    def stripe(self, arr: np.ndarray, die:int, plane:int) -> np.ndarray:
+        """(dies, blocks) 배열에서 plane stripe(block = plane, plane+planes, ...) 의 strided view."""
+        return arr[die, plane::self.planes]
 
-    def _iter_blocks_of_plane_cyclic(self, plane:int, start_block:int):
-        blocks = self._blocks_of_plane_list(plane)
+    def _first_from(self, blocks: List[int], plane:int, start_block: Optional[int]=None) -> Optional[int]:
+        """정렬된 stripe block 리스트의 첫 block (start_block 을 주면 그 위치부터 순환 탐색)."""
         if not blocks:
+            return None
+        if start_block is not None and 0 <= start_block < self.blocks and start_block % self.planes == plane:
+            i = bisect.bisect_left(blocks, start_block)
+            if i < len(blocks):
+                return blocks[i]
+        return blocks[0]
+
+    def _set_future(self, die:int, block:int, state:int):
+        """addr_state_future 갱신 + fut_blocks/non_erased 인덱스 이동."""
+        old = int(self.addr_state_future[die, block])
+        if old == state:
             return
-        # align start_block to stripe of plane
-        try:
-            start_idx = blocks.index(start_block)
-        except ValueError:
-            # if not in list, map to nearest stripe position
-            try:
-                start_idx = blocks.index(plane)
-            except ValueError:
-                start_idx = 0
-        n = len(blocks)
-        for i in range(n):
-            yield blocks[(start_idx + i) % n]
+        self.addr_state_future[die, block] = state
+        idx = self.fut_blocks[die][block % self.planes]
+        lst = idx[old]
+        del lst[bisect.bisect_left(lst, block)]
+        if not lst:
+            del idx[old]
+        bisect.insort(idx.setdefault(state, []), block)
+        if (old >= 0) != (state >= 0):
+            ne = self.non_erased[die][block % self.planes]
+            if state >= 0:
+                bisect.insort(ne, block)
+            else:
+                del ne[bisect.bisect_left(ne, block)]
 
     # ---- observations ----
-    def available_at(self, die:int, plane:int)->float: return self.available[(die,plane)]
+    def available_at(self, die:int, plane:int)->float: return self.available[die][plane]
+
+    def next_release(self, die:int, now: float)->Optional[float]:
+        """이 die 의 plane 중 now 이후 가장 먼저 풀리는 시각 (모두 비어 있으면 None)."""
+        return min((t for t in self.available[die] if t > now), default=None)
 
     def earliest_start_for_scope(self, die:int, scope: Scope, plane_set: Optional[List[int]]=None)->float:
         if scope==Scope.DIE_WIDE:
-            planes=list(range(self.planes))
-        elif scope==Scope.PLANE_SET and plane_set is not None:
-            planes=plane_set
-        else:
-            planes=[plane_set[0]] if plane_set else [0]
-        return max(self.available[(die,p)] for p in planes)
-
-    def candidate_start_for_scope(self, now_us: float, die:int, scope: Scope, plane_set: Optional[List[int]]=None)->float:
-        """실제 스케줄러가 사용할 시작 후보시각 = max(now, earliest_start_for_scope)."""
+            return max(self.available[die])
+        av=self.available[die]
+        if scope==Scope.PLANE_SET and plane_set is not None:
+            return max([av[p] for p in plane_set])
+        return av[plane_set[0] if plane_set else 0]
+
+    def candidate_start_for_scope(self, now: float, die:int, scope: Scope, plane_set: Optional[List[int]]=None)->float:
+        """실제 스케줄러가 사용할 시작 후보시각 = max(now, earliest_start_for_scope). 둘 다 격자 위 저장값."""
         t_planes = self.earliest_start_for_scope(die, scope, plane_set)
-        return quantize(max(now_us, t_planes))
-
-    def observe_states(self, die:int, plane:int, now_us: float):
-        pgmable_blocks=0; readable_blocks=0
-        cnt=0
-        for b in self.iter_blocks_of_plane(plane):
-            cnt += 1
-            fut=self.addr_state_future[(die,b)]
-            com=self.addr_state_committed[(die,b)]
-            if fut < self.pages_per_block-1: pgmable_blocks += 1
-            if com >= 0: readable_blocks += 1
-        total=max(1, cnt)
+        return max(now, t_planes)
+
+    def observe_states(self, die:int, plane:int, now: float):
+        com=self.stripe(self.addr_state_committed, die, plane)
+        full=sum(len(bl) for f, bl in self.fut_blocks[die][plane].items() if f >= self.pages_per_block-1)
+        pgmable_blocks=com.size - full
+        readable_blocks=int(np.count_nonzero(com >= 0))
+        total=max(1, com.size)
         def bucket(x):
             r=x/total
             return "low" if r<0.34 else ("mid" if r<0.67 else "high")
         pgmable_ratio=bucket(pgmable_blocks)
         readable_ratio=bucket(readable_blocks)
-        plane_busy_frac="high" if self.available_at(die,plane)>now_us else "low"
+        plane_busy_frac="high" if self.available_at(die,plane)>now else "low"
         return ({"pgmable_ratio": pgmable_ratio, "readable_ratio": readable_ratio, "cls":"host"},
                 {"plane_busy_frac": plane_busy_frac})
 
     # ---- bus segments & gating ----
     def bus_segments_for_op(self, op: Operation)->List[Tuple[float,float]]:
-        if op.name == "SR" and op.states[0].name == "ISSUE":
-            print(f"op: {op.name} state: {op.states[0].name} bus: {op.states[0].bus} dur_us: {op.states[0].dur_us}")
-        segs=[]; t=0.0
+        if op.name == "SR" and op.states[0].name == "ISSUE" and LOG_ADDR.isEnabledFor(DEBUG):
+            LOG_ADDR.debug("op: %s state: %s bus: %s dur_us: %s", op.name, op.states[0].name, op.states[0].bus, op.states[0].dur_us)
+        # op 시작 기준 (off0, off1) 기간 저장값
+        segs=[]; t=0
         for s in op.states:
-            if s.bus: segs.append((t, t+s.dur_us))
-            t+=s.dur_us
+            if s.bus: segs.append((t, t+s.dur_k))
+            t+=s.dur_k
         return segs
 
     def bus_precheck(self, op: Operation, start_hint: float, segs: List[Tuple[float,float]])->bool:
+        norm=self.tb.norm; hz=self.bus_horizon
         for (off0,off1) in segs:
-            a0, a1 = quantize(start_hint+off0), quantize(start_hint+off1)
-            for (s,e) in self.bus_resv:
-                if not (a1<=s or e<=a0):
-                    if op.name == "SR" and op.states[0].name == "ISSUE":
-                        print(f"bus_precheck: op: {op.name} state: {op.states[0].name} bus: {op.states[0].bus} dur_us: {op.states[0].dur_us} start_hint: {start_hint} off0: {off0} off1: {off1} segs: {segs} a0: {a0} a1: {a1} s: {s} e: {e}")
-                    return False
+            a0, a1 = norm(start_hint+off0), norm(start_hint+off1)
+            if hz is not None and a1 > hz:
+                return False
+            hit=self.bus_resv.first_overlap(a0, a1)
+            if hit is not None:
+                if op.name == "SR" and op.states[0].name == "ISSUE" and LOG_ADDR.isEnabledFor(DEBUG):
+                    us=self.tb.us; s, e = hit
+                    LOG_ADDR.debug("bus_precheck: op: %s state: %s bus: %s dur_us: %s start_hint: %s off0: %s off1: %s segs: %s a0: %s a1: %s s: %s e: %s",
+                                   op.name, op.states[0].name, op.states[0].bus, op.states[0].dur_us, us(start_hint), off0, off1, segs, us(a0), us(a1), us(s), us(e))
+                return False
         return True
 
     def bus_reserve(self, start_time: float, segs: List[Tuple[float,float]]):
+        norm=self.tb.norm; log=self.bus_log
         for (off0,off1) in segs:
-            self.bus_resv.append((quantize(start_time+off0), quantize(start_time+off1)))
+            a0, a1 = norm(start_time+off0), norm(start_time+off1)
+            self.bus_resv.add(a0, a1)
+            if log is not None:
+                log.append((a0, a1))
+
+    def retire(self, now: float):
+        """now 이전에 끝난 plane/bus 예약 제거. 이후 질의는 모두 now 이후에 시작하므로 결과 불변."""
+        k=now
+        if k == self._retire_k:
+            return
+        self._retire_k=k
+        for iv in self.resv.values():
+            iv.retire(k)
+        self.bus_resv.retire(k)
 
     # ---- future/committed helpers ----
     def _next_page_future(self, die:int, block:int)->int:
-        last = self.addr_state_future[(die,block)]
+        last = int(self.addr_state_future[die, block])
         return (last + 1) if last < self.pages_per_block-1 else self.pages_per_block
 
-    def _find_block_for_page_future_on_plane(self, die:int, plane:int, target_page:int)->Optional[int]:
-        for b in self.iter_blocks_of_plane(plane):
-            if self._next_page_future(die,b) == target_page:
-                return b
-        return None
+    def _find_block_for_page_future_on_plane(self, die:int, plane:int, target_page:int,
+                                             start_block: Optional[int]=None)->Optional[int]:
+        # next page == target_page  <=>  fut == target_page-1 (가득 찬 block 은 fut == pages_per_block-1)
+        if target_page > self.pages_per_block:
+            return None
+        return self._first_from(self.fut_blocks[die][plane].get(target_page-1), plane, start_block)
 
     def _first_erased_block_on_plane(self, die:int, plane:int)->Optional[int]:
-        for b in self.iter_blocks_of_plane(plane):
-            if self.addr_state_future[(die,b)] == -1:
-                return b
-        return None
+        return self._first_from(self.fut_blocks[die][plane].get(-1), plane)
 
-    def _committed_pages_on_plane(self, die:int, plane:int)->Set[int]:
-        return {p for (b,p) in self.programmed_committed[(die,)] if (b % self.planes)==plane}
+    def _committed_pages_on_plane(self, die:int, plane:int)->int:
+        """plane stripe 에 커밋된 page bitmap."""
+        return self.programmed_committed.plane_pages(die, plane)
 
-    def _future_pages_on_plane(self, die:int, plane:int)->Set[int]:
-        return {p for (b,p) in self.programmed_future[(die,)] if (b % self.planes)==plane}
+    def _future_pages_on_plane(self, die:int, plane:int)->int:
+        """plane stripe 에 (예약 포함) 기록된 page bitmap."""
+        return self.programmed_future.plane_pages(die, plane)
 
     # ---- planner (non-greedy; degrade fanout; READ=committed, PROGRAM=future) ----
     def _random_plane_sets(self, fanout:int, tries:int, start_plane:int)->List[List[int]]:
-        """난수 기반 plane-set 후보 생성 (재현성은 random.seed에 따름)"""
+        """난수 기반 plane-set 후보 생성 (재현성은 rng 시드에 따름)"""
         P=list(range(self.planes)); out=[]
         for _ in range(tries):
-            cand=set(random.sample(P, min(fanout,len(P))))
-            if start_plane not in cand and random.random()<0.6:
+            cand=set(self.rng.sample(P, min(fanout,len(P))))
+            if start_plane not in cand and self.rng.random()<0.6:
                 # 무작위로 하나 제거하여 start_plane 포함
                 if len(cand)>0:
-                    rem=random.choice(sorted(cand))
+                    rem=self.rng.choice(sorted(cand))
                     cand.remove(rem)
                 cand.add(start_plane)
             if len(cand)==fanout:
@@ -904,30 +1846,28 @@ class AddressManager:
     def plan_multiplane(self, kind: Enum, die:int, start_plane:int, desired_fanout:int, interleave:bool)\
             -> Optional[Tuple[List[Address], List[int], Scope]]:
         if desired_fanout<1: desired_fanout=1
-        tries=self.cfg["policy"]["planner_max_tries"]
+        tries=self.cc.planner_max_tries
         for f in range(desired_fanout, 0, -1):
             for plane_set in self._random_plane_sets(f, tries, start_plane):
-                if kind==OpKind.READ:
-                    commons=None
-                    for pl in plane_set:
-                        pages=self._future_pages_on_plane(die, pl)
-                        commons=pages if commons is None else (commons & pages)
-                        if not commons: break
+                if kind==self.kinds.READ:
+                    commons=self.programmed_future.common_pages(die, plane_set)
                     if not commons: continue
-                    page=random.choice(sorted(list(commons)))
+                    page=self.rng.choice(commons)
                     targets=[]
+                    pf=self.programmed_future
+                    pick=pf.first_block_in_order if pf.order is not None else pf.first_block_with_page
                     for pl in plane_set:
-                        blks=[b for (b,p) in self.programmed_future[(die,)] if p==page and (b%self.planes)==pl]
-                        if not blks: targets=[]; break
-                        targets.append(Address(die,pl,blks[0],page))
+                        b=pick(die, pl, page)
+                        if b is None: targets=[]; break
+                        targets.append(Address(die,pl,b,page))
                     if not targets: continue
                     return targets, plane_set, Scope.PLANE_SET
 
-                elif kind==OpKind.PROGRAM:
+                elif kind==self.kinds.PROGRAM:
                     # candidate page: mode of next pages across write heads; or 0 if fresh erased exists
                     nxts=[]
                     for pl in plane_set:
-                        b_head=self.write_head[(die,pl)]
+                        b_head=int(self.write_head[die, pl])
                         nx=self._next_page_future(die,b_head)
                         nxts.append(None if nx>=self.pages_per_block else nx)
                     candidates=[]
@@ -941,22 +1881,17 @@ class AddressManager:
                     if not candidates: continue
 
                     chosen=None
-                    search_order = str(self.cfg.get("addressing", {}).get("program", {}).get("search_order", "ascending")).lower()
+                    search_order = self.cc.program_search_order
                     for page in candidates:
                         tlist=[]
                         ok=True
                         for pl in plane_set:
-                            b_head=self.write_head[(die,pl)]
+                            b_head=int(self.write_head[die, pl])
                             if self._next_page_future(die,b_head)==page:
                                 b=b_head
                             else:
                                 if search_order=="cyclic_from_write_head":
-                                    b=None
-                                    for bb in self._iter_blocks_of_plane_cyclic(pl, b_head):
-                                        if self._next_page_future(die,bb)==page:
-                                            b=bb; break
-                                    if b is None:
-                                        b=self._find_block_for_page_future_on_plane(die,pl,page)
+                                    b=self._find_block_for_page_future_on_plane(die,pl,page,start_block=b_head)
                                 else:
                                     b=self._find_block_for_page_future_on_plane(die,pl,page)
                                 if b is None: ok=False; break
@@ -966,27 +1901,22 @@ class AddressManager:
                     # debug log
                     return chosen, plane_set, Scope.DIE_WIDE
 
-                elif kind==OpKind.ERASE:
+                elif kind==self.kinds.ERASE:
                     targets=[]
-                    pick_strategy = str(self.cfg.get("addressing", {}).get("erase", {}).get("pick_strategy", "ascending_non_erased")).lower()
+                    pick_strategy = self.cc.erase_pick_strategy
                     for pl in plane_set:
-                        chosen_b=None
+                        non_erased = self.non_erased[die][pl]
                         if pick_strategy=="cyclic_from_write_head":
-                            start_b = self.write_head[(die,pl)]
-                            for bb in self._iter_blocks_of_plane_cyclic(pl, start_b):
-                                if self.addr_state_future[(die,bb)] >= 0:
-                                    chosen_b=bb; break
+                            chosen_b=self._first_from(non_erased, pl, int(self.write_head[die, pl]))
                         else:  # ascending_non_erased (default)
-                            for bb in self.iter_blocks_of_plane(pl):
-                                if self.addr_state_future[(die,bb)] >= 0:
-                                    chosen_b=bb; break
+                            chosen_b=self._first_from(non_erased, pl)
                         if chosen_b is None:
-                            chosen_b=self.write_head[(die,pl)]
+                            chosen_b=int(self.write_head[die, pl])
                         targets.append(Address(die, pl, chosen_b, 0))  # page=0 for logging
                     # debug log
                     return targets, plane_set, Scope.DIE_WIDE
 
-                elif kind==OpKind.SR:
+                elif kind==self.kinds.SR:
                     # page=0 for uniform address shape
                     tgt = [Address(die, plane_set[0], plane_set[0], 0)]
                     return tgt, plane_set[:1], Scope.NONE
@@ -995,158 +1925,164 @@ class AddressManager:
 
     # ---- precheck/reserve/future/commit ----
     def precheck_planescope(self, kind: Enum, targets: List[Address], start_hint: float, scope: Scope)->bool:
-        start_hint=quantize(start_hint); end_hint=start_hint
+        start_k=start_hint; end_k=start_k
+        dbg=LOG_ADDR.isEnabledFor(DEBUG); us=self.tb.us
+        end_hint=start_hint
         die=targets[0].die
         # time overlap check
         if scope==Scope.DIE_WIDE: planes={(die,p) for p in range(self.planes)}
         elif scope==Scope.PLANE_SET: planes={(t.die,t.plane) for t in targets}
         else: planes={(targets[0].die, targets[0].plane)}
         for (d,p) in planes:
-            for (s,e,_) in self.resv[(d,p)]:
-                if not (end_hint<=s or e<=start_hint):
-                    print(f"[PRECCHK] time_overlap d={d} p={p} start={start_hint:.2f} overlaps=({s:.2f},{e:.2f}) scope={scope.name}")
-                    return False
+            hit=self.resv[(d,p)].first_overlap(start_k, end_k)
+            if hit is not None:
+                if dbg: LOG_ADDR.debug("[PRECCHK] time_overlap d=%s p=%s start=%.2f overlaps=(%.2f,%.2f) scope=%s", d, p, us(start_hint), us(hit[0]), us(hit[1]), scope.name)
+                return False
         # address/plane consistency + rules
         for t in targets:
             if t.plane != (t.block % self.planes):
-                print(f"[PRECCHK] plane_consistency die={t.die} plane={t.plane} block={t.block} expected={t.block % self.planes}")
+                if dbg: LOG_ADDR.debug("[PRECCHK] plane_consistency die=%s plane=%s block=%s expected=%s", t.die, t.plane, t.block, t.block % self.planes)
                 return False
-            com=self.addr_state_committed[(t.die,t.block)]
-            fut=self.addr_state_future[(t.die,t.block)]
-            if kind==OpKind.PROGRAM:
+            com=int(self.addr_state_committed[t.die, t.block])
+            fut=int(self.addr_state_future[t.die, t.block])
+            if kind==self.kinds.PROGRAM:
                 if t.page is None:
-                    print(f"[PRECCHK] program_page_none die={t.die} block={t.block}")
+                    if dbg: LOG_ADDR.debug("[PRECCHK] program_page_none die=%s block=%s", t.die, t.block)
                     return False
                 if t.page != fut + 1:
-                    print(f"[PRECCHK] program_seq die={t.die} block={t.block} want={fut+1} got={t.page} fut={fut} com={com}")
+                    if dbg: LOG_ADDR.debug("[PRECCHK] program_seq die=%s block=%s want=%s got=%s fut=%s com=%s", t.die, t.block, fut+1, t.page, fut, com)
                     return False
                 if t.page >= self.pages_per_block:
-                    print(f"[PRECCHK] program_oob die={t.die} block={t.block} page={t.page} pages_per_block={self.pages_per_block}")
+                    if dbg: LOG_ADDR.debug("[PRECCHK] program_oob die=%s block=%s page=%s pages_per_block=%s", t.die, t.block, t.page, self.pages_per_block)
                     return False
                 # prevent programming a page that is under a future erase window overlapping start_hint
-                guard = float(self.cfg.get("policy",{}).get("program_erase_conflict_guard_us", 0.0))
+                guard = self.cc.program_erase_conflict_guard_k
                 wins = self.future_erase_by_block.get((t.die,t.block), [])
                 for (s,e) in wins:
                     if not ((e <= (start_hint - guard)) or (end_hint <= s)):
-                        print(f"[PRECCHK] program_future_erase_conflict die={t.die} block={t.block} page={t.page} win=({s:.2f},{e:.2f})")
+                        if dbg: LOG_ADDR.debug("[PRECCHK] program_future_erase_conflict die=%s block=%s page=%s win=(%.2f,%.2f)", t.die, t.block, t.page, us(s), us(e))
                         return False
-            elif kind==OpKind.READ:
+            elif kind==self.kinds.READ:
                 if t.page is None:
-                    print(f"[PRECCHK] read_page_none die={t.die} block={t.block}")
+                    if dbg: LOG_ADDR.debug("[PRECCHK] read_page_none die=%s block=%s", t.die, t.block)
                     return False
                 if fut <= -1:
-                    print(f"[PRECCHK] read_seq die={t.die} block={t.block} page={t.page} fut={fut} com={com}")
+                    if dbg: LOG_ADDR.debug("[PRECCHK] read_seq die=%s block=%s page=%s fut=%s com=%s", t.die, t.block, t.page, fut, com)
                     return False
                 if t.page >= self.pages_per_block:
-                    print(f"[PRECCHK] read_oob die={t.die} block={t.block} page={t.page} pages_per_block={self.pages_per_block}")
+                    if dbg: LOG_ADDR.debug("[PRECCHK] read_oob die=%s block=%s page=%s pages_per_block=%s", t.die, t.block, t.page, self.pages_per_block)
                     return False
                 # consider future program windows: if page is not yet committed now, allow if a future PROGRAM window ends before this READ starts
-                committed_now = ((t.block, t.page) in self.programmed_committed[(t.die,)])
-                pol = self.cfg.get("policy", {})
+                committed_now = self.programmed_committed.contains(t.die, t.block, t.page)
+                cc = self.cc
                 if (not committed_now):
-                    if bool(pol.get("read_requires_committed", False)):
-                        print(f"[PRECCHK] read_requires_committed die={t.die} block={t.block} page={t.page}")
+                    if cc.read_requires_committed:
+                        if dbg: LOG_ADDR.debug("[PRECCHK] read_requires_committed die=%s block=%s page=%s", t.die, t.block, t.page)
                         return False
-                    if bool(pol.get("read_allow_future_program", True)):
+                    if cc.read_allow_future_program:
                         wins = self.future_program_by_page.get((t.die,t.block,int(t.page)), [])
-                        guard = float(pol.get("read_future_program_guard_us", 0.01))
+                        guard = cc.read_future_program_guard_k
                         prog_ok = any(e <= (start_hint - guard) for (s,e) in wins)
                         if not prog_ok:
-                            print(f"[PRECCHK] read_not_committed (no prior future program) die={t.die} block={t.block} page={t.page} at={start_hint:.2f}")
+                            if dbg: LOG_ADDR.debug("[PRECCHK] read_not_committed (no prior future program) die=%s block=%s page=%s at=%.2f", t.die, t.block, t.page, us(start_hint))
                             return False
                     else:
-                        print(f"[PRECCHK] read_not_committed (future program not allowed) die={t.die} block={t.block} page={t.page}")
+                        if dbg: LOG_ADDR.debug("[PRECCHK] read_not_committed (future program not allowed) die=%s block=%s page=%s", t.die, t.block, t.page)
                         return False
                 # also block READ if a future ERASE overlaps or ends at/after start (treat boundary as conflict)
                 wins_er = self.future_erase_by_block.get((t.die,t.block), [])
-                er_guard = float(pol.get("read_erase_guard_margin_us", 0.0))
+                er_guard = cc.read_erase_guard_margin_k
                 for (s,e) in wins_er:
                     if not ((e <= (start_hint - er_guard)) or (end_hint <= s)):
-                        print(f"[PRECCHK] read_future_erase_conflict die={t.die} block={t.block} page={t.page} win=({s:.2f},{e:.2f})")
+                        if dbg: LOG_ADDR.debug("[PRECCHK] read_future_erase_conflict die=%s block=%s page=%s win=(%.2f,%.2f)", t.die, t.block, t.page, us(s), us(e))
                         return False
-            elif kind==OpKind.ERASE:
+            elif kind==self.kinds.ERASE:
                 pass
         return True
 
     def reserve_planescope(self, op: Operation, start: float, end: float):
-        die=op.targets[0].die; start=quantize(start); end=quantize(end)
-        if op.meta.get("scope")=="DIE_WIDE":
+        die=op.targets[0].die
+        if op.scope=="DIE_WIDE":
             planes=[(die,p) for p in range(self.planes)]
-        elif op.meta.get("scope")=="PLANE_SET":
+        elif op.scope=="PLANE_SET":
             planes=[(t.die,t.plane) for t in op.targets]
         else:
             planes=[(op.targets[0].die, op.targets[0].plane)]
         for (d,p) in planes:
-            self.available[(d,p)]=max(self.available[(d,p)], end)
-            self.resv[(d,p)].append((start,end,None))
+            if end > self.available[d][p]:
+                self.available[d][p]=end
+            self.resv[(d,p)].add(start, end)
 
     def register_future(self, op: Operation, start: float, end: float):
         for t in op.targets:
             key=(t.die,t.block)
-            if op.base==OpKind.PROGRAM and t.page is not None:
-                self.addr_state_future[key] = max(self.addr_state_future[key], t.page)
-                self.programmed_future[(t.die,)].add((t.block, t.page))
+            if op.base==self.kinds.PROGRAM and t.page is not None:
+                if t.page > self.addr_state_future[key]:
+                    self._set_future(t.die, t.block, t.page)
+                self.programmed_future.add(t.die, t.block, t.page)
                 # advance write head if full
                 nxt = self._next_page_future(t.die, t.block)
                 if nxt >= self.pages_per_block:
                     er = self._first_erased_block_on_plane(t.die, t.plane)
                     if er is not None:
-                        self.write_head[(t.die, t.plane)] = er
+                        self.write_head[t.die, t.plane] = er
                 # future program window register
                 kpp=(t.die,t.block,int(t.page))
-                self.future_program_by_page.setdefault(kpp, []).append((quantize(start), quantize(end)))
-            elif op.base==OpKind.ERASE:
-                self.addr_state_future[key] = -1
-                self.programmed_future[(t.die,)].clear()
-                on_erase = str(self.cfg.get("addressing", {}).get("write_head", {}).get("on_erase", "to_erased_block")).lower()
+                self.future_program_by_page.setdefault(kpp, []).append((start, end))
+            elif op.base==self.kinds.ERASE:
+                self._set_future(t.die, t.block, -1)
+                # 기존 동작 유지: ERASE 예약 시 die 전체의 future program 기록을 비움
+                self.programmed_future.clear_die(t.die)
+                on_erase = self.cc.write_head_on_erase
                 if on_erase=="round_robin_next":
                     # move to next block in stripe after erased block
                     next_b = t.block + self.planes
                     if next_b >= self.blocks:
                         next_b = t.plane  # wrap to first stripe block for this plane
-                    self.write_head[(t.die, t.plane)] = next_b
+                    self.write_head[t.die, t.plane] = next_b
                 elif on_erase=="stay":
                     # do not change write_head
                     pass
                 else:  # to_erased_block (default)
-                    self.write_head[(t.die, t.plane)] = t.block
+                    self.write_head[t.die, t.plane] = t.block
                 # future erase window register
-                self.future_erase_by_block.setdefault(key, []).append((quantize(start), quantize(end)))
+                self.future_erase_by_block.setdefault(key, []).append((start, end))
 
     def commit(self, op: Operation):
         for t in op.targets:
             key=(t.die,t.block)
-            if op.base==OpKind.PROGRAM and t.page is not None:
-                self.addr_state_committed[key] = max(self.addr_state_committed[key], t.page)
-                self.programmed_committed[(t.die,)].add((t.block, t.page))
+            if op.base==self.kinds.PROGRAM and t.page is not None:
+                if t.page > self.addr_state_committed[key]:
+                    self.addr_state_committed[key] = t.page
+                self.programmed_committed.add(t.die, t.block, t.page)
                 # record last program end
                 try:
-                    self.last_program_end[(t.die,t.block,int(t.page))] = float(self.available[(t.die,t.plane)])
+                    self.last_program_end[(t.die,t.block,int(t.page))] = self.available[t.die][t.plane]
                 except Exception:
                     pass
-            elif op.base==OpKind.ERASE:
+            elif op.base==self.kinds.ERASE:
                 self.addr_state_committed[key] = -1
-                self.programmed_committed[(t.die,)] = {
-                    pp for pp in self.programmed_committed[(t.die,)] if pp[0] != t.block
-                }
+                self.programmed_committed.clear_block(t.die, t.block)
                 # record last erase end
                 try:
-                    self.last_erase_end[(t.die,t.block)] = float(self.available[(t.die,t.plane)])
+                    self.last_erase_end[t.die, t.block] = self.available[t.die][t.plane]
                 except Exception:
                     pass
 
 # --------------------------------------------------------------------------
 # Exclusion Manager (runtime blocking windows)
-@dataclass
+@dataclass(slots=True)
 class ExclWindow:
-    start: float; end: float
+    start: float; end: float  # TimeBase 저장값
     scope: str
     die: Optional[int]
     tokens: Set[str]  # {"ANY"}, {"BASE:READ"}, {"ALIAS:MUL_READ"} ...
 
 class ExclusionManager:
-    def __init__(self, cfg: Dict[str,Any]):
+    def __init__(self, cfg: Dict[str,Any], tables: Optional[SimTables] = None):
         self.cfg = cfg
+        self.kinds = (tables or _DEFAULT_TABLES).opkind
+        self.tb = TimeBase.from_cfg(cfg)
         self.global_windows: List[ExclWindow] = []
         self.die_windows: Dict[int, List[ExclWindow]] = {}
 
@@ -1154,7 +2090,7 @@ class ExclusionManager:
         wins=[]; t=start
         segs=[]
         for s in op.states:
-            segs.append((s.name, t, t+s.dur_us)); t+=s.dur_us
+            segs.append((s.name, t, t+s.dur_k)); t+=s.dur_k
         if states==["*"]:
             return [(segs[0][1], segs[-1][2])]
         want=set(states)
@@ -1169,8 +2105,8 @@ class ExclusionManager:
             return op.base.name==base
         if tok.startswith("ALIAS:"):
             alias=tok.split(":")[1]
-            if alias=="MUL_READ": return (op.base==OpKind.READ and op.meta.get("arity",1)>1)
-            if alias=="SIN_READ": return (op.base==OpKind.READ and op.meta.get("arity",1)==1)
+            if alias=="MUL_READ": return (op.base==self.kinds.READ and op.arity>1)
+            if alias=="SIN_READ": return (op.base==self.kinds.READ and op.arity==1)
         return False
 
     def allowed(self, op: Operation, start: float, end: float) -> bool:
@@ -1190,22 +2126,39 @@ class ExclusionManager:
             # if_op: op_base
             when=r["when"]; if_op=when.get("op")
             if if_op != op.base.name:
-                if not (op.base==OpKind.READ and if_op=="READ"):
+                if not (op.base==self.kinds.READ and if_op=="READ"):
                     continue
             alias_need = when.get("alias")
-            if alias_need=="MUL" and not (op.meta.get("arity",1)>1): continue
-            if alias_need=="SIN" and not (op.meta.get("arity",1)==1): continue
+            if alias_need=="MUL" and not (op.arity>1): continue
+            if alias_need=="SIN" and not (op.arity==1): continue
             states = when.get("states", ["*"])
             windows = self._state_windows(op, start, states)
             scope=r.get("scope","GLOBAL"); tokens=set(r.get("blocks",[]))
+            norm=self.tb.norm
             for (s0,s1) in windows:
-                w=ExclWindow(start=quantize(s0), end=quantize(s1), scope=scope,
+                w=ExclWindow(start=norm(s0), end=norm(s1), scope=scope,
                              die=(die if scope=="DIE" else None), tokens=tokens)
                 if scope=="GLOBAL":
                     self.global_windows.append(w)
                 else:
                     self.die_windows.setdefault(die,[]).append(w)
 
+    def next_end(self, die: int, now: float) -> Optional[float]:
+        """die 에 걸리는 창(GLOBAL + 이 die 의 DIE) 중 now 이후 가장 먼저 끝나는 시각."""
+        ends=[w.end for w in self.global_windows if w.end > now]
+        ends.extend(w.end for w in self.die_windows.get(die, ()) if w.end > now)
+        return min(ends, default=None)
+
+    def prune(self, now: float) -> int:
+        """now 이전에 끝난 창 제거 (allowed 질의는 항상 now 이후 구간). 버린 개수 반환."""
+        k=now; n=0
+        lists=[self.global_windows]+list(self.die_windows.values())
+        for ws in lists:
+            keep=[w for w in ws if w.end > k]
+            n+=len(ws)-len(keep)
+            ws[:]=keep
+        return n
+
 # --------------------------------------------------------------------------
 # Latch Manager: READ.end_us ~ DOUT.end_us 동안 (die,plane) 래치 보존 락
 @dataclass
@@ -1214,7 +2167,8 @@ class _Latch:
     end_us: Optional[float]  # None -> open until DOUT end
 
 class LatchManager:
-    def __init__(self):
+    def __init__(self, tables: Optional[SimTables] = None):
+        self.kinds = (tables or _DEFAULT_TABLES).opkind
         # (die, plane) -> _Latch
         self._locks: Dict[Tuple[int,int], _Latch] = {}
 
@@ -1237,13 +2191,13 @@ class LatchManager:
 
     def allowed(self, op: Operation, start_hint: float) -> bool:
         # DOUT/SR allowed (does not corrupt latch)
-        if op.base in (OpKind.DOUT, OpKind.SR):
+        if op.base in (self.kinds.DOUT, self.kinds.SR):
             return True
-        if op.base not in (OpKind.READ, OpKind.PROGRAM, OpKind.ERASE):
+        if op.base not in (self.kinds.READ, self.kinds.PROGRAM, self.kinds.ERASE):
             return True
 
         die = op.targets[0].die
-        scope = op.meta.get("scope", "PLANE_SET")
+        scope = op.scope or "PLANE_SET"
 
         if scope == "DIE_WIDE":
             for (d,p), _ in self._locks.items():
@@ -1258,7 +2212,7 @@ class LatchManager:
 
 # --------------------------------------------------------------------------
 # State Timeline (OP.STATE + END with inf tail)
-@dataclass
+@dataclass(slots=True)
 class StateInterval:
     die: int
     plane: int
@@ -1269,7 +2223,9 @@ class StateInterval:
     end_us: float
 
 class StateTimeline:
-    def __init__(self):
+    """plane 별 OP.STATE 구간 (+inf END 꼬리). 시각은 TimeBase 저장값, to_dataframe/to_csv 에서 µs 로 변환."""
+    def __init__(self, tb: Optional[TimeBase] = None):
+        self.tb = tb or TimeBase()
         self.by_plane: Dict[Tuple[int,int], List[StateInterval]] = {}
         self.last_end_idx: Dict[Tuple[int,int], int] = {}
         # 1) per-plane starts cache for binary search
@@ -1281,6 +2237,29 @@ class StateTimeline:
         self._global_index: List[StateInterval] = []
         self._global_starts: List[float] = []
 
+    def __deepcopy__(self, memo):
+        """
+        fork 용 구조 공유: 인덱스 리스트만 복사하고 닫힌 StateInterval 은 원본과 공유.
+        이후 잘리는 END 꼬리(end_us=inf, by_plane 에만 있음)만 복사.
+        """
+        new = StateTimeline.__new__(StateTimeline); memo[id(self)] = new
+        new.tb = self.tb
+        def seg(s: StateInterval) -> StateInterval:
+            if s.end_us != float("inf"):
+                return s
+            c = memo.get(id(s))
+            if c is None:
+                c = memo[id(s)] = copy.copy(s)
+            return c
+        new.by_plane = {k: [seg(s) for s in lst] for k, lst in self.by_plane.items()}
+        new.last_end_idx = dict(self.last_end_idx)
+        new._starts_by_plane = {k: v[:] for k, v in self._starts_by_plane.items()}
+        new._die_index = {k: v[:] for k, v in self._die_index.items()}
+        new._die_starts = {k: v[:] for k, v in self._die_starts.items()}
+        new._global_index = self._global_index[:]
+        new._global_starts = self._global_starts[:]
+        return new
+
     def _insert_plane(self, key: Tuple[int,int], seg: StateInterval):
         lst = self.by_plane.setdefault(key, [])
         starts = self._starts_by_plane.setdefault(key, [s.start_us for s in lst])
@@ -1291,6 +2270,7 @@ class StateTimeline:
         i = _bisect.bisect_left(starts, seg.start_us)
         lst.insert(i, seg)
         starts.insert(i, seg.start_us)
+        return i
 
     def _insert_die(self, die: int, seg: StateInterval):
         if seg.state == "END":
@@ -1329,15 +2309,14 @@ class StateTimeline:
         # insert concrete states
         t = start_us
         for st_name, dur in states:
-            seg = StateInterval(die, plane, op_name, op_base, st_name, t, t + float(dur))
+            seg = StateInterval(die, plane, op_name, op_base, st_name, t, t + dur)
             self._insert_plane(key, seg)
             self._insert_die(die, seg)
             self._insert_global(seg)
-            t += float(dur)
+            t += dur
         # insert new END
         end_seg = StateInterval(die, plane, op_name, op_base, "END", t, _math.inf)
-        self._insert_plane(key, end_seg)
-        self.last_end_idx[key] = lst.index(end_seg)
+        self.last_end_idx[key] = self._insert_plane(key, end_seg)
 
     def state_at(self, die: int, plane: int, t: float) -> Optional[str]:
         key=(die, plane)
@@ -1378,13 +2357,40 @@ class StateTimeline:
             i += 1
         return False
 
+    def prune(self, watermark: float) -> int:
+        """
+        watermark 이전에 끝난 segment 를 앞에서부터 제거 (END inf 꼬리는 유지). 버린 개수 반환.
+        질의(state_at/overlaps*)는 모두 now 이후 구간이라 watermark=now 면 결과 불변.
+        """
+        def cut(lst, starts) -> int:
+            i = 0; n = len(lst)
+            while i < n and lst[i].end_us <= watermark:
+                i += 1
+            if i:
+                del lst[:i]
+                if starts is not None and len(starts) >= i:
+                    del starts[:i]
+            return i
+        n = 0
+        for key, lst in self.by_plane.items():
+            k = cut(lst, self._starts_by_plane.get(key))
+            if k:
+                n += k
+                idx = self.last_end_idx.get(key)
+                if idx is not None:
+                    self.last_end_idx[key] = idx - k
+        for die, lst in self._die_index.items():
+            n += cut(lst, self._die_starts.get(die))
+        n += cut(self._global_index, self._global_starts)
+        return n
+
     def to_dataframe(self):
         """
         Materialize state timeline to a pandas DataFrame for visualization/export.
         - Includes END segments if they have a finite end (infinite tail segments are skipped)
         - Columns: start_us, end_us, die, plane, op_state(OP.STATE), lane("die/plane"), op_name(OP), state, dur_us
         """
-        rows = []
+        rows = []; us = self.tb.us
         for (die, plane), lst in self.by_plane.items():
             for seg in lst:
                 # keep END only if it has a finite end time (tail with +inf is skipped)
@@ -1397,8 +2403,8 @@ class StateTimeline:
                         # best-effort: if end_us is a very large number, still include
                         pass
                 rows.append({
-                    "start_us": float(seg.start_us),
-                    "end_us": float(seg.end_us),
+                    "start_us": us(seg.start_us),
+                    "end_us": us(seg.end_us),
                     "die": int(die),
                     "plane": int(plane),
                     "op_state": f"{seg.op_base}.{seg.state}",
@@ -1434,7 +2440,7 @@ class StateTimeline:
             else:
                 df.to_csv(path, index=False)
         except Exception as _e:
-            print(f"[STATE_TIMELINE] export failed: {_e}")
+            LOG_STATE.warning("[STATE_TIMELINE] export failed: %s", _e)
 
     def overlaps_die(self, die: int, start: float, end: float, pred=None) -> bool:
         lst = self._die_index.get(die, [])
@@ -1475,13 +2481,13 @@ class StateTimeline:
 
 # --------------------------------------------------------------------------
 # Obligation Manager (with stats)
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class _ObHeapItem:
     deadline_us: float
     seq: int
     ob: "Obligation" = field(compare=False)
 
-@dataclass
+@dataclass(slots=True)
 class Obligation:
     id: int
     # require: OpKind
@@ -1494,11 +2500,26 @@ class Obligation:
     skip_dout_creation: bool = False
 
 class ObligationManager:
-    def __init__(self, cfg_list: List[Dict[str,Any]], cfg_root: Optional[Dict[str,Any]] = None):
+    def __init__(self, cfg_list: List[Dict[str,Any]], cfg_root: Optional[Dict[str,Any]] = None,
+                 tables: Optional[SimTables] = None, rng=random, cc: Optional[CompiledCfg] = None):
         self.specs = cfg_list
         self.cfg_root = cfg_root
+        self.cc = cc or (compile_cfg(cfg_root, tables) if cfg_root is not None else None)
+        self.kinds = (tables or _DEFAULT_TABLES).opkind; self.rng = rng
+        # deadline_us 및 메서드의 시각 인자는 TimeBase 저장값 (로그 출력 때만 µs 로 변환)
+        self.tb = TimeBase.from_cfg(cfg_root or {})
+        self._extend_pad = self.tb.dur(0.2)   # expire_due 연장 여유
         self.heap: List[_ObHeapItem] = []
+        # heap 요약 (push/pop_urgent 선택 시 갱신): id -> ob, source 별 수, die 별 hard_slot 수,
+        # die 별 (deadline, id) lazy heap (deadline 이 바뀌었거나 heap 에 없는 항목은 top 에서 버림)
+        self._live: Dict[int, Obligation] = {}
+        self._src_n: Dict[Optional[str], int] = defaultdict(int)
+        self._hard_n: Dict[int, int] = defaultdict(int)
+        self._die_dl: Dict[int, List[Tuple[float,int]]] = {}
         self._seq = 0
+        # parallel: 다른 partition 에 아직 남은 의무 source (배리어마다 갱신, has_pending 이 함께 봄)
+        self.remote_pending: Set[Optional[str]] = set()
+        self.extended = 0   # expire_due 로 heap 전체에 더한 deadline 연장 누적 (저장값, partition 간 동기화용)
         self.assigned: Dict[int, Obligation] = {}
         self.stats = {
             "created":0,
@@ -1524,11 +2545,11 @@ class ObligationManager:
 
     def _page_index_of_ob(self, ob: Obligation) -> int:
         try:
-            if ob.require in (OpKind.PROGRAM, OpKind.READ):
+            if ob.require in (self.kinds.PROGRAM, self.kinds.READ):
                 # multi-plane, same page index
                 pages = [t.page for t in ob.targets if t.page is not None]
                 return int(pages[0]) if pages else -1
-            elif ob.require in (OpKind.ERASE, OpKind.DOUT):
+            elif ob.require in (self.kinds.ERASE, self.kinds.DOUT):
                 return int(ob.targets[0].page or 0)
         except Exception:
             return -1
@@ -1552,9 +2573,9 @@ class ObligationManager:
                     if p_i < p_j and dl_i > dl_j:
                         inv.append(((id_i, p_i, dl_i), (id_j, p_j, dl_j)))
             if self.debug:
-                print(f"[OBLIGAUD] order_check where={where} require={req_name} die={die} src={src} pages_deadlines={[(p, round(d,2)) for _,p,d in items_sorted]}")
+                LOG_OBL.debug("[OBLIGAUD] order_check where=%s require=%s die=%s src=%s pages_deadlines=%s", where, req_name, die, src, [(p, round(self.tb.us(d),2)) for _,p,d in items_sorted])
                 if inv:
-                    print(f"[OBLIGAUD] INVERSION DETECTED where={where} require={req_name} die={die} src={src} inv={inv}")
+                    LOG_OBL.debug("[OBLIGAUD] INVERSION DETECTED where=%s require=%s die=%s src=%s inv=%s", where, req_name, die, src, inv)
             if inv:
                 any_inv = True
         if any_inv and self.assert_on_inversion:
@@ -1563,47 +2584,115 @@ class ObligationManager:
     def _rebuild_heap(self):
         items = self.heap
         self.heap = []
+        self._die_dl = {}
         for it in items:
             heapq.heappush(self.heap, _ObHeapItem(deadline_us=it.ob.deadline_us, seq=it.ob.id, ob=it.ob))
+            heapq.heappush(self._die_dl.setdefault(it.ob.targets[0].die, []), (it.ob.deadline_us, it.ob.id))
+
+    def push(self, ob: Obligation):
+        """heap 에 의무 추가 (생성/requeue/bootstrap 공통 경로)."""
+        heapq.heappush(self.heap, _ObHeapItem(deadline_us=ob.deadline_us, seq=ob.id, ob=ob))
+        die = ob.targets[0].die
+        self._live[ob.id] = ob
+        self._src_n[ob.source] += 1
+        if ob.hard_slot:
+            self._hard_n[die] += 1
+        heapq.heappush(self._die_dl.setdefault(die, []), (ob.deadline_us, ob.id))
+
+    def _taken(self, ob: Obligation):
+        del self._live[ob.id]
+        self._src_n[ob.source] -= 1
+        if ob.hard_slot:
+            self._hard_n[ob.targets[0].die] -= 1
+
+    def _min_deadline(self, die: int) -> Optional[float]:
+        h = self._die_dl.get(die)
+        live = self._live
+        while h:
+            dl, oid = h[0]
+            ob = live.get(oid)
+            if ob is not None and ob.deadline_us == dl:
+                return dl
+            heapq.heappop(h)
+        return None
 
     def requeue(self, ob: Obligation, delta_us: float = 0.2):
         prev = ob.deadline_us
-        ob.deadline_us = quantize(ob.deadline_us + max(0.0, delta_us))
-        heapq.heappush(self.heap, _ObHeapItem(deadline_us=ob.deadline_us, seq=ob.id, ob=ob))
+        tb = self.tb
+        ob.deadline_us = tb.norm(ob.deadline_us + tb.dur(max(0.0, delta_us)))
+        self.push(ob)
         self.stats["requeued"] += 1
         if self.debug:
-            print(f"[OBLIGDBG] requeue: id={ob.id} prev_deadline={prev:.2f} new_deadline={ob.deadline_us:.2f}")
+            LOG_OBL.debug("[OBLIGDBG] requeue: id=%s prev_deadline=%.2f new_deadline=%.2f", ob.id, tb.us(prev), tb.us(ob.deadline_us))
+
+    def next_ready_time(self, die: int, now: float, horizon: float) -> Optional[float]:
+        """이 die의 의무가 pop_urgent 대상(horizon 진입)이 되는 가장 이른 시각. 없으면 None.
+        deadline은 연장(expire_due/requeue)으로만 늘어나므로 반환 시각이 실제보다 늦어지지 않는다.
+        hard_slot 수와 die 별 최소 deadline(lazy heap)으로 판단 (heap 전체 순회 없음)."""
+        if self._hard_n.get(die):
+            return now
+        dl = self._min_deadline(die)
+        if dl is None:
+            return None
+        return max(now, dl - max(horizon, 0))
 
     def has_pending(self, source: Optional[str] = None) -> bool:
-        if not self.heap:
-            return False
         if source is None:
-            return True
-        for item in self.heap:
-            if getattr(item.ob, "source", None) == source:
-                return True
-        return False
+            return bool(self.heap) or bool(self.remote_pending)
+        return self._src_n.get(source, 0) > 0 or source in self.remote_pending
+
+    def pending_sources(self) -> Set[Optional[str]]:
+        """heap 에 남은 의무의 source 집합 (이 partition 것만)."""
+        return {src for src, n in self._src_n.items() if n > 0}
+
+    def sync_extended(self, total: float):
+        """parallel: 다른 partition 의 연장 누적 total 이 더 크면 차이만큼 heap 전체 deadline 을 미룬다
+        (직렬 실행의 expire_due 는 die 와 상관없이 heap 전체를 함께 미룸)."""
+        if total <= self.extended:
+            return
+        norm = self.tb.norm
+        delta = norm(total - self.extended)
+        for it in self.heap:
+            it.ob.deadline_us = norm(it.ob.deadline_us + delta)
+        self._rebuild_heap()
+        self.extended = total
+
+    def retain_dies(self, dies: List[int]):
+        """parallel partition: dies 밖을 target 으로 하는 의무를 버린다 (created 도 남은 것만 센다)."""
+        keep = set(dies)
+        items = self.heap
+        self.heap = []; self._live = {}; self._die_dl = {}
+        self._src_n = defaultdict(int); self._hard_n = defaultdict(int)
+        dropped = 0
+        for it in items:
+            if it.ob.targets[0].die in keep:
+                self.push(it.ob)
+            else:
+                dropped += 1
+        self.stats["created"] -= dropped
 
-    def on_commit(self, op: Operation, now_us: float):
+    def on_commit(self, op: Operation, now: float):
         # READ completion -> create DOUT obligation(s)
+        tb = self.tb
         for spec in self.specs:
             if spec["issuer"] == op.base.name:
                 # Bootstrap 체인으로 미리 생성된 DOUT과 중복 생성 방지 가드
-                if op.meta.get("source") == "bootstrap" or op.meta.get("skip_dout_creation"):
+                if op.source == "bootstrap" or op.skip_dout_creation:
                     continue
 
-                dt = sample_dist(spec["window_us"])
-                base_deadline = quantize(now_us + dt)
+                dt = sample_dist(spec["window_us"], self.rng)
+                base_deadline = tb.norm(now + tb.dur(dt))
                 hard_slot = spec.get("priority_boost", {}).get("hard_slot", False)
                 plane_stagger = spec.get("priority_boost", {}).get("plane_stagger_us", 0.2)
                 # optional: amplify stagger by DOUT duration multiplier N
                 n_mult = float(spec.get("priority_boost", {}).get("plane_stagger_by_dout_n", 0.0))
                 if n_mult and n_mult > 0.0:
-                    dout_dur = get_nominal_duration(self.cfg_root, "DOUT") if hasattr(self, "cfg_root") else 0.0
+                    o = self.cc.ops.get("DOUT") if self.cc is not None else None
+                    dout_dur = o.nominal_us if o is not None else 0.0
                     plane_stagger = max(plane_stagger, n_mult * dout_dur)
 
                 # 멀티플레인 READ의 경우 plane 순서대로 DOUT을 분산 생성
-                if op.base == OpKind.READ and len(op.targets) > 1:
+                if op.base == self.kinds.READ and len(op.targets) > 1:
                     sorted_targets = sorted(op.targets, key=lambda a: a.plane)
                     for idx, t in enumerate(sorted_targets):
                         self._seq += 1
@@ -1613,12 +2702,13 @@ class ObligationManager:
                             require=spec["require"],
                             targets=[t],
                             source='obligation.dout',
-                            deadline_us=quantize(base_deadline + idx * plane_stagger),
+                            deadline_us=tb.norm(base_deadline + tb.dur(idx * plane_stagger)),
                             hard_slot=hard_slot,
                         )
-                        heapq.heappush(self.heap, _ObHeapItem(deadline_us=ob.deadline_us, seq=ob.id, ob=ob))
+                        self.push(ob)
                         self.stats["created"] += 1
-                        print(f"[{now_us:7.2f} us] OBLIG  created: READ -> {ob.require} by {ob.deadline_us:7.2f} us, target(d{t.die},p{t.plane})")
+                        if LOG_OBL.isEnabledFor(DEBUG):
+                            LOG_OBL.debug("[%7.2f us] OBLIG  created: READ -> %s by %7.2f us, target(d%s,p%s)", tb.us(now), ob.require, tb.us(ob.deadline_us), t.die, t.plane)
                 else:
                     # 단일 plane 또는 비-READ 발행자의 경우 기존 방식 유지
                     self._seq += 1
@@ -1630,51 +2720,55 @@ class ObligationManager:
                         deadline_us=base_deadline,
                         hard_slot=hard_slot,
                     )
-                    heapq.heappush(self.heap, _ObHeapItem(deadline_us=ob.deadline_us, seq=ob.id, ob=ob))
+                    self.push(ob)
                     self.stats["created"] += 1
-                    first = op.targets[0]
-                    print(f"[{now_us:7.2f} us] OBLIG  created: {op.base.name} -> {ob.require} by {ob.deadline_us:7.2f} us, target(d{first.die},p{first.plane})")
+                    if LOG_OBL.isEnabledFor(DEBUG):
+                        first = op.targets[0]
+                        LOG_OBL.debug("[%7.2f us] OBLIG  created: %s -> %s by %7.2f us, target(d%s,p%s)", tb.us(now), op.base.name, ob.require, tb.us(ob.deadline_us), first.die, first.plane)
 
-    def pop_urgent(self, now_us: float, die:int, plane:int, horizon_us: float, earliest_start: float) -> Optional[Obligation]:
+    def pop_urgent(self, now: float, die:int, plane:int, horizon: float, earliest_start: float) -> Optional[Obligation]:
+        """now/horizon/earliest_start: 격자 위 TimeBase 저장값."""
         if not self.heap:
             return None
         kept: List[_ObHeapItem] = []
         chosen: Optional[Obligation] = None
-        now_us=quantize(now_us); earliest_start=quantize(earliest_start)
+        horizon = max(horizon, 0)
         self.stats["pop_calls"] += 1
         if self.debug:
-            print(f"[OBLIGDBG] pop_urgent: heap_size={len(self.heap)} now={now_us:.2f} die={die} plane={plane} horizon={horizon_us:.2f} earliest_start={earliest_start:.2f}")
+            us = self.tb.us
+            LOG_OBL.debug("[OBLIGDBG] pop_urgent: heap_size=%s now=%.2f die=%s plane=%s horizon=%.2f earliest_start=%.2f", len(self.heap), us(now), die, plane, us(horizon), us(earliest_start))
         while self.heap and not chosen:
             item = heapq.heappop(self.heap)
             ob=item.ob
             self.stats["pop_examined"] += 1
             same_die=(ob.targets[0].die==die)
-            in_horizon=((ob.deadline_us - now_us) <= max(horizon_us, 0.0)) or ob.hard_slot
+            in_horizon=((ob.deadline_us - now) <= horizon) or ob.hard_slot
             feasible=(earliest_start <= ob.deadline_us)
             cond = (same_die and in_horizon and feasible)
             if cond:
                 if self.debug:
-                    print(f"[OBLIGDBG] pop_urgent: CHOOSE id={ob.id} req={ob.require} src={getattr(ob,'source',None)} deadline={ob.deadline_us:.2f} conds sd={same_die} hz={in_horizon} fs={feasible}")
+                    LOG_OBL.debug("[OBLIGDBG] pop_urgent: CHOOSE id=%s req=%s src=%s deadline=%.2f conds sd=%s hz=%s fs=%s", ob.id, ob.require, getattr(ob,'source',None), self.tb.us(ob.deadline_us), same_die, in_horizon, feasible)
                 self.stats["pop_chosen"] += 1
+                self._taken(ob)
                 chosen=ob; break
             kept.append(item)
             self.stats["pop_kept"] += 1
             if self.debug:
-                print(f"[OBLIGDBG] pop_urgent: SKIP  id={ob.id} req={ob.require} src={getattr(ob,'source',None)} deadline={ob.deadline_us:.2f} conds sd={same_die} hz={in_horizon} fs={feasible}")
+                LOG_OBL.debug("[OBLIGDBG] pop_urgent: SKIP  id=%s req=%s src=%s deadline=%.2f conds sd=%s hz=%s fs=%s", ob.id, ob.require, getattr(ob,'source',None), self.tb.us(ob.deadline_us), same_die, in_horizon, feasible)
         for it in kept: heapq.heappush(self.heap, it)
         self.stats["pop_returned"] += len(kept)
         if self.debug:
             succ = self.stats["pop_chosen"]
             calls = self.stats["pop_calls"]
             rate = (succ / calls) if calls else 0.0
-            print(f"[OBLIGDBG] pop_urgent: heap_size_after={len(self.heap)} chosen={(chosen.id if chosen else None)} kept={len(kept)} returned={len(kept)} pop_succ_rate={rate:.3f} (chosen={succ}/calls={calls})")
+            LOG_OBL.debug("[OBLIGDBG] pop_urgent: heap_size_after=%s chosen=%s kept=%s returned=%s pop_succ_rate=%.3f (chosen=%s/calls=%s)", len(self.heap), (chosen.id if chosen else None), len(kept), len(kept), rate, succ, calls)
         return chosen
 
     def mark_assigned(self, ob: Obligation):
         self.assigned[ob.id] = ob
         self.stats["assigned"] += 1
         if self.debug:
-            print(f"[OBLIGDBG] mark_assigned: id={ob.id} require={ob.require} deadline={ob.deadline_us:.2f} src={getattr(ob,'source',None)} heap_size={len(self.heap)} assigned={len(self.assigned)}")
+            LOG_OBL.debug("[OBLIGDBG] mark_assigned: id=%s require=%s deadline=%.2f src=%s heap_size=%s assigned=%s", ob.id, ob.require, self.tb.us(ob.deadline_us), getattr(ob,'source',None), len(self.heap), len(self.assigned))
 
     def mark_fulfilled(self, ob: Obligation, now: float):
         self.assigned.pop(ob.id, None)
@@ -1682,9 +2776,9 @@ class ObligationManager:
         if now <= ob.deadline_us:
             self.stats["fulfilled_in_time"] += 1
         else:
-            print(f"not_fulfilled: {ob.require} by {now:7.2f} us, deadline={ob.deadline_us:7.2f} us, target(d{ob.targets[0].die},p{ob.targets[0].plane})")
+            LOG_OBL.info("not_fulfilled: %s by %7.2f us, deadline=%7.2f us, target(d%s,p%s)", ob.require, self.tb.us(now), self.tb.us(ob.deadline_us), ob.targets[0].die, ob.targets[0].plane)
         if self.debug:
-            print(f"[OBLIGDBG] mark_fulfilled: id={ob.id} at={now:.2f} heap_size={len(self.heap)} assigned={len(self.assigned)}")
+            LOG_OBL.debug("[OBLIGDBG] mark_fulfilled: id=%s at=%.2f heap_size=%s assigned=%s", ob.id, self.tb.us(now), len(self.heap), len(self.assigned))
 
     def expire_due(self, now: float):
         if not self.heap:
@@ -1692,25 +2786,28 @@ class ObligationManager:
         earliest = self.heap[0].deadline_us
         if earliest <= now:
             # extend all deadlines uniformly to preserve relative order
-            delta = quantize(now - earliest + 0.2)
+            norm = self.tb.norm
+            delta = norm(now - earliest + self._extend_pad)
             for it in self.heap:
-                it.ob.deadline_us = quantize(it.ob.deadline_us + delta)
+                it.ob.deadline_us = norm(it.ob.deadline_us + delta)
             self._rebuild_heap()
+            self.extended = norm(self.extended + delta)
             self.stats["extended_cycles"] += 1
             self.stats["extended_total"] += len(self.heap)
             if self.debug:
-                print(f"[OBLIGDBG] extend_all: delta={delta:.2f} heap_size={len(self.heap)} new_earliest={self.heap[0].deadline_us:.2f}")
+                LOG_OBL.debug("[OBLIGDBG] extend_all: delta=%.2f heap_size=%s new_earliest=%.2f", self.tb.us(delta), len(self.heap), self.tb.us(self.heap[0].deadline_us))
                 # choose one representative ob to check ordering per kind
                 rep = self.heap[0].ob
 
 # --------------------------------------------------------------------------
 # Policy Engine (phase-conditional + admission gating + backoff + latch check)
 class PolicyEngine:
-    def _reject(self, now_us: float, hook: PhaseHook, stage: str, reason: str,
+    def _reject(self, now: float, hook: PhaseHook, stage: str, reason: str,
                 attempted: Optional[str], alias: Optional[str],
                 fanout: Optional[int], plane_set: Optional[List[int]],
                 earliest_start: Optional[float], admission_delta: Optional[float],
                 detail: str = ""):
+        self.last_reject = reason
         if self.rejlog is None:
             return
         ob_id = None
@@ -1722,46 +2819,49 @@ class PolicyEngine:
                     ob_id = getattr(ob, 'id', None)
             except Exception:
                 ob_id = None
+        us = self.tb.us
         self.rejlog.log_reject(RejectEvent(
-            now_us=now_us, die=hook.die, plane=hook.plane, hook=hook.label,
+            now_us=us(now), die=hook.die, plane=hook.plane, hook=hook.label,
             stage=stage, attempted=attempted, alias=alias, fanout=fanout,
             plane_set=(str(sorted(plane_set)) if plane_set is not None else None),
             reason=reason, detail=detail,
-            earliest_start=earliest_start, admission_delta=admission_delta,
+            earliest_start=(us(earliest_start) if earliest_start is not None else None), admission_delta=admission_delta,
             ob_id=ob_id
         ))
 
     def __init__(self, cfg, addr: AddressManager, obl: ObligationManager, excl: ExclusionManager,
                  rejlog: Optional[RejectionLogger] = None,
                  latch: Optional[LatchManager] = None,
-                 state_timeline: Optional["StateTimeline"] = None):
+                 state_timeline: Optional["StateTimeline"] = None,
+                 tables: Optional[SimTables] = None, rng=random, cc: Optional[CompiledCfg] = None):
         self.cfg=cfg; self.addr=addr; self.obl=obl; self.excl=excl
+        self.tables = tables or _DEFAULT_TABLES; self.kinds = self.tables.opkind; self.rng = rng
+        self.cc = cc or compile_cfg(cfg, self.tables)
+        self.tb = TimeBase.from_cfg(cfg)   # now/earliest_start/start_hint: 저장값 (reject 로그에서 µs 로 변환)
         self.stats={"alias_degrade":0}
+        self.last_reject: Optional[str] = None   # 마지막 propose 의 마지막 reject reason (wakeup 모드 재시도 시각 판단)
         self.rejlog = rejlog or RejectionLogger()
-        self.latch = latch or LatchManager()
+        self.latch = latch or LatchManager(self.tables)
         self.state_timeline = state_timeline
+        self.prof: Optional[StageProfiler] = None   # Scheduler 가 profile.enabled 일 때 공유 인스턴스를 설정
         # compile exclusion rules for data-driven predicates
         self._excl_rules = self._compile_exclusion_rules()
 
-    def _fanout_from_alias(self, op_base: str, alias_constraint: Optional[Tuple[str,int]], hook_label: str)->Tuple[int,bool]:
-        fanout, interleave = get_phase_selection_override(self.cfg, hook_label, op_base)
-        if alias_constraint:
-            mode,val=alias_constraint
-            if mode=="eq": fanout=val
-            elif mode=="ge": fanout=max(fanout,val)
+    def _fanout_from_alias(self, o: OpSpecC, hook_label: str)->Tuple[int,bool]:
+        """selection override 의 fanout 을 op 의 arity 범위에 맞춤 (eq: 고정, ge: 최소 arity_min)."""
+        fanout, interleave = get_phase_selection_override(self.cfg, hook_label, o.base.name, self.tables)
+        fanout = o.arity_min if o.arity_max is not None else max(fanout, o.arity_min)
         return max(1,fanout), interleave
 
     def _exclusion_ok(self, op: Operation, start_hint: float) -> bool:
-        dur = get_op_duration(op)
-        end = quantize(start_hint + dur)
+        end = self.tb.norm(start_hint + get_op_duration_k(op))
         return self.excl.allowed(op, start_hint, end)
 
-    def _admission_ok(self, now_us: float, hook_label: str, op_base: str, start_hint: float, deadline: Optional[float]=None) -> bool:
-        adm = self.cfg.get("admission", {})
-        delta = get_admission_delta(self.cfg, hook_label, op_base)
+    def _admission_ok(self, now: float, hook_label: str, op_base: str, start_hint: float, deadline: Optional[float]=None) -> bool:
+        delta = self.tb.dur(get_admission_delta(self.cfg, hook_label, op_base))
         if deadline is not None:  # for obligations if bypass disabled
-            delta = min(delta, max(0.0, deadline - now_us))
-        return start_hint <= now_us + delta
+            delta = min(delta, max(0, deadline - now))
+        return start_hint <= now + delta
 
     # --- exclusion rules compilation & predicates (data-driven) ---
     def _compile_exclusion_rules(self):
@@ -1789,13 +2889,14 @@ class PolicyEngine:
 
     def _resolve_op_name(self, op_name: str) -> str:
         # return self.cfg.get("op_specs", {}).get(op, {}).get("base", op)
-        if op_name in OP_ALIAS: return OP_ALIAS[op_name]["base"], OP_ALIAS[op_name]["fanout"]
+        op_alias = self.tables.op_alias
+        if op_name in op_alias: return op_alias[op_name]["base"], op_alias[op_name]["fanout"]
         return op_name, None
 
     def _alias_label_for(self, base: str, arity: int) -> Optional[str]:
         # derive alias label from base and arity using helper candidates
         try:
-            cands = _op_alias_candidates(base)
+            cands = _op_alias_candidates(base, self.tables)
             if not cands:
                 return None
             # pick MUL_* when arity>1 else SIN_*
@@ -1812,7 +2913,7 @@ class PolicyEngine:
         if getattr(seg, "state", None) == "END":
             return False
         base_name = op.base.name
-        alias_label = self._alias_label_for(base_name, int(op.meta.get("arity", 1)) if hasattr(op, "meta") else 1)
+        alias_label = self._alias_label_for(base_name, int(op.arity))
         for wop, states, tokens, _scope in self._excl_rules:
             if wop and str(seg.op_base).upper() != wop:
                 continue
@@ -1828,14 +2929,8 @@ class PolicyEngine:
         # END state has no bus usage
         if getattr(seg, "state", None) == "END":
             return False
-        try:
-            spec = self.cfg.get("op_specs", {}).get(str(seg.op_base), {})
-            for st in spec.get("states", []):
-                if str(st.get("name")) == str(seg.state):
-                    return bool(st.get("bus", False))
-        except Exception:
-            return False
-        return False
+        o = self.cc.ops.get(str(seg.op_base))
+        return o is not None and str(seg.state) in o.bus_states
 
     # --- scope-aware overlaps helpers ---
     def _normalize_scope(self, s: Optional[str]) -> str:
@@ -1881,23 +2976,27 @@ class PolicyEngine:
                 return True
         return False
 
-    def _validate_candidate(self, now_us: float, hook: PhaseHook, stage: str, op: Operation,
+    def _validate_candidate(self, now: float, hook: PhaseHook, stage: str, op: Operation,
                             plane_set: List[int], start_hint: float,
                             deadline: Optional[float] = None, ob: Optional["Obligation"] = None) -> bool:
-        ignore = set(self.cfg.get("op_specs", {}).get(op.name, {}).get("ignore", []))
+        ignore = self.cc.ignore_of(op.name)
         attempted = op.base.name
         alias_used = op.name if op.name != attempted else None
+        prof = self.prof
         if deadline is not None and start_hint > deadline:
-            self._reject(now_us, hook, stage, "deadline", attempted, alias_used,
+            self._reject(now, hook, stage, "deadline", attempted, alias_used,
                          len(plane_set), plane_set, start_hint, None, "deadline_miss")
             if ob:
                 self.obl.requeue(ob)
             return False
-        bypass = (stage == "obligation" and self.cfg.get("admission", {}).get("obligation_bypass", True))
+        bypass = (stage == "obligation" and self.cc.obligation_bypass)
         if "admission" not in ignore and not bypass:
+            if prof: tp=_ns()
             adm_delta = get_admission_delta(self.cfg, hook.label, attempted)
-            if not self._admission_ok(now_us, hook.label, attempted, start_hint, deadline):
-                self._reject(now_us, hook, stage, "admission", attempted, alias_used,
+            ok = self._admission_ok(now, hook.label, attempted, start_hint, deadline)
+            if prof: prof.add("gate.admission", tp)
+            if not ok:
+                self._reject(now, hook, stage, "admission", attempted, alias_used,
                              len(plane_set), plane_set, start_hint, adm_delta, "near_future_gate")
                 if ob:
                     self.obl.requeue(ob)
@@ -1905,30 +3004,42 @@ class PolicyEngine:
         else:
             adm_delta = None
         if "precheck" not in ignore:
-            scope = Scope[op.meta.get("scope", "PLANE_SET")]
-            if not self.addr.precheck_planescope(op.base, op.targets, start_hint, scope):
-                self._reject(now_us, hook, stage, "precheck", attempted, alias_used,
+            scope = Scope[op.scope or "PLANE_SET"]
+            if prof: tp=_ns()
+            ok = self.addr.precheck_planescope(op.base, op.targets, start_hint, scope)
+            if prof: prof.add("gate.precheck", tp)
+            if not ok:
+                self._reject(now, hook, stage, "precheck", attempted, alias_used,
                              len(plane_set), plane_set, start_hint, adm_delta, "addr/precheck")
                 if ob:
                     self.obl.requeue(ob)
                 return False
         if "bus_precheck" not in ignore:
-            if not self.addr.bus_precheck(op, start_hint, self.addr.bus_segments_for_op(op)):
-                self._reject(now_us, hook, stage, "bus", attempted, alias_used,
+            if prof: tp=_ns()
+            ok = self.addr.bus_precheck(op, start_hint, self.addr.bus_segments_for_op(op))
+            if prof: prof.add("gate.bus", tp)
+            if not ok:
+                self._reject(now, hook, stage, "bus", attempted, alias_used,
                              len(plane_set), plane_set, start_hint, adm_delta, "bus_conflict")
                 if ob:
                     self.obl.requeue(ob)
                 return False
         if "latch" not in ignore:
-            if not self.latch.allowed(op, start_hint):
-                self._reject(now_us, hook, stage, "latch", attempted, alias_used,
+            if prof: tp=_ns()
+            ok = self.latch.allowed(op, start_hint)
+            if prof: prof.add("gate.latch", tp)
+            if not ok:
+                self._reject(now, hook, stage, "latch", attempted, alias_used,
                              len(plane_set), plane_set, start_hint, adm_delta, "read->dout plane latched")
                 if ob:
                     self.obl.requeue(ob)
                 return False
         if "excl" not in ignore:
-            if not self._exclusion_ok(op, start_hint):
-                self._reject(now_us, hook, stage, "excl", attempted, alias_used,
+            if prof: tp=_ns()
+            ok = self._exclusion_ok(op, start_hint)
+            if prof: prof.add("gate.excl", tp)
+            if not ok:
+                self._reject(now, hook, stage, "excl", attempted, alias_used,
                              len(plane_set), plane_set, start_hint, adm_delta, "exclusion_window")
                 if ob:
                     self.obl.requeue(ob)
@@ -1936,80 +3047,84 @@ class PolicyEngine:
         self.rejlog.log_accept(stage)
         return True
 
-    def propose(self, now_us: float, hook: PhaseHook, g: Dict[str,str], l: Dict[str,str], earliest_start: float) -> Optional[Operation]:
+    def propose(self, now: float, hook: PhaseHook, g: Dict[str,str], l: Dict[str,str], earliest_start: float) -> Optional[Operation]:
         die, hook_plane = hook.die, hook.plane
+        prof = self.prof
+        self.last_reject = None
 
         # 0) obligations first
         stage = "obligation"
         self.rejlog.log_attempt(stage)
-        hookscreen_cfg = self.cfg.get("policy", {}).get("hookscreen", {})
-        horizon = float(hookscreen_cfg.get("horizon_us", 10.0))
-        pop_earliest = self.addr.candidate_start_for_scope(now_us, die, Scope.DIE_WIDE, list(range(self.addr.planes)))
-        ob=self.obl.pop_urgent(now_us, die, hook_plane, horizon_us=horizon, earliest_start=pop_earliest)
+        cc = self.cc
+        horizon = cc.hook_horizon_k
+        pop_earliest = self.addr.candidate_start_for_scope(now, die, Scope.DIE_WIDE, list(range(self.addr.planes)))
+        if prof: tp=_ns()
+        ob=self.obl.pop_urgent(now, die, hook_plane, horizon=horizon, earliest_start=pop_earliest)
+        if prof: prof.add("obl.pop_urgent", tp)
         if ob:
             cfg_op=self.cfg["op_specs"][ob.require]
-            op=build_operation(ob.require, OpKind[_op_base_from_alias(ob.require)], cfg_op, ob.targets)
-            op.meta["scope"]=cfg_op["scope"]; op.meta["plane_list"]=sorted({a.plane for a in ob.targets}); op.meta["arity"]=len(op.meta["plane_list"])
-            op.meta["obligation"]=ob
-            if getattr(ob, "source", None):
-                op.meta["source"] = ob.source
-            if getattr(ob, "skip_dout_creation", False):
-                op.meta["skip_dout_creation"] = True
-            plane_set=op.meta["plane_list"]
-            scope=Scope[op.meta["scope"]]
-            affects = self.cfg.get("state_timeline", {}).get("affects", {})
-            if op.base.name in affects:
-                start_hint=quantize(earliest_start)
+            op=build_operation(ob.require, self.kinds[_op_base_from_alias(ob.require, self.tables)], cfg_op, ob.targets, self.rng, self.tb)
+            op.scope=cfg_op["scope"]; op.plane_list=sorted({a.plane for a in ob.targets}); op.arity=len(op.plane_list)
+            op.obligation=ob
+            if ob.source:
+                op.source = ob.source
+            if ob.skip_dout_creation:
+                op.skip_dout_creation = True
+            plane_set=op.plane_list
+            scope=Scope[op.scope]
+            if op.base.name in cc.timeline_affects:
+                start_hint=earliest_start
             else:
-                start_hint=self.addr.candidate_start_for_scope(now_us, die, scope, plane_set)
+                start_hint=self.addr.candidate_start_for_scope(now, die, scope, plane_set)
             self.current_obligation = ob
-            if self._validate_candidate(now_us, hook, stage, op, plane_set, start_hint, deadline=ob.deadline_us, ob=ob):
-                op.meta["phase_key_used"]="(obligation)"
+            if self._validate_candidate(now, hook, stage, op, plane_set, start_hint, deadline=ob.deadline_us, ob=ob):
+                op.phase_key_used="(obligation)"
                 return op, start_hint
 
         # 1) phase-conditional (optional; can be disabled via CFG)
         stage = "phase_conditional"
         self.rejlog.log_attempt(stage)
         # disable knob
-        if not self.cfg.get("policy", {}).get("enable_phase_conditional", True):
-            self._reject(now_us, hook, stage, "disabled", None, None, None, None, earliest_start, None, "disabled_by_cfg")
+        if not cc.enable_phase_conditional:
+            self._reject(now, hook, stage, "disabled", None, None, None, None, earliest_start, None, "disabled_by_cfg")
             return None, None
         # guard: while bootstrap obligations exist anywhere, skip policy proposals
         if self.obl.has_pending(source="bootstrap"):
-            self._reject(now_us, hook, stage, "guard_bootstrap_pending", None, None, None, None, earliest_start, None, "bootstrap_pending_skip")
+            self._reject(now, hook, stage, "guard_bootstrap_pending", None, None, None, None, earliest_start, None, "bootstrap_pending_skip")
             return None, None
 
         # # Step 1: admission screen (target-level) - available_at <= now + default_delta
         # adm_delta = float(self.cfg.get("admission", {}).get("default_delta_us", 0.0))
-        # if self.addr.available_at(die, hook_plane) > now_us + adm_delta:
-        #     self._reject(now_us, hook, stage, "admission_target", None, None, None, None, earliest_start, adm_delta, "target_busy")
+        # if self.addr.available_at(die, hook_plane) > now + adm_delta:
+        #     self._reject(now, hook, stage, "admission_target", None, None, None, None, earliest_start, adm_delta, "target_busy")
         #     return None
-        allow=set(list(OP_ALIAS.keys()))
+        allow=set(list(self.tables.op_alias.keys()))
         # derive state key from state_timeline at reference time (earliest_start)
         st_key = None
+        if prof: tp=_ns()
         if self.state_timeline is not None:
             st_key = self.state_timeline.state_at(hook.die, hook.plane, earliest_start)  # e.g., "READ.CORE_BUSY" or "READ.END"
         used_label = st_key if st_key else hook.label
         dist, used_key = get_phase_dist(self.cfg, used_label)
+        if prof: prof.add("phase.get_phase_dist", tp)
         if not dist:
-            self._reject(now_us, hook, stage, "none_available", None, None, None, None, earliest_start, None, "no_dist_for_hook")
+            self._reject(now, hook, stage, "none_available", None, None, None, None, earliest_start, None, "no_dist_for_hook")
         else:
             # Step 2-3: exclusion/bus screens at operation-level using state_timeline
             # Step 4: phase_conditional screen → allow = positive weight items
             cand = {op_name: w for op_name, w in dist.items() if op_name in allow and float(w) > 0.0}
             if not cand:
-                self._reject(now_us, hook, stage, "none_available", None, None, None, None, earliest_start, None, "all_zero_weight")
+                self._reject(now, hook, stage, "none_available", None, None, None, None, earliest_start, None, "all_zero_weight")
                 return None, None
             # DIE_WIDE op screen with state_timeline (operation screen)
+            if prof: tp=_ns()
             filtered = {}
             for op_name, w in cand.items():
                 base, _cons = self._resolve_op_name(op_name)
                 # exclude/bus op-level quick screen on hook plane interval
-                try:
-                    dur_nom = get_nominal_duration(self.cfg, op_name)
-                except Exception:
-                    dur_nom = 0.0
-                t0 = earliest_start; t1 = quantize(earliest_start + dur_nom)
+                o = cc.ops.get(op_name)
+                dur_nom = o.nominal_k if o is not None else 0
+                t0 = earliest_start; t1 = self.tb.norm(earliest_start + dur_nom)
                 # exclusion op-level filter (scope-aware)
                 if self._excl_blocks_candidate(die, [hook_plane], t0, t1, base, op_name):
                     continue
@@ -2018,21 +3133,24 @@ class PolicyEngine:
                     if self.state_timeline.overlaps(die, hook_plane, t0, t1, pred=lambda seg: self._bus_pred(seg)):
                         continue
                 # DIE_WIDE scope screen: die-wide busy check (coarse)
-                scope_name = str(self.cfg.get("op_specs", {}).get(op_name, {}).get("scope", "PLANE_SET"))
-                if scope_name == "DIE_WIDE" and self.state_timeline is not None and dur_nom > 0.0:
+                if o is not None and o.scope is Scope.DIE_WIDE and self.state_timeline is not None and dur_nom > 0.0:
                     if self._overlaps_scope(die, [hook_plane], t0, t1, pred=lambda seg: seg.state != "END", scope="DIE"):
                         continue
                 filtered[op_name] = w
+            if prof: prof.add("phase.candidate_filter", tp)
             if not filtered:
-                self._reject(now_us, hook, stage, "none_available", None, None, None, None, earliest_start, None, "allow_filtered_empty")
+                self._reject(now, hook, stage, "none_available", None, None, None, None, earliest_start, None, "allow_filtered_empty")
                 return None, None
-            pick=roulette_pick(filtered, set(filtered.keys()))
+            if prof: tp=_ns()
+            pick=roulette_pick(filtered, set(filtered.keys()), self.rng)
+            if prof: prof.add("phase.roulette_pick", tp)
             if not pick:
-                self._reject(now_us, hook, stage, "none_available", None, None, None, None, earliest_start, None, "roulette_zero_weight")
+                self._reject(now, hook, stage, "none_available", None, None, None, None, earliest_start, None, "roulette_zero_weight")
             else:
-                base, alias_const = self._resolve_op_name(pick)
-                kind=OpKind[base]
-                fanout, interleave=self._fanout_from_alias(base, alias_const, hook.label)
+                o = cc.ops[pick]
+                kind=o.base; base=kind.name
+                fanout, interleave=self._fanout_from_alias(o, hook.label)
+                if prof: tp=_ns()
                 plan=self.addr.plan_multiplane(kind, die, hook_plane, fanout, interleave)
                 alias_used=pick
                 if not plan and fanout>1:
@@ -2041,32 +3159,32 @@ class PolicyEngine:
                     if plan: fanout=1
                 # start_plane round-robin scan when easing enabled and no plan
                 if not plan:
-                    scan = max(1, int(hookscreen_cfg.get("startplane_scan", 1)))
+                    scan = cc.startplane_scan
                     tried = 0
                     p = (hook_plane + 1) % self.addr.planes
                     while tried < self.addr.planes and tried < scan and not plan:
                         plan=self.addr.plan_multiplane(kind, die, p, fanout, interleave)
                         tried += 1
                         p = (p + 1) % self.addr.planes
+                if prof: prof.add("plan_multiplane", tp)
                 if not plan:
-                    self._reject(now_us, hook, stage, "plan_none", base, alias_used, fanout, None, earliest_start, None, "no_targets")
+                    self._reject(now, hook, stage, "plan_none", base, alias_used, fanout, None, earliest_start, None, "no_targets")
                 else:
                     targets, plane_set, scope=plan
                     cfg_op=self.cfg["op_specs"][pick]
-                    op=build_operation(alias_used, kind, cfg_op, targets)
-                    op.meta["scope"]=cfg_op["scope"]; op.meta["plane_list"]=plane_set; op.meta["arity"]=len(plane_set); op.meta["alias_used"]=alias_used
+                    op=build_operation(alias_used, kind, cfg_op, targets, self.rng, self.tb)
+                    op.scope=cfg_op["scope"]; op.plane_list=plane_set; op.arity=len(plane_set); op.alias_used=alias_used
                     try:
-                        op.meta["phase_key_used"] = str(used_key if used_key else used_label)
-                        op.meta["state_key_at_schedule"] = str(st_key) if st_key else None
+                        op.phase_key_used = str(used_key if used_key else used_label)
+                        op.state_key_at_schedule = str(st_key) if st_key else None
                     except Exception:
-                        op.meta["phase_key_used"] = str(used_label)
-                    affects = self.cfg.get("state_timeline", {}).get("affects", {})
-                    if op.base.name in affects:
-                        start_hint=quantize(earliest_start)
+                        op.phase_key_used = str(used_label)
+                    if op.base.name in cc.timeline_affects:
+                        start_hint=earliest_start
                     else:
-                        start_hint=self.addr.candidate_start_for_scope(now_us, die, scope, plane_set)
-                    if self._validate_candidate(now_us, hook, stage, op, plane_set, start_hint):
-                        op.meta["source"]="policy.phase_conditional"
+                        start_hint=self.addr.candidate_start_for_scope(now, die, scope, plane_set)
+                    if self._validate_candidate(now, hook, stage, op, plane_set, start_hint):
+                        op.source="policy.phase_conditional"
                         return op, start_hint
 
         # backoff 단계 제거됨 (충돌 정합성 해소 계획에 따라 비활성화)
@@ -2074,18 +3192,18 @@ class PolicyEngine:
 
 # --------------------------------------------------------------------------
 # Selection overrides
-def get_phase_selection_override(cfg: Dict[str,Any], hook_label: str, kind_name: str):
+def get_phase_selection_override(cfg: Dict[str,Any], hook_label: str, kind_name: str, tables: Optional[SimTables] = None):
     op, state, _ = parse_hook_key(hook_label)
     po=cfg.get("selection",{}).get("phase_overrides",{})
     keys=[]
     # Try alias/base expanded keys for robustness
     if op and state:
         keys.append(f"{op}.{state}")
-        for _ali in _op_alias_candidates(op):
+        for _ali in _op_alias_candidates(op, tables):
             k=f"{_ali}.{state}"
             if k not in keys:
                 keys.append(k)
-        _base=_op_base_from_alias(op)
+        _base=_op_base_from_alias(op, tables)
         if _base:
             k=f"{_base}.{state}"
             if k not in keys:
@@ -2133,11 +3251,13 @@ def populate_bootstrap_obligations(cfg: Dict[str,Any], addr: AddressManager, obl
     # iterate all block stripes across planes so that every block is covered
     stripes = (addr.blocks + planes - 1) // planes
     # next stripe starts after the last deadline of previous stripe (strictly increasing)
-    stripe_base = quantize(addr.available_at(die, 0) + gap)
+    # 계산은 µs, Obligation.deadline_us 에는 TimeBase 저장값(tb.key)으로 기록
+    tb = addr.tb
+    stripe_base = quantize(tb.us(addr.available_at(die, 0)) + gap)
     stripe_last_deadline = stripe_base
     # init creation logger
     if not hasattr(obl, "creation_logger"):
-        obl.creation_logger = CreationLogger()
+        obl.creation_logger = CreationLogger(keep_rows=bool(cfg.get("export", {}).get("buffer_history", True)), tb=tb)
     for die in range(dies):
         # ERASE
         for s in range(stripes):
@@ -2157,12 +3277,12 @@ def populate_bootstrap_obligations(cfg: Dict[str,Any], addr: AddressManager, obl
                     seq_id += 1
                     # ob_erase = Obligation(id=seq_id, require=OpKind.ERASE, targets=list(plane_targets),
                     ob_erase = Obligation(id=seq_id, require="MUL_ERASE", targets=list(plane_targets),
-                                        deadline_us=quantize(erase_deadline), hard_slot=hard_slot, source="bootstrap", skip_dout_creation=False)
-                    heapq.heappush(obl.heap, _ObHeapItem(deadline_us=ob_erase.deadline_us, seq=ob_erase.id, ob=ob_erase))
+                                        deadline_us=tb.key(erase_deadline), hard_slot=hard_slot, source="bootstrap", skip_dout_creation=False)
+                    obl.push(ob_erase)
                     obl.stats["created"] += 1
                     obl.creation_logger.log(ob_erase, context="bootstrap", stripe=s, page_index=p)
                     # debug logging removed
-                    stripe_last_deadline = ob_erase.deadline_us
+                    stripe_last_deadline = tb.us(ob_erase.deadline_us)
 
         # PROGRAM
         for s in range(stripes):
@@ -2181,12 +3301,12 @@ def populate_bootstrap_obligations(cfg: Dict[str,Any], addr: AddressManager, obl
                 seq_id += 1
                 # ob_pgm = Obligation(id=seq_id, require=OpKind.PROGRAM, targets=plane_targets,
                 ob_pgm = Obligation(id=seq_id, require="MUL_PROGRAM", targets=plane_targets,
-                                    deadline_us=prog_deadline, hard_slot=hard_slot, source="bootstrap", skip_dout_creation=False)
-                heapq.heappush(obl.heap, _ObHeapItem(deadline_us=ob_pgm.deadline_us, seq=ob_pgm.id, ob=ob_pgm))
+                                    deadline_us=tb.key(prog_deadline), hard_slot=hard_slot, source="bootstrap", skip_dout_creation=False)
+                obl.push(ob_pgm)
                 obl.stats["created"] += 1
                 obl.creation_logger.log(ob_pgm, context="bootstrap", stripe=s, page_index=p)
                 # debug logging removed
-                stripe_last_deadline = ob_pgm.deadline_us
+                stripe_last_deadline = tb.us(ob_pgm.deadline_us)
 
         # READ
         for s in range(stripes):
@@ -2204,114 +3324,210 @@ def populate_bootstrap_obligations(cfg: Dict[str,Any], addr: AddressManager, obl
                 read_deadline = quantize(read_base + read_nom)
                 seq_id += 1
                 ob_read = Obligation(id=seq_id, require="MUL_READ", targets=plane_targets,
-                                    deadline_us=read_deadline, hard_slot=hard_slot, source="bootstrap", skip_dout_creation=True)
-                heapq.heappush(obl.heap, _ObHeapItem(deadline_us=ob_read.deadline_us, seq=ob_read.id, ob=ob_read))
+                                    deadline_us=tb.key(read_deadline), hard_slot=hard_slot, source="bootstrap", skip_dout_creation=True)
+                obl.push(ob_read)
                 obl.stats["created"] += 1
                 obl.creation_logger.log(ob_read, context="bootstrap", stripe=s, page_index=p)
                 # debug logging removed
-                stripe_last_deadline = ob_read.deadline_us + gap
+                stripe_last_deadline = tb.us(ob_read.deadline_us) + gap
                 # Pair (READ->DOUT) per page: DOUT after READ(p)
                 for idx, t in enumerate(sorted(plane_targets, key=lambda a: a.plane)):
                     dout_base = stripe_last_deadline + gap
                     dout_deadline = quantize(dout_base + stagger_dout)
                     seq_id += 1
                     ob_dout = Obligation(id=seq_id, require="DOUT", targets=[Address(t.die, t.plane, t.block, p)],
-                                        deadline_us=quantize(dout_deadline), hard_slot=hard_slot, source="bootstrap", skip_dout_creation=False)
-                    heapq.heappush(obl.heap, _ObHeapItem(deadline_us=ob_dout.deadline_us, seq=ob_dout.id, ob=ob_dout))
+                                        deadline_us=tb.key(dout_deadline), hard_slot=hard_slot, source="bootstrap", skip_dout_creation=False)
+                    obl.push(ob_dout)
                     obl.stats["created"] += 1
                     obl.creation_logger.log(ob_dout, context="bootstrap", stripe=s, page_index=p)
-                    stripe_last_deadline = ob_dout.deadline_us
+                    stripe_last_deadline = tb.us(ob_dout.deadline_us)
     obl._seq = seq_id
 
+# --------------------------------------------------------------------------
+# Event queue (integer event codes + heap)
+EV_QUEUE_REFILL = 0
+EV_PHASE_HOOK   = 1
+EV_OP_START     = 2
+EV_OP_END       = 3
+EV_WAKEUP       = 4
+EV_NAMES = ("QUEUE_REFILL", "PHASE_HOOK", "OP_START", "OP_END", "WAKEUP")
+
+class HeapEventQueue:
+    """단일 binary heap. 항목은 (time, seq, code, payload); seq로 동시각 FIFO 보장."""
+    __slots__ = ("_heap", "_seq")
+
+    def __init__(self):
+        self._heap: List[Tuple[Any,int,int,Any]] = []
+        self._seq = 0
+
+    def push(self, t, code: int, payload: Any):
+        heapq.heappush(self._heap, (t, self._seq, code, payload)); self._seq += 1
+
+    def pop(self) -> Tuple[Any,int,int,Any]:
+        return heapq.heappop(self._heap)
+
+    def peek_time(self):
+        return self._heap[0][0] if self._heap else None
+
+    def items(self) -> List[Tuple[Any,int,int,Any]]:
+        return list(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+# (stat_events & mask)==0 인 이벤트마다 지난 plane/bus 예약과 exclusion 창 정리 (export.buffer_history=False 면 state segment 도)
+_PRUNE_EVERY_MASK = 255
+
 class Scheduler:
     def __init__(self, cfg, addr:AddressManager, spe:PolicyEngine, obl:ObligationManager,
                  excl:ExclusionManager, logger: Optional[TimelineLogger]=None,
-                 latch: Optional[LatchManager]=None, state_timeline: Optional[StateTimeline]=None):
+                 latch: Optional[LatchManager]=None, state_timeline: Optional[StateTimeline]=None,
+                 tables: Optional[SimTables]=None, rng=random, cc: Optional[CompiledCfg]=None,
+                 dies: Optional[List[int]]=None):
         self.cfg=cfg; self.addr=addr; self.SPE=spe; self.obl=obl; self.excl=excl
-        self.now=0.0; self.ev=[]; self._seq=0
-        self.stat_propose_calls=0; self.stat_scheduled=0
+        # 훅을 만드는 die (parallel partition 은 담당 die 만, 기본은 전체)
+        self.dies=tuple(dies) if dies is not None else tuple(range(addr.dies))
+        self.tables=tables or _DEFAULT_TABLES; self.kinds=self.tables.opkind; self.rng=rng
+        self.cc=cc or compile_cfg(cfg, self.tables)
+        # now/event key/op 시각은 TimeBase 저장값 (timeline row/로그/stats 로 나갈 때만 µs)
+        self.tb=TimeBase.from_cfg(cfg)
+        self.now=self.tb.key(0.0); self.ev=HeapEventQueue()
+        # event code -> handler (index = EV_* code)
+        self._handlers=(self._on_queue_refill, self._on_phase_hook, self._on_op_start, self._on_op_end, self._on_wakeup)
+        self.stat_propose_calls=0; self.stat_scheduled=0; self.stat_events=0
         self._propose_time_total=0.0
+        # stage 프로파일 (profile.enabled): PolicyEngine 과 공유
+        self.prof = StageProfiler() if bool(cfg.get("profile", {}).get("enabled", False)) else None
+        spe.prof = self.prof
+        self.telemetry = TelemetryWriter(cfg) if bool(cfg.get("telemetry", {}).get("enabled", False)) else None
         self.logger = logger or TimelineLogger()
-        self.latch = latch or LatchManager()
+        self.buffer_timeline = bool(cfg.get("export", {}).get("buffer_timeline", True))
+        self.buffer_history = bool(cfg.get("export", {}).get("buffer_history", True))
+        self._subscribers: List[Any] = []   # op record 콜백 (subscribe/iter_ops)
+        self.latch = latch or LatchManager(self.tables)
         # state timeline
         self.state_timeline = state_timeline
-        self._push(1, "QUEUE_REFILL", None)
-        for plane in range(self.addr.planes):
-            self._push(2, "PHASE_HOOK", PhaseHook(2, "BOOT.START", 0, plane))
+        # wakeup mode: (die, plane) -> 대기 중인 EV_WAKEUP key (가장 이른 것만 유효, 나머지는 stale),
+        # (die, plane) -> 연속 빈손 propose 수 (fallback backoff 지수)
+        refill_mode = str(cfg.get("policy", {}).get("refill_mode", "periodic")).lower()
+        if refill_mode not in ("periodic", "wakeup"):
+            raise ValueError(f"unknown policy.refill_mode: {refill_mode} (use periodic|wakeup)")
+        self.wakeup_mode = (refill_mode == "wakeup")
+        self.stat_wakeups = {"armed":0, "fired":0, "stale":0, "idle":0}
+        self._wake_at: Dict[Tuple[int,int], float] = {}
+        self._wake_fails: Dict[Tuple[int,int], int] = {}
+        # hook coalescing: (die,plane,bucket,label) 슬롯, die 별 대기 훅 수, 등록 slot 은 hook.reg
+        hc = cfg.get("policy", {}).get("hook_coalesce", {})
+        self.hook_coalesce = bool(hc.get("enabled", False))
+        bucket_us = float(hc.get("bucket_us", 0.0))
+        self._hook_bucket = max(self.tb.dur(bucket_us), self.tb.res) if bucket_us > 0.0 else None
+        self._hook_budget = int(hc.get("per_die_budget", 0))
+        self._hook_drop_idle = self.hook_coalesce and bool(hc.get("drop_idle", True))
+        self._drop_idle = self.wakeup_mode or self._hook_drop_idle
+        self._hook_register = self.hook_coalesce and (self._hook_bucket is not None or self._hook_budget > 0)
+        self._hook_slots: Dict[Tuple[int,int,int,str], PhaseHook] = {}
+        self._hook_die_n: Dict[int, int] = {}
+        self.stat_hooks = {"pushed":0, "coalesced":0, "dropped_idle":0, "dropped_budget":0}
+        if self.wakeup_mode:
+            # 주기 sweep 대신 첫 refill 시각에 die×plane 마다 한 번 깨우고, 이후는 _wake_after_propose 가 예약
+            t0=self.tb.key(1.0)
+            for die in self.dies:
+                for plane in range(self.addr.planes):
+                    self._arm_wakeup(die, plane, t0)
+        else:
+            self._push(self.tb.key(1.0), EV_QUEUE_REFILL, None)
+        t_boot=self.tb.key(2.0)
+        if 0 in self.dies:
+            for plane in range(self.addr.planes):
+                self._push(t_boot, EV_PHASE_HOOK, PhaseHook(t_boot, "BOOT.START", 0, plane))
         # optional global nudge: 일원화 → QUEUE_REFILL에서 처리
         # bootstrap watchdog
         self._bootstrap_started=False
         self._bootstrap_start_time=None
         self._bootstrap_end_time=None
-        self._last_now=0.0
+        self._last_now=self.now
 
-    def _push(self, t: float, typ: str, payload: Any):
-        heapq.heappush(self.ev, (quantize(t), self._seq, typ, payload)); self._seq+=1
+    def _push(self, t: float, code: int, payload: Any):
+        # t: 격자 위 TimeBase 저장값 (합산 결과는 호출부에서 tb.norm)
+        self.ev.push(t, code, payload)
 
     def _start_time_for_op(self, op: Operation) -> float:
         die=op.targets[0].die
-        scope=Scope[op.meta.get("scope","PLANE_SET")]
+        scope=Scope[op.scope or "PLANE_SET"]
         plane_set=[a.plane for a in op.targets]
         t_planes=self.addr.earliest_start_for_scope(die, scope, plane_set)
-        return quantize(max(self.now, t_planes))
+        return max(self.now, t_planes)
 
     def _label_for_read(self, op: Operation)->str:
-        arity = op.meta.get("arity", 1)
-        if op.base == OpKind.READ:
+        arity = op.arity
+        if op.base == self.kinds.READ:
             return "MUL_READ" if arity>1 else "SIN_READ"
-        if op.base == OpKind.PROGRAM:
+        if op.base == self.kinds.PROGRAM:
             return "MUL_PROGRAM" if arity>1 else "SIN_PROGRAM"
-        if op.base == OpKind.ERASE:
+        if op.base == self.kinds.ERASE:
             return "MUL_ERASE" if arity>1 else "SIN_ERASE"
         return op.base.name
 
     def _schedule_operation(self, op: Operation, start_hint: float):
-        # start=self._start_time_for_op(op); dur=get_op_duration(op); end=quantize(start+dur)
-        start=quantize(start_hint); dur=get_op_duration(op); end=quantize(start+dur)
+        prof=self.prof
+        if prof: t_sched=_ns()
+        self._schedule_operation_impl(op, start_hint, prof)
+        if prof: prof.add("schedule", t_sched)
+
+    def _schedule_operation_impl(self, op: Operation, start_hint: float, prof: Optional[StageProfiler]):
+        # start/end: TimeBase 저장값 (start_hint 는 이미 격자 위), start_us/end_us: row/로그용 µs
+        tb=self.tb
+        start=start_hint; end=tb.norm(start+get_op_duration_k(op))
+        start_us=tb.us(start); end_us=tb.us(end)
 
         # ---- fail-safe: schedule 직전 마지막 충돌 점검 ----
+        if prof: tp=_ns()
         segs = self.addr.bus_segments_for_op(op)
         if not self.addr.bus_precheck(op, start, segs):
-            print(f"[WARN] BUS conflict at schedule-time: {op.base.name} start={start:.2f} end={end:.2f}")
+            LOG_SCHED.warning("[WARN] BUS conflict at schedule-time: %s start=%.2f end=%.2f", op.base.name, start_us, end_us)
             return
         if not self.latch.allowed(op, start):
-            print(f"[WARN] LATCH conflict at schedule-time: {op.base.name} start={start:.2f} end={end:.2f}")
+            LOG_SCHED.warning("[WARN] LATCH conflict at schedule-time: %s start=%.2f end=%.2f", op.base.name, start_us, end_us)
             return
         if not self.excl.allowed(op, start, end):
-            print(f"[WARN] EXCLUSION conflict at schedule-time: {op.base.name} start={start:.2f} end={end:.2f}")
+            LOG_SCHED.warning("[WARN] EXCLUSION conflict at schedule-time: %s start=%.2f end=%.2f", op.base.name, start_us, end_us)
             return
+        if prof: prof.add("sched.failsafe", tp)
         # -----------------------------------------------
 
         # reserve plane scope + bus + register exclusions + future update
-        ignore = set(self.cfg.get("op_specs", {}).get(op.name, {}).get("ignore", []))
+        if prof: tp=_ns()
+        cc = self.cc
+        ignore = cc.ignore_of(op.name)
         if "reserve_planscope" not in ignore:
             self.addr.reserve_planescope(op, start, end)
         if "bus_reserve" not in ignore:
-            self.addr.bus_reserve(start, self.addr.bus_segments_for_op(op))
+            self.addr.bus_reserve(start, segs)
         if "register_exclusion" not in ignore:
             self.excl.register(op, start)
         if "register_future" not in ignore:
             self.addr.register_future(op, start, end)
+        if prof: prof.add("sched.reserve", tp)
         # state timeline register per target
-        affects = self.cfg.get("state_timeline", {}).get("affects", {})
-        affect_op = bool(affects.get(op.base.name, True)) and ("state_timeline" not in ignore)
+        affect_op = bool(cc.timeline_affects.get(op.base.name, True)) and ("state_timeline" not in ignore)
         if affect_op:
-            st_list = [(s.name, float(s.dur_us)) for s in op.states]
+            if prof: tp=_ns()
+            st_list = [(s.name, s.dur_k) for s in op.states]
             for t in op.targets:
                 self.state_timeline.reserve_op(t.die, t.plane, op.name, op.base.name, st_list, start, True)
+            if prof: prof.add("state_timeline.reserve_op", tp)
         # latch: if READ, plan lock from READ.end_us until DOUT ends
-        if op.base == OpKind.READ and "latch_plan_lock" not in ignore:
+        if op.base == self.kinds.READ and "latch_plan_lock" not in ignore:
             self.latch.plan_lock_after_read(op.targets, end)
 
         # assign deterministic op uid (per scheduled op)
-        if "uid" not in op.meta:
-            op.meta["uid"] = self.stat_scheduled + 1
-        if self.logger is not None:
-            bs_cfg = self.cfg.get("bootstrap", {})
-            disable_bootlog = bool(bs_cfg.get("disable_timeline_logging", False))
-            split_logging = bool(bs_cfg.get("split_timeline_logging", False))
+        if op.uid is None:
+            op.uid = self.stat_scheduled + 1
+        if self.logger is not None and self.buffer_timeline:
+            disable_bootlog = cc.bs_disable_timeline_logging
+            split_logging = cc.bs_split_timeline_logging
             in_bootstrap = (self._bootstrap_started and (self._bootstrap_end_time is None))
-            is_bootstrap_op = (op.meta.get("source") == "bootstrap")
+            is_bootstrap_op = (op.source == "bootstrap")
 
             if split_logging:
                 # 분리 로깅: 부트스트랩/정책 각각 별도 버퍼에 기록
@@ -2326,17 +3542,17 @@ class Scheduler:
                     for t in op.targets:
                         page = t.page if (t.page is not None) else 0
                         rows.append({
-                            "start_us": float(start),
-                            "end_us":   float(end),
+                            "start_us": start_us,
+                            "end_us":   end_us,
                             "die":      int(t.die),
                             "plane":    int(t.plane),
                             "block":    int(t.block),
                             "page":     int(page),
                             "op_name":     label,
                             "op_base": op.base.name,
-                            "source":   op.meta.get("source"),
-                            "op_uid":   int(op.meta.get("uid", -1)),
-                            "arity":    int(op.meta.get("arity", 1)),
+                            "source":   op.source,
+                            "op_uid":   (op.uid if op.uid is not None else -1),
+                            "arity":    int(op.arity),
                         })
                     return rows
                 if in_bootstrap or is_bootstrap_op:
@@ -2348,203 +3564,989 @@ class Scheduler:
                 if disable_bootlog and (in_bootstrap or is_bootstrap_op):
                     pass
                 else:
-                    self.logger.log_op(op, start, end, label_for_read=self._label_for_read(op))
+                    self.logger.log_op(op, start_us, end_us, label_for_read=self._label_for_read(op))
+
+        if self._subscribers:
+            op.start_us = start_us; op.end_us = end_us
+            self._emit("sched", op)
 
         # obligation assignment stats
-        if "obligation" in op.meta:
-            self.obl.mark_assigned(op.meta["obligation"])
+        if op.obligation is not None:
+            self.obl.mark_assigned(op.obligation)
 
         # push events
-        self._push(start, "OP_START", op); self._push(end, "OP_END", op)
+        self._push(start, EV_OP_START, op); self._push(end, EV_OP_END, op)
 
         # hooks: bootstrap에서는 훅을 1회로 축소(END만). 비부트스트랩은 기존 2~3회 유지
-        bs_cfg = self.cfg.get("bootstrap", {})
-        pol_cfg = self.cfg.get("policy", {})
         # bootstrap 전용: 오퍼레이션이 bootstrap 소스일 때만 훅 축소 적용
-        is_bootstrap_op = (op.meta.get("source") == "bootstrap")
-        reduce_hooks = bool(bs_cfg.get("reduce_phase_hooks", False)) and is_bootstrap_op
-        hook_margin = float(bs_cfg.get("hook_margin_us", 0.1))
+        is_bootstrap_op = (op.source == "bootstrap")
+        reduce_hooks = cc.bs_reduce_phase_hooks and is_bootstrap_op
+        hook_margin = cc.bs_hook_margin_k
+        norm = tb.norm; rnd = self.rng.random
         # kind별 훅 차단
-        disabled_kinds = set(str(k).upper() for k in pol_cfg.get("phase_hook_disabled_kinds", []))
-        hooks_blocked = (op.base.name in disabled_kinds)
+        hooks_blocked = (op.base.name in cc.phase_hook_disabled_kinds)
         if not hooks_blocked:
             for t in op.targets:
                 if reduce_hooks:
                     # op 종료 시각 + margin 기준 한 번만 훅 발생
-                    self._push(end + hook_margin, "PHASE_HOOK", PhaseHook(end + hook_margin, f"{op.name}.END", t.die, t.plane))
+                    self._push_hook(norm(end + hook_margin), PhaseHook(end + hook_margin, f"{op.name}.END", t.die, t.plane))
                 else:
                     cur=start
                     for s in op.states:
+                        dur=s.dur_k
                         if s.name !="ISSUE":
-                            eps_s = random.random()*s.dur_us*0.2
-                            eps_e = random.random()*s.dur_us*0.2
-                            self._push(cur + s.dur_us - eps_s,    "PHASE_HOOK", PhaseHook(cur + s.dur_us,    f"{op.name}.{s.name}.MID",   t.die, t.plane))
-                            self._push(cur + s.dur_us + eps_e,    "PHASE_HOOK", PhaseHook(cur + s.dur_us,    f"{op.name}.{s.name}.END",   t.die, t.plane))
-                        cur += s.dur_us
+                            eps_s = rnd()*dur*0.2
+                            eps_e = rnd()*dur*0.2
+                            self._push_hook(norm(cur + dur - eps_s),    PhaseHook(cur + dur,    f"{op.name}.{s.name}.MID",   t.die, t.plane))
+                            self._push_hook(norm(cur + dur + eps_e),    PhaseHook(cur + dur,    f"{op.name}.{s.name}.END",   t.die, t.plane))
+                        cur += dur
 
-        first=op.targets[0]
-        print(f"[{self.now:7.2f} us] SCHED  {op.base.name:7s} arity={op.meta.get('arity')} scope={op.meta.get('scope')} start={start:7.2f} end={end:7.2f} 1st={_addr_str(first)} src={op.meta.get('source')} alias={op.meta.get('alias_used')}")
+        if LOG_SCHED.isEnabledFor(DEBUG):
+            LOG_SCHED.debug("[%7.2f us] SCHED  %-7s arity=%s scope=%s start=%7.2f end=%7.2f 1st=%s src=%s alias=%s",
+                            tb.us(self.now), op.base.name, op.arity, op.scope, start_us, end_us,
+                            _addr_str(op.targets[0]), op.source, op.alias_used)
 
         self.stat_scheduled+=1
 
+    # ---- hook coalescing ----
+    def _push_hook(self, t: float, hook: PhaseHook):
+        if not self._hook_register:
+            if self.hook_coalesce:
+                self.stat_hooks["pushed"]+=1
+            self._push(t, EV_PHASE_HOOK, hook); return
+        slot=()
+        if self._hook_bucket is not None:
+            slot=(hook.die, hook.plane, int(hook.time_us // self._hook_bucket), hook.label)
+            if slot in self._hook_slots:
+                self.stat_hooks["coalesced"]+=1; return
+        n=self._hook_die_n.get(hook.die, 0)
+        if self._hook_budget > 0 and n >= self._hook_budget:
+            self.stat_hooks["dropped_budget"]+=1; return
+        if slot:
+            self._hook_slots[slot]=hook
+        hook.reg=slot
+        self._hook_die_n[hook.die]=n+1
+        self.stat_hooks["pushed"]+=1
+        self._push(t, EV_PHASE_HOOK, hook)
+
+    def _hook_release(self, hook: PhaseHook):
+        reg=hook.reg
+        if reg is None:   # _push_hook 을 거치지 않은 훅 (BOOT.START, REFILL.NUDGE, wakeup)
+            return
+        hook.reg=None
+        if reg:
+            del self._hook_slots[reg]
+        self._hook_die_n[hook.die]-=1
+
+    def _propose_idle(self, die: int) -> bool:
+        """
+        지금 이 die 로 propose 하면 확실히 빈손인지 (op 없음, RNG/의무 상태 불변 → 건너뛰어도 결과 동일).
+        phase_conditional 이 막혀 있고(off 또는 bootstrap 대기 guard) pop_urgent 가 고를 의무가 없을 때.
+        horizon 경계는 격자 한 칸(tb.res)만큼 보수적으로 판단.
+        """
+        if self.cc.enable_phase_conditional and not self.obl.has_pending("bootstrap"):
+            return False
+        t=self.obl.next_ready_time(die, self.now, self.cc.hook_horizon_k)
+        return t is None or t > self.now + self.tb.res
+
+    # ---- wakeup mode ----
+    def _arm_wakeup(self, die: int, plane: int, t: float):
+        """(die, plane) 의 EV_WAKEUP 을 t 에 예약. 이미 t 이하로 잡혀 있으면 그대로 둔다 (늦은 쪽은 stale)."""
+        key=(die, plane)
+        cur=self._wake_at.get(key)
+        if cur is not None and cur <= t:
+            return
+        self._wake_at[key]=t
+        self.stat_wakeups["armed"]+=1
+        self._push(t, EV_WAKEUP, key)
+
+    def _wake_after_propose(self, die: int, plane: int, op: Optional[Operation]):
+        """
+        propose 뒤 (die, plane) 를 다시 깨울 시각 예약.
+        - op 가 이 plane 을 잡고 훅도 만들면 그 PHASE_HOOK 이 다음 propose 이므로 예약 안 함
+        - 빈손이면 마지막 reject 사유가 풀리는 시각: bus → 다음 bus 예약 종료, excl → 다음 exclusion 창 종료,
+          그 밖(admission/precheck/plan 등) → 이 die 의 다음 plane 해제
+        - 항상: 이 die 의 의무가 ready 되는 시각, fallback = now + queue_refill_period × 2^min(연속 빈손, 3)
+        같은 die op 종료(commit/latch 해제/의무 생성)와 bootstrap 종료는 _on_op_end 가 _wake_waiting 으로 깨운다.
+        """
+        key=(die, plane)
+        if op is not None:
+            self._wake_fails.pop(key, None)
+            if (op.targets[0].die == die and plane in op.plane_list
+                    and op.base.name not in self.cc.phase_hook_disabled_kinds):
+                return
+            fails=0
+        else:
+            fails=self._wake_fails.get(key, 0) + 1
+            self._wake_fails[key]=fails
+        now=self.now
+        t=self.tb.norm(now + self.cc.queue_refill_period_k * (1 << min(fails, 3)))
+        reason=None if op is not None else self.SPE.last_reject
+        if reason == "bus":
+            t_rel=self.addr.bus_resv.next_end(now)
+        elif reason == "excl":
+            t_rel=self.excl.next_end(die, now)
+        elif reason is not None:
+            t_rel=self.addr.next_release(die, now)
+        else:
+            t_rel=None
+        if t_rel is not None and t_rel < t:
+            t=t_rel
+        t_ob=self.obl.next_ready_time(die, now, self.cc.hook_horizon_k)
+        if t_ob is not None:
+            # float 모드의 deadline - horizon 은 격자 밖일 수 있음 → 다음 격자로 올림 (pop_urgent 가 ready 로 보는 첫 시각)
+            t_n=self.tb.norm(t_ob)
+            if t_n < t_ob:
+                t_n=self.tb.norm(t_n + self.tb.res)
+            if now < t_n < t:
+                t=t_n
+        self._arm_wakeup(die, plane, t)
+
+    def _wake_waiting(self, dies):
+        """빈손으로 대기 중인 (die, plane) 을 지금 깨운다."""
+        now=self.now
+        for die in dies:
+            for plane in range(self.addr.planes):
+                if self._wake_fails.get((die, plane)):
+                    self._arm_wakeup(die, plane, now)
+
+    # ---- event handlers (dispatch table: self._handlers[code]) ----
+    def _on_queue_refill(self, payload: Any):
+        # 일원화된 훅 트리거: 글로벌/로컬 모두 여기에서 처리 (periodic 모드 전용)
+        for _ in range(self.cc.global_obl_iters):
+            for die in self.dies:
+                for plane in range(self.addr.planes):
+                    self._push(self.now, EV_PHASE_HOOK, PhaseHook(self.now, "REFILL.NUDGE", die, plane))
+        self._push(self.tb.norm(self.now + self.cc.queue_refill_period_k), EV_QUEUE_REFILL, None)
+
+    def _on_wakeup(self, key: Tuple[int,int]):
+        """wakeup 모드: 예약된 (die, plane) 하나를 REFILL.NUDGE 와 같은 label 로 propose. 앞당겨져 무효가 된 예약은 버림."""
+        if self._wake_at.get(key) != self.now:
+            self.stat_wakeups["stale"]+=1
+            return
+        del self._wake_at[key]
+        self.stat_wakeups["fired"]+=1
+        self._on_phase_hook(PhaseHook(self.now, "REFILL.NUDGE", key[0], key[1]))
+
+    def _on_phase_hook(self, hook: PhaseHook):
+        if self._hook_register:
+            self._hook_release(hook)
+        # bootstrap watchdog: first time pending detected / drain completion
+        if self.obl.has_pending("bootstrap"):
+            if not self._bootstrap_started:
+                self._bootstrap_started=True
+                self._bootstrap_start_time=self.now
+        else:
+            if self._bootstrap_started and self._bootstrap_end_time is None:
+                self._bootstrap_end_time=self.now
+        if self._drop_idle and self._propose_idle(hook.die):
+            if self.wakeup_mode:
+                self.stat_wakeups["idle"]+=1
+                self.SPE.last_reject=None
+                self._wake_after_propose(hook.die, hook.plane, None)
+            if self._hook_drop_idle:
+                self.stat_hooks["dropped_idle"]+=1
+            return
+        # 의무 선택의 타당성 판단을 위해 now를 고려
+        # earliest_start = max(self.now, self.addr.available_at(hook.die, hook.plane))
+        earliest_start = self.now
+        g,l=self.addr.observe_states(hook.die, hook.plane, self.now)
+        self.stat_propose_calls+=1
+        _ts = time.perf_counter(); _ts_ns = _ns()
+        op, start_hint=self.SPE.propose(self.now, hook, g, l, earliest_start)
+        self._propose_time_total += time.perf_counter() - _ts
+        if self.prof: self.prof.add("propose", _ts_ns)
+        if op: self._schedule_operation(op, start_hint)
+        if self.wakeup_mode:
+            self._wake_after_propose(hook.die, hook.plane, op)
+
+    def _on_op_start(self, op: Operation):
+        if LOG_SCHED.isEnabledFor(DEBUG):
+            LOG_SCHED.debug("[%7.2f us] START  %-7s arity=%s target=%s", self.tb.us(self.now), op.base.name, op.arity, _addr_str(op.targets[0]))
+
+    def _on_op_end(self, op: Operation):
+        if LOG_SCHED.isEnabledFor(DEBUG):
+            LOG_SCHED.debug("[%7.2f us] END    %-7s arity=%s target=%s", self.tb.us(self.now), op.base.name, op.arity, _addr_str(op.targets[0]))
+        boot_pending = self.wakeup_mode and self.obl.has_pending("bootstrap")
+        self.addr.commit(op)
+        # DOUT 종료 시 래치 해제
+        if op.base == self.kinds.DOUT:
+            self.latch.release_on_dout_end(op.targets, self.now)
+        # obligation fulfillment stats
+        if op.obligation is not None:
+            self.obl.mark_fulfilled(op.obligation, self.now)
+        prof=self.prof
+        if prof: tp=_ns()
+        self.obl.on_commit(op, self.now)
+        if prof: prof.add("obl.on_commit", tp)
+        if self.wakeup_mode:
+            # commit/latch 해제/새 의무는 이 die 의 빈손 plane 을, bootstrap 종료(policy guard 해제)는 전체를 바꾼다
+            if boot_pending and not self.obl.has_pending("bootstrap"):
+                self._wake_waiting(self.dies)
+            else:
+                self._wake_waiting((op.targets[0].die,))
+        if self._subscribers and op.start_us is not None:
+            self._emit("end", op)
+
+    def step(self):
+        """이벤트 하나 처리."""
+        k, _, code, payload = self.ev.pop()
+        self.now = k
+        self.stat_events += 1
+        if not (self.stat_events & _PRUNE_EVERY_MASK):
+            self._prune_history()
+
+        # expire obligations due
+        self.obl.expire_due(self.now)
+
+        self._handlers[code](payload)
+
+    def _prune_history(self):
+        """now 이전에 끝난 plane/bus 예약과 exclusion 창 제거 (항상), state segment 는 export.buffer_history=False 일 때만."""
+        self.addr.retire(self.now)
+        if not self.buffer_history and self.state_timeline is not None:
+            self.state_timeline.prune(self.now)
+        self.excl.prune(self.now)
+
+    def advance(self, t_end_k):
+        """t_end_k(TimeBase key) 이하의 이벤트를 모두 처리."""
+        ev=self.ev; step=self.step; tel=self.telemetry
+        if tel is None:
+            while ev and ev.peek_time() <= t_end_k:
+                step()
+        else:
+            while ev and ev.peek_time() <= t_end_k:
+                step()
+                tel.tick(self)
+
+    # ---- op record stream ----
+    def subscribe(self, fn) -> Any:
+        """op record 콜백 등록 (schedule 시 event="sched", OP_END 시 event="end"). 해제 핸들(fn) 반환."""
+        self._subscribers.append(fn)
+        return fn
+
+    def unsubscribe(self, fn):
+        self._subscribers.remove(fn)
+
+    def _emit(self, event: str, op: Operation):
+        start = op.start_us; end = op.end_us
+        label = self._label_for_read(op)
+        rows = []
+        for t in op.targets:
+            rows.append({
+                "start_us": float(start), "end_us": float(end),
+                "die": int(t.die), "plane": int(t.plane), "block": int(t.block),
+                "page": int(t.page if t.page is not None else 0),
+                "op_name": label, "op_base": op.base.name, "source": op.source,
+                "op_uid": (op.uid if op.uid is not None else -1), "arity": int(op.arity),
+                "phase_key_used": op.phase_key_used,
+                "state_key_at_schedule": op.state_key_at_schedule,
+            })
+        rec = {"event": event, "now_us": self.tb.us(self.now), "uid": (op.uid if op.uid is not None else -1),
+               "op_base": op.base.name, "op_name": label, "start_us": float(start), "end_us": float(end),
+               "rows": rows}
+        for fn in self._subscribers:
+            fn(rec)
+
+    def iter_ops(self, t_end: float):
+        """
+        t_end 까지 진행하면서 op record 를 발생 순서대로 yield 하는 generator.
+        record: {"event": "sched"|"end", "now_us", "uid", "op_base", "op_name", "start_us", "end_us",
+                 "rows": [TimelineLogger row 형식, target 별]}
+        export.buffer_timeline=False, export.buffer_history=False 와 함께 쓰면 timeline/reject row 를 쌓지 않고
+        지난 state segment/exclusion 창을 버려 메모리가 run 길이에 비례해 늘지 않는다.
+        telemetry tick 과 종료 처리(final telemetry, stats 출력)는 run_until 과 같다.
+        끝까지 소비하면 stats 를 generator 반환값(StopIteration.value)과 self.final_stats 로 남긴다.
+        """
+        t_end=quantize(t_end); t_end_k=self.tb.key(t_end)
+        buf=deque()
+        self.subscribe(buf.append)
+        try:
+            ev=self.ev; step=self.step; tel=self.telemetry
+            while ev and ev.peek_time() <= t_end_k:
+                step()
+                if tel is not None:
+                    tel.tick(self)
+                while buf:
+                    yield buf.popleft()
+        finally:
+            self.unsubscribe(buf.append)
+        return self._finish(t_end)
+
+    def __getstate__(self):
+        # 콜백은 checkpoint/fork 대상이 아님
+        st=self.__dict__.copy(); st["_subscribers"]=[]
+        return st
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "events": self.stat_events,
+            "propose_calls": self.stat_propose_calls,
+            "scheduled": self.stat_scheduled,
+            "propose_time_s": self._propose_time_total,
+            "obligations": dict(self.obl.stats),
+            "hooks": dict(self.stat_hooks) if self.hook_coalesce else None,
+            "wakeups": dict(self.stat_wakeups) if self.wakeup_mode else None,
+            "bootstrap": self._bootstrap_window_us() if self._bootstrap_started else None,
+            "profile": self.prof.snapshot() if self.prof is not None else None,
+            "memory": memory_report(self) if bool(self.cfg.get("memory_report", {}).get("enabled", False)) else None,
+        }
+
+    def _bootstrap_window_us(self) -> Tuple[float, Optional[float]]:
+        us=self.tb.us; t0, t1 = self._bootstrap_start_time, self._bootstrap_end_time
+        return us(t0), (us(t1) if t1 is not None else None)
+
+    def _finish(self, t_end: float) -> Dict[str, Any]:
+        """run_until/iter_ops 공통 종료 처리: final telemetry + stats 출력."""
+        if self.telemetry is not None:
+            self.telemetry.emit(self, final=True)
+        st = self.stats()
+        print_stats(t_end, st)
+        self.final_stats = st
+        return st
+
     def run_until(self, t_end: float):
         t_end=quantize(t_end)
-        while self.ev and self.ev[0][0] <= t_end:
-            self.now, _, typ, payload = heapq.heappop(self.ev)
-
-            # expire obligations due
-            self.obl.expire_due(self.now)
-
-            if typ=="QUEUE_REFILL":
-                # 일원화된 훅 트리거: 글로벌/로컬 모두 여기에서 처리
-                hookscreen_cfg = self.cfg.get("policy", {}).get("hookscreen", {})
-                iters = max(1, int(hookscreen_cfg.get("global_obl_iters", 1)))
-                for _ in range(iters):
-                    for die in range(self.addr.dies):
-                        for plane in range(self.addr.planes):
-                            self._push(self.now, "PHASE_HOOK", PhaseHook(self.now, "REFILL.NUDGE", die, plane))
-                self._push(self.now + self.cfg["policy"]["queue_refill_period_us"], "QUEUE_REFILL", None)
-
-            elif typ=="PHASE_HOOK":
-                hook: PhaseHook = payload
-                # 의무 선택의 타당성 판단을 위해 now를 고려
-                # earliest_start = max(self.now, self.addr.available_at(hook.die, hook.plane))
-                earliest_start = self.now
-                g,l=self.addr.observe_states(hook.die, hook.plane, self.now)
-                # bootstrap watchdog: first time pending detected / drain completion
-                if self.obl.has_pending("bootstrap"):
-                    if not self._bootstrap_started:
-                        self._bootstrap_started=True
-                        self._bootstrap_start_time=self.now
-                else:
-                    if self._bootstrap_started and self._bootstrap_end_time is None:
-                        self._bootstrap_end_time=self.now
-                self.stat_propose_calls+=1
-                _ts = time.perf_counter()
-                op, start_hint=self.SPE.propose(self.now, hook, g, l, earliest_start)
-                self._propose_time_total += time.perf_counter() - _ts
-                if op: self._schedule_operation(op, start_hint)
-
-            elif typ=="OP_START":
-                op: Operation=payload; first=op.targets[0]
-                print(f"[{self.now:7.2f} us] START  {op.base.name:7s} arity={op.meta.get('arity')} target={_addr_str(first)}")
-
-            elif typ=="OP_END":
-                op: Operation=payload; first=op.targets[0]
-                print(f"[{self.now:7.2f} us] END    {op.base.name:7s} arity={op.meta.get('arity')} target={_addr_str(first)}")
-                self.addr.commit(op)
-                # DOUT 종료 시 래치 해제
-                if op.base == OpKind.DOUT:
-                    self.latch.release_on_dout_end(op.targets, self.now)
-                # obligation fulfillment stats
-                if "obligation" in op.meta:
-                    self.obl.mark_fulfilled(op.meta["obligation"], self.now)
-                self.obl.on_commit(op, self.now)
-
-        # final stats
-        print(f"\n=== Stats ===")
-        print(f"run_until     : {t_end:.2f}")
-        print(f"propose calls : {self.stat_propose_calls}")
-        print(f"scheduled ops : {self.stat_scheduled}")
-        if self.stat_propose_calls:
-            print(f"accept ratio  : {100.0*self.stat_scheduled/self.stat_propose_calls:.1f}%")
-            print(f"reject ratio  : {100.0*(self.stat_propose_calls - self.stat_scheduled)/self.stat_propose_calls:.1f}%")
-            avg = (self._propose_time_total/self.stat_propose_calls)*1000.0
-            print(f"avg propose ms: {avg:.3f}")
-        s=self.obl.stats
-        rate=(100.0*s["fulfilled_in_time"]/s["created"]) if s["created"] else 0.0
-        print(f"obligations   : created={s['created']} assigned={s['assigned']} fulfilled={s['fulfilled']} in_time={s['fulfilled_in_time']} expired={s['expired']} success={rate:.1f}%")
-        if self._bootstrap_started:
-            dur = (self._bootstrap_end_time - self._bootstrap_start_time) if (self._bootstrap_end_time is not None and self._bootstrap_start_time is not None) else None
-            print(f"bootstrap     : started_at={self._bootstrap_start_time} ended_at={self._bootstrap_end_time} duration={dur}")
+        self.advance(self.tb.key(t_end))
+        return self._finish(t_end)
 
-# --------------------------------------------------------------------------
-# Main
-def main():
-    # 1) 구성
-    # 1.0) 로깅 옵션
-    CFG["export"]["log_to_file"] = True
-    CFG["export"]["log_tee"] = False
-    CFG["bootstrap"]["disable_timeline_logging"] = False
-    CFG["bootstrap"]["split_timeline_logging"] = False
-    # 1.1) bootstrap, phase conditional 활성화 여부 설정
-    CFG["bootstrap"]["enabled"] = True
-    CFG["policy"]["enable_phase_conditional"] = True
-    CFG["bootstrap"]["pgm_ratio"] = 0.2
-    # 1.2) topology 설정
-    CFG["topology"]["dies"] = 1
-    CFG["topology"]["planes"] = 4
-    CFG["topology"]["blocks"] = 8
-    CFG["topology"]["pages_per_block"] = 100
-    print(f"topology: {CFG['topology']}")
-    # 시각화 on/off 토글
-    enable_visualization = False
-    try:
-        exp = CFG.get("export", {})
-        if bool(exp.get("log_to_file", False)):
-            path = str(exp.get("log_path", "run.log"))
-            f = open(path, "w", encoding="utf-8", newline="")
-            if bool(exp.get("log_tee", True)):
-                class _Tee:
-                    def __init__(self, a, b):
-                        self.a=a; self.b=b
-                    def write(self, s):
-                        self.a.write(s); self.b.write(s)
-                    def flush(self):
-                        self.a.flush(); self.b.flush()
-                sys.stdout = _Tee(sys.stdout, f)
+    # ---- checkpoint / restore ----
+    def checkpoint(self, path: str):
+        """
+        실행 중 상태 전체를 gzip 압축 pickle 로 저장: 이벤트 큐, Address/Exclusion/Latch/Obligation 매니저,
+        StateTimeline, logger/reject 버퍼, RNG 상태. 저장 후에도 이 인스턴스로 계속 진행 가능.
+        OpKind 는 cfg 에서 동적으로 만든 Enum 이라 이름으로 기록하고 restore 시 header 의 이름 목록으로 재생성한다
+        (cfg 는 본문에 한 번만 들어간다).
+        """
+        header = {"version": CHECKPOINT_VERSION, "opkinds": [k.name for k in self.kinds], "now": self.now,
+                  "random_state": random.getstate() if self.rng is random else None}
+        with gzip.open(path, "wb", compresslevel=6) as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            _CheckpointPickler(f, self.kinds).dump(self)
+
+    @classmethod
+    def restore(cls, path: str) -> "Scheduler":
+        """checkpoint() 파일에서 Scheduler(와 연결된 컴포넌트 전체)를 복원. run_until 로 이어서 실행."""
+        with gzip.open(path, "rb") as f:
+            header = pickle.load(f)
+            if header.get("version") != CHECKPOINT_VERSION:
+                raise ValueError(f"unsupported checkpoint version: {header.get('version')} (expected {CHECKPOINT_VERSION})")
+            kinds = Enum("OpKind", header["opkinds"])
+            sch = _CheckpointUnpickler(f, kinds).load()
+        if not isinstance(sch, cls):
+            raise ValueError(f"checkpoint does not contain a {cls.__name__}: {type(sch).__name__}")
+        if header["random_state"] is not None:
+            random.setstate(header["random_state"])
+        return sch
+
+CHECKPOINT_VERSION = 1
+
+class _CheckpointPickler(pickle.Pickler):
+    """OpKind(동적 Enum)와 전역 random 모듈은 persistent id 로 기록."""
+    def __init__(self, f, kinds: Enum):
+        super().__init__(f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.kinds = kinds
+
+    def persistent_id(self, obj):
+        if obj is self.kinds:
+            return ("opkind",)
+        if type(obj) is self.kinds:
+            return ("opkind", obj.name)
+        if obj is random:
+            return ("random",)
+        return None
+
+class _CheckpointUnpickler(pickle.Unpickler):
+    def __init__(self, f, kinds: Enum):
+        super().__init__(f)
+        self.kinds = kinds
+
+    def persistent_load(self, pid):
+        if pid[0] == "opkind":
+            return self.kinds if len(pid) == 1 else self.kinds[pid[1]]
+        if pid[0] == "random":
+            return random
+        raise pickle.UnpicklingError(f"unknown persistent id: {pid!r}")
+
+def print_stats(t_end: float, st: Dict[str, Any]):
+    """실행 통계 요약을 LOG_RUN(INFO) 으로 한 번에 출력."""
+    out: List[str] = []
+    out.append(f"\n=== Stats ===")
+    out.append(f"run_until     : {t_end:.2f}")
+    out.append(f"events        : {st['events']}")
+    out.append(f"propose calls : {st['propose_calls']}")
+    out.append(f"scheduled ops : {st['scheduled']}")
+    if st["propose_calls"]:
+        out.append(f"accept ratio  : {100.0*st['scheduled']/st['propose_calls']:.1f}%")
+        out.append(f"reject ratio  : {100.0*(st['propose_calls'] - st['scheduled'])/st['propose_calls']:.1f}%")
+        avg = (st["propose_time_s"]/st["propose_calls"])*1000.0
+        out.append(f"avg propose ms: {avg:.3f}")
+    s=st["obligations"]
+    rate=(100.0*s["fulfilled_in_time"]/s["created"]) if s["created"] else 0.0
+    out.append(f"obligations   : created={s['created']} assigned={s['assigned']} fulfilled={s['fulfilled']} in_time={s['fulfilled_in_time']} expired={s['expired']} success={rate:.1f}%")
+    if st["hooks"]:
+        h=st["hooks"]
+        out.append(f"hooks         : pushed={h['pushed']} coalesced={h['coalesced']} dropped_idle={h['dropped_idle']} dropped_budget={h['dropped_budget']}")
+    if st["wakeups"]:
+        w=st["wakeups"]
+        out.append(f"wakeups       : armed={w['armed']} fired={w['fired']} stale={w['stale']} idle={w['idle']}")
+    if st.get("parallel"):
+        p=st["parallel"]
+        mode="APPROXIMATE (row 가 직렬 실행과 다름, 분포만 비교 가능)" if p["approximate"] else "exact (직렬과 같은 row)"
+        out.append(f"parallel      : workers={p['workers']} window_us={p['window_us']} {mode}")
+    if st["bootstrap"]:
+        t0, t1 = st["bootstrap"]
+        dur = (t1 - t0) if (t1 is not None and t0 is not None) else None
+        out.append(f"bootstrap     : started_at={t0} ended_at={t1} duration={dur}")
+    if st.get("profile"):
+        out.append(f"\n=== Stage Profile ===")
+        out.append(f"{'stage':26s} {'calls':>9s} {'total_ms':>10s} {'avg_us':>9s}")
+        for r in profile_rows(st["profile"]):
+            out.append(f"{r['stage']:26s} {r['calls']:9d} {r['total_ms']:10.3f} {r['avg_us']:9.3f}")
+    if st.get("memory"):
+        out.append(f"\n=== Memory (retained, by subsystem) ===")
+        out.extend(format_memory_report(st["memory"]))
+    LOG_RUN.info("%s", "\n".join(out))
+
+def _merge_stats(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """die 파티션별 stats() 합산 (bootstrap 은 가장 이른 시작 ~ 가장 늦은 종료)."""
+    out: Dict[str, Any] = {}
+    for st in parts:
+        for k, v in st.items():
+            if v is None:
+                out.setdefault(k, None)
+            elif k == "bootstrap":
+                prev = out.get(k)
+                if prev is None:
+                    out[k] = v
+                else:
+                    t0 = min(x for x in (prev[0], v[0]) if x is not None) if (prev[0] is not None or v[0] is not None) else None
+                    t1 = None if (prev[1] is None or v[1] is None) else max(prev[1], v[1])
+                    out[k] = (t0, t1)
+            elif k in ("profile", "memory"):
+                # 이름 -> {카운터: 값} 2단 dict
+                d = out.get(k) or {}
+                for name, pv in v.items():
+                    acc = d.setdefault(name, {})
+                    for ck, cv in pv.items():
+                        acc[ck] = acc.get(ck, 0) + cv
+                out[k] = d
+            elif isinstance(v, dict):
+                d = out.get(k) or {}
+                for kk, vv in v.items():
+                    d[kk] = d.get(kk, 0) + vv
+                out[k] = d
             else:
-                sys.stdout = f
-    except Exception as e:
-        print(f"[LOG] redirect skipped: {e}")
+                out[k] = out.get(k, 0) + v
+    return out
 
-    _seed_rng_from_cfg(CFG)
-    _coerce_states_to_fixed(CFG)
-    _validate_phase_conditional_cfg(CFG)
+# --------------------------------------------------------------------------
+# Build
+def _build_sim(cfg: Dict[str, Any], tables: Optional[SimTables] = None, rng=random, dies: Optional[List[int]] = None):
     logger = TimelineLogger()
-    rejlog = RejectionLogger()
-    addr = AddressManager(CFG); excl = ExclusionManager(CFG)
-    obl  = ObligationManager(CFG["obligations"], cfg_root=CFG)
-    latch = LatchManager()
+    rejlog = RejectionLogger(keep_rows=bool(cfg.get("export", {}).get("buffer_history", True)))
+    cc = compile_cfg(cfg, tables)
+    addr = AddressManager(cfg, tables=tables, rng=rng, cc=cc); excl = ExclusionManager(cfg, tables=tables)
+    obl  = ObligationManager(cfg["obligations"], cfg_root=cfg, tables=tables, rng=rng, cc=cc)
+    latch = LatchManager(tables)
     # shared state timeline
-    state_timeline = StateTimeline()
-    spe  = PolicyEngine(CFG, addr, obl, excl, rejlog=rejlog, latch=latch, state_timeline=state_timeline)
-    sch  = Scheduler(CFG, addr, spe, obl, excl, logger=logger, latch=latch, state_timeline=state_timeline)
-
-    # 1.3) Bootstrap obligations (optional)
-    try:
-        populate_bootstrap_obligations(CFG, addr, obl)
-    except Exception as e:
-        print(f"[BOOTSTRAP] skipped: {e}")
-
-    # 2) 실행: bootstrap 전용 여유와 총 러닝타임 분리 계산
-    CFG["policy"]["run_until_us"] = 50000.0
-
-    run_until_base = CFG["policy"]["run_until_us"]
+    state_timeline = StateTimeline(TimeBase.from_cfg(cfg))
+    spe  = PolicyEngine(cfg, addr, obl, excl, rejlog=rejlog, latch=latch, state_timeline=state_timeline, tables=tables, rng=rng, cc=cc)
+    sch  = Scheduler(cfg, addr, spe, obl, excl, logger=logger, latch=latch, state_timeline=state_timeline, tables=tables, rng=rng, cc=cc,
+                     dies=dies)
+    return logger, rejlog, addr, obl, state_timeline, sch
+
+def _run_until_total(cfg: Dict[str, Any], obl: ObligationManager) -> float:
+    """총 러닝타임 = policy.run_until_us + bootstrap 여유(last_deadline_boot + num_bootstrap_ob * margin_per_ob)."""
+    run_until_base = cfg["policy"]["run_until_us"]
     run_until_boot = 0.0
     try:
-        if CFG.get("bootstrap", {}).get("enabled", False) and hasattr(obl, "heap") and obl.heap:
+        if cfg.get("bootstrap", {}).get("enabled", False) and hasattr(obl, "heap") and obl.heap:
             # 부트스트랩 의무만 필터링
             boot_items = [it for it in obl.heap if getattr(it.ob, "source", None) == "bootstrap"]
             if boot_items:
-                last_deadline_boot = max((it.ob.deadline_us for it in boot_items), default=run_until_base)
+                us = TimeBase.from_cfg(cfg).us
+                last_deadline_boot = max((us(it.ob.deadline_us) for it in boot_items), default=run_until_base)
                 num_bootstrap_ob = len(boot_items)
-                margin_per_ob = float(CFG.get("policy", {}).get("run_until_bootstrap_margin_per_ob_us", 3.0))
+                margin_per_ob = float(cfg.get("policy", {}).get("run_until_bootstrap_margin_per_ob_us", 3.0))
                 # 제안식: run_until_boot = last_deadline_boot + num_bootstrap_ob * margin_per_ob
                 run_until_boot = quantize(last_deadline_boot + num_bootstrap_ob * margin_per_ob)
-                print(f"bootstrap: {num_bootstrap_ob} obligations, run_until_boot={run_until_boot}")
+                LOG_RUN.info("bootstrap: %s obligations, run_until_boot=%s", num_bootstrap_ob, run_until_boot)
     except Exception:
         run_until_boot = 0.0
     # 총 런: run_until_tot = run_until_boot + run_until_base (사용자 제안식)
-    run_until_tot = quantize(run_until_base + run_until_boot)
-    sch.run_until(run_until_tot)
+    return quantize(run_until_base + run_until_boot)
+
+# --------------------------------------------------------------------------
+# cfg override helpers (점 표기 키)
+def _cfg_path(cfg: Dict[str, Any], key: str) -> List[Any]:
+    """
+    점 표기 키를 실제 경로로 분해. 키에 점이 들어간 항목(phase_conditional 의 "READ.CORE_BUSY" 등)은
+    단계마다 존재하는 가장 긴 키를 우선 매칭하고, list 단계에서는 숫자 토큰을 인덱스로 쓴다.
+    """
+    parts = key.split(".")
+    path: List[Any] = []
+    cur: Any = cfg
+    i = 0
+    while i < len(parts):
+        if isinstance(cur, list):
+            idx = int(parts[i]); path.append(idx)
+            cur = cur[idx] if -len(cur) <= idx < len(cur) else None
+            i += 1
+            continue
+        for j in range(len(parts), i, -1):
+            cand = ".".join(parts[i:j])
+            if isinstance(cur, dict) and cand in cur:
+                break
+        else:
+            j = i + 1; cand = parts[i]
+        path.append(cand)
+        cur = cur.get(cand) if isinstance(cur, dict) else None
+        i = j
+    return path
+
+def set_cfg_path(cfg: Dict[str, Any], key: str, value: Any):
+    """cfg[key] = value (점 표기 키, 없는 중간 dict 는 생성)."""
+    path = _cfg_path(cfg, key)
+    cur: Any = cfg
+    for k in path[:-1]:
+        nxt = cur[k] if isinstance(cur, list) else cur.get(k)
+        if not isinstance(nxt, (dict, list)):
+            nxt = cur[k] = {}
+        cur = nxt
+    cur[path[-1]] = value
+
+# --------------------------------------------------------------------------
+# Reentrant simulator (no module-global state)
+@dataclass
+class Result:
+    cfg: Dict[str, Any]                 # 정규화된 cfg 사본 (opcode_map 포함)
+    t_end: float
+    stats: Dict[str, Any]               # Scheduler.stats() 형식
+    rows: List[Dict[str, Any]]          # TimelineLogger.rows
+    rejlog: RejectionLogger
+    state_timeline: StateTimeline
+
+    def to_dataframe(self):
+        return TimelineLogger(rows=self.rows).to_dataframe()
+
+class Simulator:
+    """
+    cfg 하나에 대한 시뮬레이터 인스턴스. 모듈 전역(CFG, OpKind, alias 테이블, random)에 의존하지 않는다.
+    - cfg 는 deep copy 후 정규화(fixed dist 강제, phase_conditional 정규화)
+    - SimTables(alias/base 매핑, OpKind, opcode_map), RNG(random.Random(rng_seed)), 컴포넌트를 소유
+    - 같은 프로세스에서 여러 인스턴스를 만들거나 워커 풀에서 병렬로 돌려도 서로 간섭하지 않음
+    """
+    def __init__(self, cfg: Dict[str, Any]):
+        self.cfg = copy.deepcopy(cfg)
+        _coerce_states_to_fixed(self.cfg)
+        _validate_phase_conditional_cfg(self.cfg)
+        self.tables = SimTables(self.cfg)
+        self.cfg.setdefault("pattern_export", {})["opcode_map"] = self.tables.opcode_map
+        seed = self.cfg.get("rng_seed", None)
+        self.rng = random.Random(int(seed) if seed is not None else None)
+        LOG_RUN.info("[INIT] random.Random(%s)", seed)
+        (self.logger, self.rejlog, self.addr, self.obl,
+         self.state_timeline, self.sch) = _build_sim(self.cfg, tables=self.tables, rng=self.rng)
+        try:
+            populate_bootstrap_obligations(self.cfg, self.addr, self.obl)
+        except Exception as e:
+            LOG_RUN.warning("[BOOTSTRAP] skipped: %s", e)
+        self.t_end = _run_until_total(self.cfg, self.obl)
+
+    def run(self, t_end: Optional[float] = None) -> Result:
+        t_end = self.t_end if t_end is None else quantize(t_end)
+        if bool(self.cfg.get("parallel", {}).get("enabled", False)):
+            stats = run_parallel_dies(self.cfg, t_end, logger=self.logger, rejlog=self.rejlog,
+                                      state_timeline=self.state_timeline)
+        else:
+            stats = self.sch.run_until(t_end)
+        prof_path = self.cfg.get("profile", {}).get("path")
+        if stats.get("profile") and prof_path:
+            save_profile(stats["profile"], str(prof_path))
+        mem_path = self.cfg.get("memory_report", {}).get("path")
+        if stats.get("memory") and mem_path:
+            import json
+            with open(str(mem_path), "w", encoding="utf-8") as f:
+                json.dump(stats["memory"], f, indent=2)
+        return Result(cfg=self.cfg, t_end=t_end, stats=stats, rows=self.logger.rows,
+                      rejlog=self.rejlog, state_timeline=self.state_timeline)
+
+    def fork(self, overrides: Optional[Dict[str, Any]] = None, seed: Optional[int] = None,
+             telemetry_path: Optional[str] = None) -> "Simulator":
+        """
+        현재 상태에서 갈라지는 독립 분기 (what-if). 원본과 분기는 이후 서로 영향 없이 진행된다.
+        - 이후 변경되지 않는 객체는 복사하지 않고 공유: Address, SimTables, CompiledCfg, 기록된 timeline/reject row,
+          닫힌 StateInterval(끝이 inf 인 END 꼬리만 이후 잘리므로 복사)
+        - 큰 상태는 컨테이너만 복사 (원소는 불변이라 공유): AddressManager numpy 배열(memcpy)/PageBitmap/
+          fut_blocks/예약 IntervalIndex/future 창, StateTimeline 인덱스 리스트
+        - 나머지(cfg, 이벤트 큐, 매니저 상태, RNG)는 deepcopy
+        - overrides: 점 표기 cfg 키 -> 값. 실행 중 cfg 에서 읽는 항목(phase_conditional, obligations,
+          admission, selection 등)과 CompiledCfg 항목(policy/addressing/op_specs/bootstrap; 다시 컴파일)에
+          유효하며, 생성 시 고정되는 항목(topology, time_base, refill_mode, hook_coalesce,
+          addressing.read.block_pick)은
+          반영되지 않는다.
+        - seed: 주면 분기 RNG 를 재시드
+        - telemetry 가 켜져 있으면 분기는 telemetry_path (기본: <path stem>.fork<n><ext>) 에 따로 기록
+        """
+        memo: Dict[int, Any] = {id(self.tables): self.tables, id(self.sch.cc): self.sch.cc}
+        for r in self.logger.rows:
+            memo[id(r)] = r
+        for ev in self.rejlog.rows:
+            memo[id(ev)] = ev
+        new = copy.deepcopy(self, memo)
+        tel = new.sch.telemetry
+        if tel is not None:
+            if telemetry_path is None:
+                self._forks = getattr(self, "_forks", 0) + 1
+                root, ext = os.path.splitext(self.sch.telemetry.path)
+                telemetry_path = f"{root}.fork{self._forks}{ext}"
+            tel.branch(telemetry_path)
+        if overrides:
+            for k, v in overrides.items():
+                set_cfg_path(new.cfg, k, v)
+            _validate_phase_conditional_cfg(new.cfg)
+            cc = compile_cfg(new.cfg, new.tables)
+            new.addr.cc = new.obl.cc = new.sch.SPE.cc = new.sch.cc = cc
+        if seed is not None:
+            new.rng.seed(int(seed))
+        return new
+
+def simulate(cfg: Dict[str, Any]) -> Result:
+    return Simulator(cfg).run()
+
+# --------------------------------------------------------------------------
+# Parallel (per-die partitions)
+def _check_parallel_cfg(cfg: Dict[str, Any], window_us: float) -> int:
+    for r in cfg.get("constraints", {}).get("exclusions", []):
+        if str(r.get("scope", "GLOBAL")).upper() == "GLOBAL":
+            raise ValueError(f"parallel mode does not support GLOBAL exclusion rules: {r.get('when')}")
+    if window_us <= 0.0:
+        raise ValueError(f"parallel.window_us must be > 0: {window_us}")
+    cc = compile_cfg(cfg, SimTables(cfg))
+    reach = max((e for o in cc.ops.values() for (_, e) in o.bus_offsets), default=0.0)
+    if window_us < reach:
+        raise ValueError(f"parallel.window_us={window_us} is shorter than the longest bus reach of an op ({reach} us)")
+    return int(cfg["topology"]["dies"])
+
+def _partition_seed(seed: Optional[int], part: int) -> Optional[Any]:
+    """partition 0 은 직렬 실행과 같은 rng_seed, 나머지는 rng_seed 에서 정해지는 별도 stream (seed 없으면 OS random)."""
+    if seed is None or part == 0:
+        return seed
+    return f"{int(seed)}/{part}"
+
+class _RecordBuffer(logging.Handler):
+    """parallel 워커: log record 를 (logger, level, message) 로 모아 두고 window 마다 부모로 넘긴다."""
+    def __init__(self):
+        super().__init__()
+        self.records: List[Tuple[str, int, str]] = []
+
+    def emit(self, record):
+        self.records.append((record.name, record.levelno, record.getMessage()))
+
+def _partition_worker(conn, cfg: Dict[str, Any], part: int, dies: List[int], n_parts: int, levels: Dict[str, int]):
+    """
+    parallel partition 워커. 직렬 실행과 같은 모델(전체 topology, refill_mode, bootstrap 체인)로 시뮬을 만들되
+    dies 에만 훅을 만들고 그 die 를 target 으로 하는 의무만 남긴다.
+    메시지 (부모 -> 워커 -> 부모):
+    - ("run", t_k, horizon, ext, remote, extended): 다른 partition 이 잡은 bus 예약 중 아직 못 본 것 ext, 그쪽에 남은
+      의무 source remote, deadline 연장 누적 최대값 extended 를 반영하고, bus 예약 끝을 horizon 이하로 묶어 t_k 까지 진행
+      -> (이번 window 에 잡은 bus 예약, 새 timeline row, reject row, log record, (남은 의무 source, 연장 누적))
+    - ("finish",): stats/state segment/reject 통계를 돌려주고 종료
+    보낸 row/reject row 와 now 이전에 끝난 state segment 는 워커 상태에서 떼어 낸다.
+    로그는 워커에서 출력하지 않고 record 로 넘겨 부모의 로깅 설정으로 내보낸다.
+    """
+    shutdown_logging()   # fork 로 넘어온 부모 핸들러 (writer 스레드 없음) 제거, 부모 쪽 스트림은 닫지 않음
+    buf = _RecordBuffer()
+    LOG.addHandler(buf); LOG.propagate = False
+    for name, lv in levels.items():
+        logging.getLogger(name).setLevel(lv)
+    if cfg.get("telemetry", {}).get("enabled", False):
+        cfg = copy.deepcopy(cfg)
+        t_root, t_ext = os.path.splitext(str(cfg["telemetry"].get("path", "telemetry.jsonl")))
+        cfg["telemetry"]["path"] = f"{t_root}.p{part}{t_ext}"
+    tables = SimTables(cfg)
+    rng = random.Random(_partition_seed(cfg.get("rng_seed"), part))
+    logger, rejlog, addr, obl, st, sch = _build_sim(cfg, tables=tables, rng=rng, dies=dies)
+    try:
+        populate_bootstrap_obligations(cfg, addr, obl)
+    except Exception as e:
+        LOG_RUN.warning("[BOOTSTRAP] skipped: %s", e)
+    obl.retain_dies(dies)
+    if hasattr(obl, "creation_logger"):
+        obl.creation_logger.rows.clear()   # 생성 로그는 부모 Simulator 가 전체 topology 로 갖고 있음
+    conn.send((obl.pending_sources(), obl.extended))
+
+    done_segs: Dict[Tuple[int,int], List[StateInterval]] = defaultdict(list)
+    while True:
+        msg = conn.recv()
+        if msg[0] == "run":
+            _, t_k, addr.bus_horizon, ext, obl.remote_pending, extended = msg
+            for a0, a1 in ext:
+                addr.bus_resv.add(a0, a1)
+            obl.sync_extended(extended)
+            addr.bus_log = []
+            sch.advance(t_k)
+            rows = []
+            for r in logger.rows:
+                r = dict(r)
+                r["op_uid"] = r["op_uid"] * n_parts + part
+                rows.append(r)
+            logger.rows.clear()
+            rej_rows = rejlog.rows[:]; rejlog.rows.clear()
+            recs = buf.records[:]; buf.records.clear()
+            for key, lst in st.by_plane.items():
+                done = done_segs[key]
+                for seg in lst:
+                    if seg.end_us > sch.now:
+                        break
+                    done.append(seg)
+            st.prune(sch.now)
+            conn.send((addr.bus_log, rows, rej_rows, recs, (obl.pending_sources(), obl.extended)))
+        else:
+            if sch.telemetry is not None:
+                sch.telemetry.emit(sch, final=True); sch.telemetry.close()
+            segs = {(die, plane): done_segs[(die, plane)] + lst for (die, plane), lst in st.by_plane.items() if die in dies}
+            conn.send({"stats": sch.stats(), "segs": segs, "records": buf.records,
+                       "rej_stats": {k: dict(v) for k, v in rejlog.stats.items()},
+                       "rej_attempts": dict(rejlog.stage_attempts), "rej_accepts": dict(rejlog.stage_accepts)})
+            conn.close()
+            return
+
+def _emit_records(records: List[Tuple[str, int, str]]):
+    for name, lv, msg in records:
+        logging.getLogger(name).log(lv, msg)
+
+def run_parallel_dies(cfg: Dict[str, Any], t_end: float, logger: Optional[TimelineLogger] = None,
+                      rejlog: Optional[RejectionLogger] = None, state_timeline: Optional[StateTimeline] = None) -> Dict[str, Any]:
+    """
+    die partition(workers 개, die w, w+workers, ...)을 워커 프로세스에서 실행하고 결과를 병합.
+    근사 실행이다: workers=1 일 때만 직렬 실행과 같은 row 이고, workers>1 이면 의무 heap 과 RNG stream 이
+    partition 별이고 아래 근사가 더해져 op 구성/개수 분포만 비슷하다 (같은 cfg 에서는 결정적).
+    반환 stats 의 "parallel" = {"workers", "window_us", "approximate": workers>1}, print_stats 가 표시한다.
+    - 같은 cfg/refill_mode/bootstrap 체인, partition 0 은 같은 rng_seed
+    - 동기화: window_us 배리어, partition w 는 window k 를 round k+2w 에 실행하고 bus 예약 끝은
+      window k+1 끝(lookahead) 이하로 묶는다. 그래서 같은 round 에 도는 partition 끼리는 bus 예약이 겹칠 수 없고,
+      window k 를 돌 때 앞 partition 들의 window k 까지 bus 예약을 이미 보고 있다 (같은 시각이면 낮은 die 먼저,
+      직렬 실행과 같은 순서). 배리어마다 새 bus 예약, 남은 의무 source(bootstrap 가드), expire_due 연장 누적을 교환
+    - 근사: 뒤 partition 의 아직 돌지 않은 window 예약은 보지 못한다 (window 경계를 넘는 bus 예약끼리만 영향)
+      뒤 partition 의 남은 의무 source 는 최대 2*(workers-1) window 늦게 보인다 (bootstrap 종료 판단이 그만큼 늦음)
+    병합된 timeline row/state timeline/reject 로그는 주어진 logger/state_timeline/rejlog 에 채운다.
+    """
+    import multiprocessing as mp
+    par = cfg.get("parallel", {})
+    window_us = float(par.get("window_us", 50.0))
+    n_dies = _check_parallel_cfg(cfg, window_us)
+    n_parts = int(par.get("workers", 0)) or n_dies
+    n_parts = max(1, min(n_parts, n_dies))
+    tb = TimeBase.from_cfg(cfg)
+    t_end = quantize(t_end)
+    bounds: List[float] = []
+    t = 0.0
+    while t < t_end:
+        t = min(t_end, quantize(t + window_us)); bounds.append(tb.key(t))
+    lookahead = tb.dur(window_us)
+    levels = {lg.name: lg.level for lg in (LOG, LOG_SCHED, LOG_ADDR, LOG_OBL, LOG_STATE, LOG_RUN)}
+
+    procs, conns = [], []
+    for w in range(n_parts):
+        a, b = mp.Pipe()
+        p = mp.Process(target=_partition_worker, args=(b, cfg, w, list(range(w, n_dies, n_parts)), n_parts, levels), daemon=True)
+        p.start(); procs.append(p); conns.append(a)
+    LOG_RUN.info("[PARALLEL] dies=%s workers=%s window_us=%s", n_dies, n_parts, window_us)
+    # partition 별 (남은 의무 source, 연장 누적) 이력: index k = window k 시작 시점 (0 = 시작 상태)
+    hist = [[c.recv()] for c in conns]
+    ext: List[List[Tuple[float,float]]] = [[] for _ in range(n_parts)]   # w 가 아직 못 본 bus 예약
+    rows: List[Dict[str, Any]] = []
+    for r in range(len(bounds) + 2 * (n_parts - 1)):
+        active = [w for w in range(n_parts) if 0 <= r - 2 * w < len(bounds)]
+        for w in active:
+            k = r - 2 * w
+            # window k 시작 시점의 다른 partition 상태 (앞서 간 partition 은 그 시점 이력, 뒤처진 쪽은 최신)
+            others = [hist[e][min(k, len(hist[e]) - 1)] for e in range(n_parts) if e != w]
+            remote = set().union(*(src for src, _ in others))
+            extended = max((x for _, x in others), default=0)
+            conns[w].send(("run", bounds[k], tb.norm(bounds[k] + lookahead), ext[w], remote, extended))
+            ext[w] = []
+        for w in active:
+            bus, new_rows, rej_rows, recs, state = conns[w].recv()
+            hist[w].append(state)
+            for e in range(n_parts):
+                if e != w:
+                    ext[e].extend(bus)
+            rows.extend(new_rows)
+            if rejlog is not None:
+                rejlog.rows.extend(rej_rows)
+            _emit_records(recs)
+    results = []
+    for c in conns:
+        c.send(("finish",))
+    for c in conns:
+        results.append(c.recv())
+    for p in procs:
+        p.join()
+
+    rows.sort(key=lambda r: (r["start_us"], r["die"], r["plane"]))
+    if logger is not None:
+        logger.rows.extend(rows)
+    for res in results:
+        _emit_records(res["records"])
+        if state_timeline is not None:
+            state_timeline.by_plane.update(res["segs"])
+        if rejlog is not None:
+            for stage, d in res["rej_stats"].items():
+                for reason, cnt in d.items():
+                    rejlog.stats[stage][reason] += cnt
+            for stage, cnt in res["rej_attempts"].items():
+                rejlog.stage_attempts[stage] += cnt
+            for stage, cnt in res["rej_accepts"].items():
+                rejlog.stage_accepts[stage] += cnt
+    st = _merge_stats([res["stats"] for res in results])
+    st["parallel"] = {"workers": n_parts, "window_us": window_us, "approximate": n_parts > 1}
+    print_stats(t_end, st)
+    return st
+
+# --------------------------------------------------------------------------
+# CLI
+# main() 의 실행 기본값 (모듈 CFG 위에 덮어씀; --config/--set 이 다시 덮어씀)
+RUN_DEFAULTS: Dict[str, Any] = {
+    "export.log_to_file": True, "export.log_tee": False,
+    "bootstrap.disable_timeline_logging": False, "bootstrap.split_timeline_logging": False,
+    "bootstrap.enabled": True, "policy.enable_phase_conditional": True, "bootstrap.pgm_ratio": 0.2,
+    "topology.dies": 1, "topology.planes": 4, "topology.blocks": 8, "topology.pages_per_block": 100,
+    "policy.run_until_us": 50000.0,
+}
+
+# 파이프라인 stage: simulate 는 항상 실행. viz 는 기본 제외 (--viz 또는 --stages 에 명시)
+PIPELINE_STAGES = ("simulate", "timeline", "state-timeline", "validate", "usage", "reject-log", "patterns", "viz")
+DEFAULT_STAGES = tuple(s for s in PIPELINE_STAGES if s != "viz")
+# timeline DataFrame 이 필요한 stage (하나도 없으면 timeline row 버퍼링 자체를 끔)
+_DF_STAGES = frozenset({"timeline", "validate", "usage", "patterns", "viz"})
+# reject/creation row 또는 state timeline 전체가 필요한 stage (하나도 없으면 export.buffer_history 끔)
+_HISTORY_STAGES = frozenset({"state-timeline", "reject-log"})
+
+def _deep_update(dst: Dict[str, Any], src: Dict[str, Any]) -> Dict[str, Any]:
+    for k, v in src.items():
+        if isinstance(v, dict) and isinstance(dst.get(k), dict):
+            _deep_update(dst[k], v)
+        else:
+            dst[k] = copy.deepcopy(v)
+    return dst
+
+def _parse_cli_value(s: str) -> Any:
+    import ast
+    try:
+        return ast.literal_eval(s)
+    except (ValueError, SyntaxError):
+        return s
+
+def _parse_stages(spec: str) -> Set[str]:
+    names = {x.strip().lower() for x in spec.split(",") if x.strip()}
+    bad = sorted(names - set(PIPELINE_STAGES))
+    if bad:
+        raise ValueError(f"unknown stage(s) {bad}; choose from {list(PIPELINE_STAGES)}")
+    return names | {"simulate"}
+
+def build_arg_parser():
+    import argparse
+    ap = argparse.ArgumentParser(prog="nandsim_demo", description="NAND sequence simulator")
+    ap.add_argument("--config", action="append", default=[], metavar="JSON",
+                    help="cfg JSON 파일 (부분 cfg 가능, 모듈 CFG + RUN_DEFAULTS 위에 deep merge; 반복 지정 시 순서대로)")
+    ap.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                    help="점 표기 cfg override (값은 Python literal 로 해석, 예: topology.dies=2)")
+    ap.add_argument("--no-defaults", action="store_true", help="RUN_DEFAULTS 를 적용하지 않고 모듈 CFG 에서 시작")
+    ap.add_argument("--seed", type=int, help="rng_seed")
+    ap.add_argument("--run-until", type=float, metavar="US", help="policy.run_until_us")
+    ap.add_argument("--stages", default=",".join(DEFAULT_STAGES), metavar="LIST",
+                    help=f"실행할 stage (쉼표 구분): {','.join(PIPELINE_STAGES)}")
+    ap.add_argument("--viz", action="store_true", help="viz stage 추가 (matplotlib 창)")
+    ap.add_argument("--profile", nargs="?", const="", default=None, metavar="PATH",
+                    help="stage 프로파일 활성화 (PATH 를 주면 .json/.csv 로 저장)")
+    ap.add_argument("--telemetry", nargs="?", const="", default=None, metavar="PATH",
+                    help="JSONL 텔레메트리 활성화 (기본 경로: telemetry.path)")
+    ap.add_argument("--parallel", nargs="?", type=int, const=0, default=None, metavar="WORKERS",
+                    help="die 병렬 실행 (parallel.enabled; WORKERS 생략/0 이면 die 수만큼). 근사 모드: WORKERS>1 이면 "
+                         "RNG stream 과 bus/bootstrap 동기화가 partition 별이라 결과가 직렬과 다르다 (분포만 비슷)")
+    ap.add_argument("--log-level", help="logging.level (DEBUG/INFO/WARNING...)")
+    ap.add_argument("--log-file", metavar="PATH", help="로그 파일 경로 (export.log_path)")
+    ap.add_argument("--log-stdout", action="store_true", help="파일 대신 stdout 으로 로그 출력")
+    return ap
+
+def cli_config(args) -> Dict[str, Any]:
+    """CLI 인자 → 실행 cfg (모듈 CFG 사본 ← RUN_DEFAULTS ← --config ← 개별 플래그 ← --set)."""
+    import json
+    cfg = copy.deepcopy(CFG)
+    if not args.no_defaults:
+        for k, v in RUN_DEFAULTS.items():
+            set_cfg_path(cfg, k, v)
+    for path in args.config:
+        with open(path, encoding="utf-8") as f:
+            _deep_update(cfg, json.load(f))
+    if args.seed is not None:
+        cfg["rng_seed"] = args.seed
+    if args.run_until is not None:
+        cfg["policy"]["run_until_us"] = args.run_until
+    if args.profile is not None:
+        cfg["profile"] = dict(cfg.get("profile", {}), enabled=True, path=(args.profile or cfg.get("profile", {}).get("path")))
+    if args.telemetry is not None:
+        tel = dict(cfg.get("telemetry", {}), enabled=True)
+        if args.telemetry:
+            tel["path"] = args.telemetry
+        cfg["telemetry"] = tel
+    if args.parallel is not None:
+        cfg["parallel"] = dict(cfg.get("parallel", {}), enabled=True, workers=args.parallel)
+    if args.log_level:
+        cfg["logging"] = dict(cfg.get("logging", {}), level=args.log_level.upper())
+    if args.log_file:
+        cfg["export"]["log_to_file"] = True; cfg["export"]["log_path"] = args.log_file
+    if args.log_stdout:
+        cfg["export"]["log_to_file"] = False; cfg["export"]["log_tee"] = False
+    for ov in args.overrides:
+        k, sep, v = ov.partition("=")
+        if not sep:
+            raise ValueError(f"--set expects KEY=VALUE: {ov}")
+        set_cfg_path(cfg, k.strip(), _parse_cli_value(v.strip()))
+    return cfg
+
+def main(argv: Optional[List[str]] = None):
+    ap = build_arg_parser()
+    args = ap.parse_args(argv)
+    # 1) 구성: 모듈 CFG 는 건드리지 않고 사본에 실행 설정을 덮어씀
+    try:
+        stages = _parse_stages(args.stages)
+        cfg = cli_config(args)
+    except (ValueError, OSError) as e:
+        ap.error(str(e))
+    if args.viz:
+        stages.add("viz")
+    need_df = bool(stages & _DF_STAGES)
+    if not need_df:
+        # timeline 을 쓰는 stage 가 없으면 row 버퍼링 생략 (stats/reject/state timeline 은 그대로)
+        cfg["export"]["buffer_timeline"] = False
+    if not (stages & _HISTORY_STAGES):
+        cfg["export"]["buffer_history"] = False
+    # 로그 출력: export.log_to_file/log_path/log_tee + cfg["logging"] (레벨/비동기 writer)
+    configure_logging(cfg)
+    LOG_RUN.info("topology: %s", cfg['topology'])
+    LOG_RUN.info("stages: %s", ",".join(s for s in PIPELINE_STAGES if s in stages))
+    # 1.3) Bootstrap obligations 포함 구성은 Simulator 가 담당 (cfg 사본/RNG/테이블 소유)
+    sim = Simulator(cfg)
+    cfg = sim.cfg
+    logger, rejlog, obl, state_timeline, sch = sim.logger, sim.rejlog, sim.obl, sim.state_timeline, sim.sch
+
+    # 2) 실행: bootstrap 전용 여유와 총 러닝타임 분리 계산 (_run_until_total)
+    sim.run()
 
     # 3) DataFrame (timeline)
-    bs_cfg = CFG.get("bootstrap", {})
+    bs_cfg = cfg.get("bootstrap", {})
     split_logging = bool(bs_cfg.get("split_timeline_logging", False))
+    write_timeline = "timeline" in stages
+    df = None
     df_boot = None
     df_pol = None
-    if split_logging and (hasattr(sch, "_timeline_rows_bootstrap") or hasattr(sch, "_timeline_rows_policy")):
+    if not need_df:
+        pass
+    elif split_logging and (hasattr(sch, "_timeline_rows_bootstrap") or hasattr(sch, "_timeline_rows_policy")):
         # 분리 저장
         try:
             import pandas as _pd
@@ -2561,72 +4563,82 @@ def main():
                 return df_
             df_boot = _enrich(df_boot)
             df_pol  = _enrich(df_pol)
-            if not df_boot.empty:
+            if write_timeline and not df_boot.empty:
                 df_boot.to_csv(bs_cfg.get("bootstrap_timeline_path", "nand_timeline_bootstrap.csv"), index=False)
-            if not df_pol.empty:
+            if write_timeline and not df_pol.empty:
                 df_pol.to_csv(bs_cfg.get("policy_timeline_path", "nand_timeline_policy.csv"), index=False)
             # 병합본도 기본 경로로 저장(있을 때)
             df_all = _pd.concat([df_boot, df_pol], ignore_index=True) if ((df_boot is not None and not df_boot.empty) or (df_pol is not None and not df_pol.empty)) else _pd.DataFrame()
             if not df_all.empty:
                 df_all = _enrich(df_all)
             df = df_all
-            df.to_csv("nand_timeline.csv", index=False)
+            if write_timeline:
+                df.to_csv("nand_timeline.csv", index=False)
         except Exception as e:
-            print(f"[TIMELINE] split save failed: {e}")
+            LOG_RUN.warning("[TIMELINE] split save failed: %s", e)
             df = logger.to_dataframe()
-            df.to_csv("nand_timeline.csv", index=False)
+            if write_timeline:
+                df.to_csv("nand_timeline.csv", index=False)
     else:
         df = logger.to_dataframe()
-        df.to_csv("nand_timeline.csv", index=False)
+        if write_timeline:
+            df.to_csv("nand_timeline.csv", index=False)
 
     # 3.5) Export state timeline for Bokeh Gantt
-    try:
-        state_timeline.to_csv("nand_state_timeline.csv")
-        print("[STATE_TIMELINE] saved to nand_state_timeline.csv")
-    except Exception as e:
-        print(f"[STATE_TIMELINE] save skipped: {e}")
+    if "state-timeline" in stages:
+        try:
+            state_timeline.to_csv("nand_state_timeline.csv")
+            LOG_RUN.info("[STATE_TIMELINE] saved to nand_state_timeline.csv")
+        except Exception as e:
+            LOG_RUN.warning("[STATE_TIMELINE] save skipped: %s", e)
+    # viz_tools 리포트는 stdout 으로 직접 출력하므로 순서를 맞추기 위해 먼저 비움
+    flush_logging()
 
 
     # 4) 규칙 자동검증
-    report = validate_timeline(df, CFG)
-    print_validation_report(report, max_rows=30)
-    viol_df = violations_to_dataframe(report)
-    viol_df.to_csv("nand_violations.csv", index=False)
+    if "validate" in stages:
+        report = validate_timeline(df, cfg)
+        print_validation_report(report, max_rows=30)
+        viol_df = violations_to_dataframe(report)
+        viol_df.to_csv("nand_violations.csv", index=False)
 
     # 4.2) Target address usage stats (PROGRAM/READ 중심)
-    try:
-        stats = compute_block_usage_stats(df, kinds=("PROGRAM","READ"))
-        save_block_usage_stats(stats, prefix="block_usage")
-        print_block_usage_summary(stats, max_rows=50)
-    except Exception as e:
-        print(f"[BLOCK_USAGE] skipped: {e}")
+    if "usage" in stages:
+        try:
+            stats = compute_block_usage_stats(df, kinds=("PROGRAM","READ"))
+            save_block_usage_stats(stats, prefix="block_usage")
+            print_block_usage_summary(stats, max_rows=50)
+        except Exception as e:
+            LOG_RUN.warning("[BLOCK_USAGE] skipped: %s", e)
 
-    # 4.5) Rejection log
-    try:
-        rejlog.to_csv("reject_log.csv")
-        rejlog.to_obligation_skips_csv("obligation_skips.csv")
-        print("\n=== Rejection Summary (by stage/reason) ===")
-        for stage, d in rejlog.stats.items():
-            total = sum(d.values())
-            acc   = rejlog.stage_accepts.get(stage, 0)
-            att   = rejlog.stage_attempts.get(stage, 0)
-            print(f"- {stage:18s}: attempts={att} accepts={acc} rejects={total}")
-            for reason, cnt in sorted(d.items(), key=lambda x: -x[1])[:8]:
-                print(f"    {reason:14s}: {cnt}")
-    except Exception as e:
-        print(f"[REJLOG] skipped: {e}")
+    # 4.5) Rejection log (+ obligation skip/creation CSV)
+    if "reject-log" in stages:
+        try:
+            rejlog.to_csv("reject_log.csv")
+            rejlog.to_obligation_skips_csv("obligation_skips.csv")
+            out = ["\n=== Rejection Summary (by stage/reason) ==="]
+            for stage, d in rejlog.stats.items():
+                total = sum(d.values())
+                acc   = rejlog.stage_accepts.get(stage, 0)
+                att   = rejlog.stage_attempts.get(stage, 0)
+                out.append(f"- {stage:18s}: attempts={att} accepts={acc} rejects={total}")
+                for reason, cnt in sorted(d.items(), key=lambda x: -x[1])[:8]:
+                    out.append(f"    {reason:14s}: {cnt}")
+            LOG_RUN.info("%s", "\n".join(out))
+        except Exception as e:
+            LOG_RUN.warning("[REJLOG] skipped: %s", e)
 
-    # 4.6) Obligation creations CSV (if available)
-    try:
-        if hasattr(obl, "creation_logger"):
-            obl.creation_logger.to_csv("obligation_creations.csv")
-    except Exception as e:
-        print(f"[CREATIONS] skipped: {e}")
+        # 4.6) Obligation creations CSV (if available)
+        try:
+            if hasattr(obl, "creation_logger"):
+                obl.creation_logger.to_csv("obligation_creations.csv")
+        except Exception as e:
+            LOG_RUN.warning("[CREATIONS] skipped: %s", e)
 
-    # 4.7) 성능 프로파일 저장 제거됨
+    # 4.7) 성능 프로파일: --profile (Simulator.run 이 profile.path 에 저장)
 
     # 5) 시각화
-    if enable_visualization:
+    if "viz" in stages:
         if split_logging and (df_boot is not None or df_pol is not None):
             if df_boot is not None and not df_boot.empty:
                 plot_gantt_by_die(df_boot, title="Bootstrap Timeline")
@@ -2638,7 +4650,7 @@ def main():
                                         title="Target heatmap (bootstrap)",
                                         save_path="figs/heatmap_bootstrap.png")
                 except Exception as e:
-                    print(f"[HEATMAP] bootstrap skipped: {e}")
+                    LOG_RUN.warning("[HEATMAP] bootstrap skipped: %s", e)
             if df_pol is not None and not df_pol.empty:
                 plot_gantt_by_die(df_pol, title="Policy Timeline")
                 plot_block_page_sequence_3d_by_die(df_pol, kinds=("ERASE","PROGRAM","READ"),
@@ -2648,7 +4660,7 @@ def main():
                                         title="Target heatmap (policy)",
                                         save_path="figs/heatmap_policy.png")
                 except Exception as e:
-                    print(f"[HEATMAP] policy skipped: {e}")
+                    LOG_RUN.warning("[HEATMAP] policy skipped: %s", e)
         else:
             plot_gantt_by_die(df)  # 모든 die별로 개별 그림
             plot_block_page_sequence_3d_by_die(df, kinds=("ERASE","PROGRAM","READ"),
@@ -2658,17 +4670,19 @@ def main():
                                     title="Target heatmap (all)",
                                     save_path="figs/heatmap_all.png")
             except Exception as e:
-                print(f"[HEATMAP] all skipped: {e}")
+                LOG_RUN.warning("[HEATMAP] all skipped: %s", e)
     else:
-        print("[VIZ] disabled")
+        LOG_RUN.info("[VIZ] disabled")
 
     # (선택) 미리보기
-    # df_preview = pattern_preview_dataframe(df, CFG)
+    # df_preview = pattern_preview_dataframe(df, cfg)
     # print(df_preview.head())
 
     # CSV 내보내기
-    paths = export_patterns(df, CFG)
-    print("written:", paths)
+    if "patterns" in stages:
+        paths = export_patterns(df, cfg)
+        LOG_RUN.info("written: %s", paths)
+    shutdown_logging()
 
 if __name__=="__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+nandsim 파라미터 스윕 러너.
+
+- run 별 cfg override 를 점 표기 키로 지정 (예: "rng_seed", "topology.dies",
+  "phase_conditional.READ.CORE_BUSY.MUL_READ"). 해석은 nandsim_demo.set_cfg_path
+  (점이 들어간 cfg 키는 가장 긴 키 우선 매칭).
+- grid(키 -> 값 리스트의 곱집합) 또는 override dict 리스트를 받아 ProcessPoolExecutor 로 팬아웃,
+  끝나는 순서대로 run 별 요약 지표를 CSV 한 파일에 스트리밍 기록한다.
+- out_dir 를 주면 run 별 디렉터리(run_0000/...)에 run.log, timeline, violations, reject 로그, 패턴을 저장.
+
+사용 예:
+    python nandsim_sweep.py --grid rng_seed=1,2,3 --grid topology.dies=1,2 --workers 4 --out sweep_out
+"""
+from __future__ import annotations
+import argparse, ast, copy, csv, itertools, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional
+
+import nandsim_demo as nd
+from viz_tools import validate_timeline, violations_to_dataframe, export_patterns
+
+METRIC_FIELDS = [
+    "run_id", "status", "error", "wall_s", "t_end",
+    "events", "propose_calls", "scheduled", "accept_ratio",
+    "obl_created", "obl_fulfilled", "obl_in_time", "obl_expired", "obl_success",
+    "rejects", "rejects_by_stage", "violations", "violations_by_kind", "timeline_rows",
+]
+
+# --------------------------------------------------------------------------
+# Overrides
+def apply_overrides(cfg: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    out = copy.deepcopy(cfg)
+    for k, v in overrides.items():
+        nd.set_cfg_path(out, k, v)
+    return out
+
+def expand_grid(grid: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    keys = list(grid.keys())
+    return [dict(zip(keys, vals)) for vals in itertools.product(*(list(grid[k]) for k in keys))]
+
+def _parse_value(s: str) -> Any:
+    try:
+        return ast.literal_eval(s)
+    except (ValueError, SyntaxError):
+        return s
+
+# --------------------------------------------------------------------------
+# Worker
+def run_one(run_id: int, base_cfg: Dict[str, Any], overrides: Dict[str, Any],
+            out_dir: Optional[str] = None) -> Dict[str, Any]:
+    """override 적용 후 simulate 1회 실행 → 요약 지표 dict. 예외는 status=error 로 기록."""
+    row: Dict[str, Any] = {"run_id": run_id, "status": "ok", "error": ""}
+    row.update(overrides)
+    run_dir = os.path.join(out_dir, f"run_{run_id:04d}") if out_dir else None
+    stdout = sys.stdout
+    log = None
+    t0 = time.perf_counter()
+    try:
+        cfg = apply_overrides(base_cfg, overrides)
+        if run_dir:
+            os.makedirs(run_dir, exist_ok=True)
+            cfg.setdefault("pattern_export", {})["output_dir"] = os.path.join(run_dir, "out_patterns")
+            log = open(os.path.join(run_dir, "run.log"), "w", encoding="utf-8", newline="")
+            with open(os.path.join(run_dir, "overrides.json"), "w", encoding="utf-8") as f:
+                json.dump(overrides, f, indent=2, default=str)
+        else:
+            log = open(os.devnull, "w")
+        sys.stdout = log
+        nd.configure_logging(cfg, stream=log)
+        res = nd.simulate(cfg)
+        df = res.to_dataframe()
+        report = validate_timeline(df, res.cfg)
+        st = res.stats; ob = st["obligations"]
+        rej_by_stage = {stage: sum(d.values()) for stage, d in res.rejlog.stats.items()}
+        row.update({
+            "t_end": res.t_end,
+            "events": st["events"], "propose_calls": st["propose_calls"], "scheduled": st["scheduled"],
+            "accept_ratio": round(st["scheduled"] / st["propose_calls"], 4) if st["propose_calls"] else 0.0,
+            "obl_created": ob["created"], "obl_fulfilled": ob["fulfilled"],
+            "obl_in_time": ob["fulfilled_in_time"], "obl_expired": ob["expired"],
+            "obl_success": round(ob["fulfilled_in_time"] / ob["created"], 4) if ob["created"] else 0.0,
+            "rejects": sum(rej_by_stage.values()), "rejects_by_stage": json.dumps(rej_by_stage, sort_keys=True),
+            "violations": len(report.get("issues", [])),
+            "violations_by_kind": json.dumps(report.get("counts", {}), sort_keys=True),
+            "timeline_rows": len(df),
+        })
+        if run_dir:
+            df.to_csv(os.path.join(run_dir, "nand_timeline.csv"), index=False)
+            violations_to_dataframe(report).to_csv(os.path.join(run_dir, "nand_violations.csv"), index=False)
+            res.rejlog.to_csv(os.path.join(run_dir, "reject_log.csv"))
+            res.state_timeline.to_csv(os.path.join(run_dir, "nand_state_timeline.csv"))
+            export_patterns(df, res.cfg)
+    except Exception as e:
+        row["status"] = "error"; row["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        nd.shutdown_logging()
+        sys.stdout = stdout
+        if log is not None:
+            log.close()
+    row["wall_s"] = round(time.perf_counter() - t0, 3)
+    return row
+
+# --------------------------------------------------------------------------
+# Sweep
+def sweep(runs: List[Dict[str, Any]], base_cfg: Optional[Dict[str, Any]] = None, workers: Optional[int] = None,
+          csv_path: str = "sweep.csv", out_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    runs(override dict 리스트)를 프로세스 풀로 실행. 끝나는 순서대로 csv_path 에 한 줄씩 기록(flush)하고
+    run_id 순으로 정렬한 결과 리스트를 반환.
+    """
+    base = copy.deepcopy(base_cfg if base_cfg is not None else nd.CFG)
+    keys: List[str] = []
+    for ov in runs:
+        for k in ov:
+            if k not in keys:
+                keys.append(k)
+    fields = ["run_id"] + keys + [f for f in METRIC_FIELDS if f != "run_id"]
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    workers = workers or min(len(runs), os.cpu_count() or 1) or 1
+    rows: List[Dict[str, Any]] = []
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        w.writeheader(); f.flush()
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futs = [ex.submit(run_one, i, base, ov, out_dir) for i, ov in enumerate(runs)]
+            for fut in as_completed(futs):
+                row = fut.result()
+                w.writerow(row); f.flush()
+                rows.append(row)
+                print(f"[SWEEP] run {row['run_id']:4d} {row['status']:5s} wall={row['wall_s']:.2f}s "
+                      f"scheduled={row.get('scheduled')} violations={row.get('violations')} {row['error']}")
+    rows.sort(key=lambda r: r["run_id"])
+    return rows
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="nandsim parameter sweep")
+    ap.add_argument("--grid", action="append", default=[], metavar="KEY=V1,V2,...",
+                    help="grid 축 (반복 지정 시 곱집합). 값은 Python literal 로 해석")
+    ap.add_argument("--runs", help="override dict 리스트 JSON 파일 (grid 와 함께 쓰면 각 run 에 grid 를 곱함)")
+    ap.add_argument("--base", help="base cfg JSON 파일 (기본: nandsim_demo.CFG)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--csv", default="sweep.csv")
+    ap.add_argument("--out", default=None, help="run 별 산출물 디렉터리 루트")
+    args = ap.parse_args(argv)
+
+    grid: Dict[str, List[Any]] = {}
+    for g in args.grid:
+        k, _, vals = g.partition("=")
+        grid[k.strip()] = [_parse_value(v.strip()) for v in vals.split(",")]
+    runs: List[Dict[str, Any]] = [{}]
+    if args.runs:
+        with open(args.runs, encoding="utf-8") as f:
+            runs = json.load(f)
+    if grid:
+        runs = [dict(r, **g) for r in runs for g in expand_grid(grid)]
+    base = None
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            base = json.load(f)
+    sweep(runs, base_cfg=base, workers=args.workers, csv_path=args.csv, out_dir=args.out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""공용 테스트 헬퍼: 작은 topology cfg + 조용한 로깅."""
+import copy
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+import nandsim_demo as nd
+
+
+def small_cfg(dies: int = 1, planes: int = 4, blocks: int = 32, pages_per_block: int = 16,
+              run_until_us: float = 3000.0, seed: int = 7) -> Dict[str, Any]:
+    cfg = copy.deepcopy(nd.CFG)
+    cfg["rng_seed"] = seed
+    cfg["topology"].update(dies=dies, planes=planes, blocks=blocks, pages_per_block=pages_per_block)
+    cfg["policy"]["run_until_us"] = float(run_until_us)
+    cfg["bootstrap"]["enabled"] = False
+    cfg["logging"]["level"] = "WARNING"
+    return cfg
+
+
+def run_rows(cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return nd.simulate(cfg).rows
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging():
+    with open(os.devnull, "w") as sink:
+        nd.configure_logging({"logging": {"level": "WARNING", "async": False}}, stream=sink)
+        yield
+        nd.shutdown_logging()
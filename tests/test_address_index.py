@@ -0,0 +1,92 @@
+"""AddressManager fut_blocks/non_erased 인덱스: PROGRAM/ERASE 대상 선택을 stripe 전체 스캔과 비교."""
+import random
+
+import pytest
+
+import nandsim_demo as nd
+from conftest import small_cfg
+
+
+def _stripe(am, plane):
+    return list(range(plane, am.blocks, am.planes))
+
+
+def _cyclic(blocks, start_block):
+    if start_block in blocks:
+        i = blocks.index(start_block)
+        return blocks[i:] + blocks[:i]
+    return blocks
+
+
+def _scan_next_page(am, die, plane, target_page, start_block=None):
+    ppb = am.pages_per_block
+    for b in _cyclic(_stripe(am, plane), start_block):
+        fut = int(am.addr_state_future[die, b])
+        if (fut + 1 if fut < ppb - 1 else ppb) == target_page:
+            return b
+    return None
+
+
+def _scan_future(am, die, plane, pred, start_block=None):
+    for b in _cyclic(_stripe(am, plane), start_block):
+        if pred(int(am.addr_state_future[die, b])):
+            return b
+    return None
+
+
+def _bucket(count, total):
+    r = count / total
+    return "low" if r < 0.34 else ("mid" if r < 0.67 else "high")
+
+
+def _op(am, kind, die, block, page):
+    addr = nd.Address(die, block % am.planes, block, page)
+    return nd.Operation(name=kind.name, base=kind, targets=[addr], states=[])
+
+
+def _check_against_scan(am, rng):
+    for die in range(am.dies):
+        for plane in range(am.planes):
+            stripe = _stripe(am, plane)
+            fut = [int(am.addr_state_future[die, b]) for b in stripe]
+            grouped = {}
+            for b, f in zip(stripe, fut):
+                grouped.setdefault(f, []).append(b)
+            assert am.fut_blocks[die][plane] == grouped
+            assert am.non_erased[die][plane] == [b for b, f in zip(stripe, fut) if f >= 0]
+            pgmable = sum(f < am.pages_per_block - 1 for f in fut)
+            assert am.observe_states(die, plane, 0.0)[0]["pgmable_ratio"] == _bucket(pgmable, len(stripe))
+            starts = [None, rng.choice(stripe), (plane + 1) % am.planes]
+            for start in starts:
+                for page in range(-1, am.pages_per_block + 2):
+                    assert am._find_block_for_page_future_on_plane(die, plane, page, start_block=start) \
+                        == _scan_next_page(am, die, plane, page, start)
+                assert am._first_from(am.non_erased[die][plane], plane, start) \
+                    == _scan_future(am, die, plane, lambda f: f >= 0, start)
+            assert am._first_erased_block_on_plane(die, plane) == _scan_future(am, die, plane, lambda f: f == -1)
+
+
+@pytest.mark.parametrize("init_state", [-1, -2])
+@pytest.mark.parametrize("seed", range(3))
+def test_program_erase_targets_match_full_scan(seed, init_state):
+    cfg = small_cfg(dies=2, planes=4, blocks=32, pages_per_block=6)
+    cfg["address_init_state"] = init_state
+    am = nd.AddressManager(cfg)
+    kinds = am.kinds
+    rng = random.Random(seed)
+    _check_against_scan(am, rng)
+    t = 0.0
+    for _ in range(400):
+        die = rng.randrange(am.dies); block = rng.randrange(am.blocks)
+        fut = int(am.addr_state_future[die, block])
+        if rng.random() < 0.2 or fut < -1:
+            op = _op(am, kinds.ERASE, die, block, 0)
+        elif fut < am.pages_per_block - 1:
+            op = _op(am, kinds.PROGRAM, die, block, fut + 1)
+        else:
+            continue
+        am.register_future(op, t, t + 1.0)
+        if rng.random() < 0.5:
+            am.commit(op)
+        t += 1.0
+        _check_against_scan(am, rng)
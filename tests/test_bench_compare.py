@@ -0,0 +1,47 @@
+"""nandsim_bench.compare 회귀 게이트."""
+import nandsim_bench as nb
+
+
+def _result(name, eps=1000.0, **kw):
+    r = {"name": name, "status": "ok", "rng_seed": None, "events_per_s": eps, "sim_us_per_wall_s": eps,
+         "peak_rss_mb": 50.0, "avg_propose_us": 10.0}
+    r.update(kw)
+    return r
+
+
+def test_missing_scenario_is_a_regression():
+    base = {"results": [_result("a"), _result("b")]}
+    cur = {"results": [_result("a")]}
+    items = nb.compare(base, cur)
+    missing = [it for it in items if it["name"] == "b"]
+    assert len(missing) == 1 and missing[0]["regression"] and missing[0]["cur"] == "missing"
+
+
+def test_missing_scenario_outside_only_filter_is_ignored():
+    base = {"results": [_result("topo.dies=1"), _result("mix.read_heavy")]}
+    cur = {"results": [_result("topo.dies=1")]}
+    assert not any(it["regression"] for it in nb.compare(base, cur, only=["topo.*"]))
+    assert any(it["regression"] for it in nb.compare(base, cur, only=["*"]))
+
+
+def test_throughput_drop_is_a_regression():
+    base = {"results": [_result("a", eps=1000.0)]}
+    cur = {"results": [_result("a", eps=500.0)]}
+    assert any(it["regression"] and it["metric"] == "events_per_s" for it in nb.compare(base, cur))
+
+
+def test_seed_mismatch_is_its_own_error():
+    base = {"results": [_result("a", rng_seed=1, timeline_sha256="x" * 64)]}
+    cur = {"results": [_result("a", rng_seed=2, timeline_sha256="y" * 64)]}
+    items = [it for it in nb.compare(base, cur) if it["regression"]]
+    assert [it["metric"] for it in items] == ["rng_seed"]
+
+
+def test_timeline_compared_only_for_same_scenario_cfg():
+    base = {"results": [_result("a", rng_seed=1, cfg_sha256="c1", timeline_sha256="x" * 64)]}
+    changed = {"results": [_result("a", rng_seed=1, cfg_sha256="c2", timeline_sha256="y" * 64)]}
+    items = nb.compare(base, changed)
+    assert not any(it["regression"] for it in items)
+    assert [it["metric"] for it in items if "change" not in it] == ["cfg_sha256"]
+    same_cfg = {"results": [_result("a", rng_seed=1, cfg_sha256="c1", timeline_sha256="y" * 64)]}
+    assert any(it["regression"] and it["metric"] == "timeline_sha256" for it in nb.compare(base, same_cfg))
@@ -0,0 +1,57 @@
+"""CompiledCfg: 컴포넌트가 cfg dict 대신 OpSpecC 를 읽는지, 컴파일 결과가 cfg 와 분리된 불변 구조인지."""
+import copy
+import pickle
+
+import pytest
+
+import nandsim_demo as nd
+from conftest import small_cfg
+
+
+def test_components_share_compiled_cfg():
+    sim = nd.Simulator(small_cfg())
+    assert sim.obl.cc is sim.sch.cc is sim.addr.cc is sim.sch.SPE.cc
+
+
+def test_dout_duration_from_opspec():
+    sim = nd.Simulator(small_cfg())
+    assert sim.obl.cc.ops["DOUT"].nominal_us == pytest.approx(nd.get_nominal_duration(sim.cfg, "DOUT"))
+
+
+def test_fork_override_recompiles_for_obligations():
+    sim = nd.Simulator(small_cfg())
+    new = sim.fork({"op_specs.DOUT.states.0.dist.value": 7.0})
+    assert new.obl.cc is new.sch.cc
+    assert new.obl.cc.ops["DOUT"].nominal_us != sim.obl.cc.ops["DOUT"].nominal_us
+
+
+def test_compiled_cfg_is_detached_from_cfg():
+    cfg = small_cfg()
+    cc = nd.compile_cfg(cfg)
+    nominal = cc.ops["SIN_READ"].nominal_us
+    cfg["op_specs"]["SIN_READ"]["states"][0]["dist"]["value"] = 999.0
+    cfg["op_specs"]["SIN_READ"]["ignore"] = ["precheck"]
+    cfg["state_timeline"]["affects"]["READ"] = False
+    assert cc.ops["SIN_READ"].nominal_us == nominal and not cc.ops["SIN_READ"].ignore
+    assert cc.timeline_affects.get("READ", True) is not False
+    with pytest.raises(TypeError):
+        cc.ops["X"] = cc.ops["SIN_READ"]
+    assert cc.ops["MUL_READ"].arity_min == 2 and cc.ops["MUL_READ"].arity_max is None
+    assert cc.ops["SIN_READ"].arity_min == cc.ops["SIN_READ"].arity_max == 1
+    for other in (copy.deepcopy(cc), pickle.loads(pickle.dumps(cc))):
+        assert other == cc and type(other.ops) is type(cc.ops)
+
+
+@pytest.mark.parametrize("path,value", [
+    ("op_specs.SIN_READ.fanout", ("eq", 0)),
+    ("op_specs.SIN_READ.fanout", ("eq", 8)),           # planes=4 보다 큼
+    ("op_specs.MUL_READ.fanout", ("ge", 1.5)),
+    ("op_specs.MUL_READ.fanout", ("any", 2)),
+    ("op_specs.DOUT.fanout", ("ge", 2)),               # scope NONE 은 단일 plane 만
+    ("op_specs.SR.states.0.dist.value", -1.0),
+])
+def test_bad_op_spec_rejected(path, value):
+    cfg = small_cfg()
+    nd.set_cfg_path(cfg, path, value)
+    with pytest.raises(ValueError):
+        nd.compile_cfg(cfg, nd.SimTables(cfg))
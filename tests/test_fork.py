@@ -0,0 +1,73 @@
+"""Simulator.fork: 분기 독립성, 구조 공유, 분기별 telemetry."""
+import json
+
+import pytest
+
+import nandsim_demo as nd
+from conftest import small_cfg
+
+
+def _mid_sim(**kw):
+    cfg = small_cfg(dies=2, blocks=64, pages_per_block=32, run_until_us=8000.0, **kw)
+    sim = nd.Simulator(cfg)
+    sim.sch.run_until(3000.0)
+    return sim
+
+
+@pytest.mark.parametrize("pick", ["set_order", "lowest"])
+def test_fork_continues_like_parent(pick):
+    cfg = small_cfg(dies=2, blocks=64, pages_per_block=32, run_until_us=8000.0)
+    cfg["addressing"]["read"]["block_pick"] = pick
+    sim = nd.Simulator(cfg)
+    sim.sch.run_until(3000.0)
+    n = len(sim.logger.rows)
+    new = sim.fork()
+    sim.sch.run_until(8000.0); new.sch.run_until(8000.0)
+    assert len(sim.logger.rows) > n
+    assert new.logger.rows == sim.logger.rows
+
+
+def test_fork_does_not_disturb_parent():
+    ref = _mid_sim(); ref.sch.run_until(8000.0)
+    sim = _mid_sim()
+    other = sim.fork(seed=123)
+    other.sch.run_until(8000.0)
+    sim.sch.run_until(8000.0)
+    assert sim.logger.rows == ref.logger.rows
+
+
+def test_fork_shares_immutable_and_copies_mutable_state():
+    sim = _mid_sim()
+    new = sim.fork()
+    assert new.tables is sim.tables and new.sch.cc is sim.sch.cc
+    assert all(a is b for a, b in zip(new.logger.rows, sim.logger.rows))
+    for key, lst in sim.state_timeline.by_plane.items():
+        for a, b in zip(lst, new.state_timeline.by_plane[key]):
+            assert (a is b) == (a.end_us != float("inf"))
+    before = int(sim.addr.addr_state_future[0, 0])
+    assert not sim.addr.programmed_future.contains(1, 63, 31)
+    new.addr.addr_state_future[0, 0] = before + 1
+    new.addr.programmed_future.add(1, 63, 31)
+    new.addr.resv[(0, 0)].add(1e9, 1e9 + 1)
+    assert int(sim.addr.addr_state_future[0, 0]) == before
+    assert new.addr.programmed_future.contains(1, 63, 31)
+    assert not sim.addr.programmed_future.contains(1, 63, 31)
+    assert len(sim.addr.resv[(0, 0)]) == len(new.addr.resv[(0, 0)]) - 1
+
+
+def test_fork_writes_telemetry_to_its_own_file(tmp_path):
+    cfg = small_cfg(run_until_us=4000.0)
+    path = tmp_path / "tel.jsonl"
+    cfg["telemetry"].update(enabled=True, path=str(path), wall_interval_s=0.0, sim_interval_us=500.0)
+    sim = nd.Simulator(cfg)
+    sim.sch.run_until(2000.0)
+    a = sim.fork(); b = sim.fork(telemetry_path=str(tmp_path / "b.jsonl"))
+    assert a.sch.telemetry.path == str(tmp_path / "tel.fork1.jsonl")
+    for s in (sim, a, b):
+        s.sch.run_until(4000.0)
+        s.sch.telemetry.close()
+    parent = [json.loads(l)["sim_us"] for l in path.read_text().splitlines()]
+    branch = [json.loads(l)["sim_us"] for l in (tmp_path / "tel.fork1.jsonl").read_text().splitlines()]
+    assert parent == sorted(parent)                      # 분기 record 가 섞이지 않음
+    assert branch and min(branch) >= 2000.0
+    assert (tmp_path / "b.jsonl").exists()
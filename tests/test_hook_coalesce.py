@@ -0,0 +1,38 @@
+"""policy.hook_coalesce: drop_idle 는 op 출력 불변, 병합 slot 은 plane 별."""
+import pytest
+
+import nandsim_demo as nd
+from conftest import small_cfg
+
+
+def _cfg(enabled: bool, dies: int, bootstrap: bool):
+    cfg = small_cfg(dies=dies, run_until_us=6000.0)
+    cfg["bootstrap"]["enabled"] = bootstrap
+    cfg["policy"]["hook_coalesce"]["enabled"] = enabled
+    return cfg
+
+
+@pytest.mark.parametrize("dies,bootstrap", [(1, False), (2, False), (2, True)])
+def test_drop_idle_schedules_same_ops(dies, bootstrap):
+    ref = nd.Simulator(_cfg(False, dies, bootstrap)).run()
+    got = nd.Simulator(_cfg(True, dies, bootstrap)).run()
+    assert got.rows == ref.rows
+    assert got.stats["scheduled"] == ref.stats["scheduled"]
+    hooks = got.stats["hooks"]
+    assert hooks["coalesced"] == 0 and hooks["dropped_budget"] == 0
+    if bootstrap:
+        assert hooks["dropped_idle"] > 0
+        assert got.stats["propose_calls"] == ref.stats["propose_calls"] - hooks["dropped_idle"]
+
+
+def test_bucket_slot_is_per_plane():
+    cfg = _cfg(True, 1, False)
+    cfg["policy"]["hook_coalesce"]["bucket_us"] = 1.0
+    sch = nd.Simulator(cfg).sch
+    sch._push_hook(100.2, nd.PhaseHook(100.0, "SIN_READ.CORE_BUSY.END", 0, 0))
+    sch._push_hook(100.3, nd.PhaseHook(100.0, "SIN_READ.CORE_BUSY.END", 0, 1))
+    sch._push_hook(100.4, nd.PhaseHook(100.5, "SIN_READ.CORE_BUSY.END", 0, 1))
+    assert sch.stat_hooks["pushed"] == 2 and sch.stat_hooks["coalesced"] == 1
+    assert sch._hook_die_n[0] == 2
+    sch.run_until(200.0)
+    assert not sch._hook_slots and sch._hook_die_n[0] == 0
@@ -0,0 +1,95 @@
+"""IntervalIndex: bisect 겹침 질의/retire 를 기존 선형 스캔과 비교."""
+import random
+from collections import Counter
+
+import pytest
+
+import nandsim_demo as nd
+from conftest import run_rows, small_cfg
+
+
+def _linear_first(intervals, a0, a1):
+    # 기존 AddressManager 스캔: not (a1<=s or e<=a0)
+    return any(not (a1 <= s or e <= a0) for (s, e) in intervals)
+
+
+def _linear_max_end(intervals, a0, a1):
+    ends = [e for (s, e) in intervals if s < a1 and a0 < e]
+    return max(ends) if ends else None
+
+
+def _random_intervals(rng, n, ticks):
+    out = []
+    for _ in range(n):
+        s = rng.randrange(0, 10_000) if ticks else round(rng.uniform(0.0, 100.0), 2)
+        ln = rng.randrange(1, 500) if ticks else round(rng.uniform(0.01, 5.0), 2)
+        out.append((s, s + ln))
+    return out
+
+
+@pytest.mark.parametrize("ticks", [True, False])
+@pytest.mark.parametrize("seed", range(5))
+def test_overlap_queries_match_linear_scan(seed, ticks):
+    rng = random.Random(seed)
+    intervals = _random_intervals(rng, 300, ticks)
+    idx = nd.IntervalIndex()
+    for s, e in intervals:
+        idx.add(s, e)
+    assert idx.starts == sorted(idx.starts)
+    assert sorted(idx) == sorted(intervals)
+    for _ in range(500):
+        a0 = rng.randrange(-100, 11_000) if ticks else round(rng.uniform(-1.0, 110.0), 2)
+        a1 = a0 + (rng.randrange(0, 50) if ticks else round(rng.uniform(0.0, 1.0), 2))
+        assert (idx.first_overlap(a0, a1) is not None) == _linear_first(intervals, a0, a1)
+        assert idx.max_end_overlapping(a0, a1) == _linear_max_end(intervals, a0, a1)
+
+
+@pytest.mark.parametrize("ticks", [True, False])
+@pytest.mark.parametrize("seed", range(5))
+def test_retire_keeps_queries_at_or_after_watermark(seed, ticks):
+    rng = random.Random(100 + seed)
+    intervals = _random_intervals(rng, 300, ticks)
+    idx = nd.IntervalIndex()
+    for s, e in intervals:
+        idx.add(s, e)
+    watermark = 0
+    for _ in range(20):
+        watermark += rng.randrange(0, 600) if ticks else round(rng.uniform(0.0, 6.0), 2)
+        before = len(idx)
+        dropped = idx.retire(watermark)
+        assert len(idx) == before - dropped
+        retired = Counter(intervals) - Counter(idx)
+        assert all(e <= watermark for (s, e) in retired.elements())
+        for _ in range(50):
+            a0 = watermark + (rng.randrange(0, 2000) if ticks else round(rng.uniform(0.0, 20.0), 2))
+            a1 = a0 + (rng.randrange(0, 50) if ticks else round(rng.uniform(0.0, 1.0), 2))
+            assert (idx.first_overlap(a0, a1) is not None) == _linear_first(intervals, a0, a1)
+            assert idx.max_end_overlapping(a0, a1) == _linear_max_end(intervals, a0, a1)
+    assert idx.retired == len(intervals) - len(idx)
+
+
+def test_retire_drops_only_finished_intervals():
+    idx = nd.IntervalIndex()
+    for s, e in [(0, 10), (5, 8), (20, 30), (25, 26)]:
+        idx.add(s, e)
+    assert idx.retire(15) == 2
+    assert list(idx) == [(20, 30), (25, 26)]
+    assert idx.retire(15) == 0
+
+
+def test_address_manager_retire_does_not_change_schedule(monkeypatch):
+    cfg = small_cfg(dies=2, run_until_us=4000.0)
+    retired = run_rows(cfg)
+    monkeypatch.setattr(nd.AddressManager, "retire", lambda self, now_us: None)
+    assert run_rows(cfg) == retired
+
+
+def test_retire_shrinks_max_len_after_long_interval_ends():
+    idx = nd.IntervalIndex()
+    idx.add(0, 1000)                       # ERASE/suspend 같은 긴 창 하나
+    for s in range(10, 2000, 10):
+        idx.add(s, s + 2)
+    assert idx.max_len == 1000
+    idx.retire(1500)
+    assert idx.max_len == 2
+    assert idx._span(1600, 1601)[1] - idx._span(1600, 1601)[0] == 1
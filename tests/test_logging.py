@@ -0,0 +1,34 @@
+"""로깅 기본값과 hot path DEBUG 가드."""
+import os
+
+import nandsim_demo as nd
+from conftest import small_cfg
+
+
+def test_default_level_is_info():
+    assert nd.CFG["logging"]["level"] == "INFO"
+    with open(os.devnull, "w") as sink:
+        nd.configure_logging({"logging": {"async": False}}, stream=sink)
+        assert nd.LOG.getEffectiveLevel() == nd.logging.INFO
+        assert not nd.LOG_ADDR.isEnabledFor(nd.DEBUG)
+        nd.shutdown_logging()
+
+
+def _precheck_us_calls(level):
+    with open(os.devnull, "w") as sink:
+        nd.configure_logging({"logging": {"level": level, "async": False}}, stream=sink)
+        am = nd.AddressManager(small_cfg())
+        am.resv[(0, 0)].add(am.tb.key(0.0), am.tb.key(10.0))
+        calls = []
+        us = am.tb.us
+        am.tb.us = lambda v: calls.append(v) or us(v)
+        addr = nd.Address(0, 0, 0, 0)
+        assert not am.precheck_planescope(am.kinds.READ, [addr], 5.0, nd.Scope.PLANE_SET)
+        nd.shutdown_logging()
+        return len(calls)
+
+
+def test_precheck_debug_arguments_skipped_unless_debug():
+    # 저장값 그대로 비교하므로 µs 변환 없음, DEBUG 일 때만 start_hint 와 겹친 구간 (s, e) 변환
+    assert _precheck_us_calls("INFO") == 0
+    assert _precheck_us_calls("DEBUG") == 3
@@ -0,0 +1,17 @@
+"""memory_report: cfg 그래프(op_specs spec dict 포함)는 어느 subsystem 에도 계상되지 않아야 한다."""
+import nandsim_demo as nd
+from conftest import small_cfg
+
+
+def _report(pad: int):
+    cfg = small_cfg(run_until_us=500.0)
+    cfg["op_specs"]["SIN_READ"]["_pad"] = list(range(pad))   # OpSpecC.spec 으로 닿는 cfg 하위 dict
+    sim = nd.Simulator(cfg)
+    sim.run()
+    return nd.memory_report(sim.sch)
+
+
+def test_cfg_spec_dicts_are_not_counted():
+    small, big = _report(0), _report(50_000)
+    assert abs(big["addr.other"]["bytes"] - small["addr.other"]["bytes"]) < 10_000
+    assert abs(sum(v["bytes"] for v in big.values()) - sum(v["bytes"] for v in small.values())) < 10_000
@@ -0,0 +1,126 @@
+"""PageBitmap: 예전 Set[(block, page)] 모델과 비교."""
+import copy
+import pickle
+import random
+
+import pytest
+
+import nandsim_demo as nd
+from conftest import small_cfg
+
+
+DIES, PLANES, BLOCKS, PAGES = 2, 4, 24, 10
+
+
+def _apply(bm, ref, rng):
+    """임의 연산 하나를 bitmap 과 참조 set 모델에 동시에 적용."""
+    die = rng.randrange(DIES); block = rng.randrange(BLOCKS)
+    r = rng.random()
+    if r < 0.8:
+        page = rng.randrange(PAGES)
+        bm.add(die, block, page); ref[die].add((block, page))
+    elif r < 0.95:
+        bm.clear_block(die, block)
+        ref[die] = {pp for pp in ref[die] if pp[0] != block}
+    else:
+        bm.clear_die(die); ref[die].clear()
+
+
+def _plane_pages(ref, die, plane):
+    return {p for (b, p) in ref[die] if b % PLANES == plane}
+
+
+def test_add_contains_and_clear():
+    bm = nd.PageBitmap(DIES, PLANES, BLOCKS, PAGES)
+    bm.add(0, 5, 3); bm.add(0, 5, 3); bm.add(0, 9, 3); bm.add(1, 5, 7)
+    assert bm.contains(0, 5, 3) and bm.contains(0, 9, 3) and not bm.contains(0, 5, 4)
+    assert len(bm) == 3
+    assert bm.plane_pages(0, 5 % PLANES) == 1 << 3
+    bm.clear_block(0, 5)
+    assert not bm.contains(0, 5, 3) and bm.contains(0, 9, 3)
+    assert bm.plane_pages(0, 1) == 1 << 3          # block 9 도 plane 1
+    bm.clear_block(0, 9)
+    assert bm.plane_pages(0, 1) == 0
+    bm.clear_die(1)
+    assert len(bm) == 0 and bm.pairs(1) == set()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_set_model(seed):
+    rng = random.Random(seed)
+    bm = nd.PageBitmap(DIES, PLANES, BLOCKS, PAGES, track_order=True)
+    ref = [set() for _ in range(DIES)]
+    for _ in range(600):
+        _apply(bm, ref, rng)
+        die = rng.randrange(DIES)
+        assert bm.pairs(die) == ref[die]
+        assert len(bm) == sum(len(s) for s in ref)
+        for plane in range(PLANES):
+            assert set(nd.iter_bits(bm.plane_pages(die, plane))) == _plane_pages(ref, die, plane)
+            for page in range(PAGES):
+                blks = [b for (b, p) in ref[die] if p == page and b % PLANES == plane]
+                # set_order: 예전 `blks[0]`, lowest: min(blks)
+                assert bm.first_block_in_order(die, plane, page) == (blks[0] if blks else None)
+                assert bm.first_block_with_page(die, plane, page) == (min(blks) if blks else None)
+        planes = rng.sample(range(PLANES), rng.randint(1, PLANES))
+        common = set.intersection(*(_plane_pages(ref, die, pl) for pl in planes))
+        assert bm.common_pages(die, planes) == sorted(common)
+
+
+def test_read_block_pick_is_validated():
+    cfg = copy.deepcopy(nd.CFG)
+    cfg["addressing"]["read"]["block_pick"] = "random"
+    with pytest.raises(ValueError):
+        nd.compile_cfg(cfg)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_common_pages_cache_follows_program_and_erase(seed):
+    """AddressManager 의 PROGRAM/ERASE 예약 후 캐시된 common_pages 가 재계산 스캔과 같은지."""
+    cfg = small_cfg(dies=2, planes=4, blocks=24, pages_per_block=8)
+    am = nd.AddressManager(cfg)
+    pf = am.programmed_future
+    rng = random.Random(seed)
+    plane_sets = [[0], [1, 3], [0, 1, 2, 3], [2, 0]]
+    t = 0.0
+    for _ in range(400):
+        die = rng.randrange(am.dies); block = rng.randrange(am.blocks)
+        fut = int(am.addr_state_future[die, block])
+        if rng.random() < 0.05:
+            kind, page = am.kinds.ERASE, 0
+        elif fut < am.pages_per_block - 1:
+            kind, page = am.kinds.PROGRAM, fut + 1
+        else:
+            continue
+        op = nd.Operation(name=kind.name, base=kind, targets=[nd.Address(die, block % am.planes, block, page)], states=[])
+        am.register_future(op, t, t + 1.0)
+        if rng.random() < 0.5:
+            am.commit(op)
+        t += 1.0
+        for d in range(am.dies):
+            pairs = pf.pairs(d)
+            for planes in plane_sets:
+                expect = set.intersection(*({p for (b, p) in pairs if b % am.planes == pl} for pl in planes))
+                assert pf.common_pages(d, planes) == sorted(expect)
+                assert pf.common_pages(d, planes) == sorted(expect)   # 캐시 hit 경로
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_set_order_survives_copy_and_pickle(seed):
+    rng = random.Random(seed)
+    bm = nd.PageBitmap(DIES, PLANES, BLOCKS, PAGES, track_order=True)
+    ref = [set() for _ in range(DIES)]
+    for _ in range(400):
+        _apply(bm, ref, rng)
+    copies = [copy.deepcopy(bm), pickle.loads(pickle.dumps(bm))]
+    # 원본과 복사본에 같은 연산을 더 적용해도 set 순회 순서가 같아야 한다
+    for _ in range(101):
+        for other in copies:
+            for die in range(DIES):
+                assert list(other.order[die]) == list(bm.order[die])
+                assert len(other.order_log[die]) == len(other.order[die])   # 삽입 기록은 set 크기를 넘지 않는다
+                assert other.pairs(die) == bm.pairs(die)
+        st = rng.getstate()
+        for target in [bm] + copies:
+            rng.setstate(st)
+            _apply(target, [set() for _ in range(DIES)], rng)
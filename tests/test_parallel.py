@@ -0,0 +1,64 @@
+"""parallel.enabled: 근사 모드 (workers=1 은 직렬과 같은 row, workers>1 은 결정적이고 op 구성/개수 분포만 직렬과 비슷)."""
+import io
+from collections import Counter
+
+import pytest
+
+import nandsim_demo as nd
+from conftest import small_cfg
+
+
+def _cfg(dies: int, seed: int, parallel: bool, workers: int = 0, run_us: float = 4000.0):
+    cfg = small_cfg(dies=dies, run_until_us=run_us, seed=seed)
+    cfg["bootstrap"]["enabled"] = True
+    cfg["parallel"].update(enabled=parallel, workers=workers)
+    return cfg
+
+
+def _key(r):
+    return (r["start_us"], r["die"], r["plane"], r["op_name"], r["block"], r["page"])
+
+
+def test_single_worker_matches_serial():
+    ref = nd.simulate(_cfg(2, 7, False, run_us=4000.0))
+    got = nd.simulate(_cfg(2, 7, True, workers=1, run_us=4000.0))
+    assert [_key(r) for r in got.rows] == sorted(_key(r) for r in ref.rows)
+    assert got.stats["scheduled"] == ref.stats["scheduled"]
+    assert got.stats["parallel"] == {"workers": 1, "window_us": 50.0, "approximate": False}
+
+
+def test_partitions_are_deterministic_and_labelled_approximate():
+    a = nd.simulate(_cfg(2, 7, True))
+    b = nd.simulate(_cfg(2, 7, True))
+    assert [_key(r) for r in a.rows] == [_key(r) for r in b.rows]
+    assert a.stats["parallel"]["approximate"] is True
+    out = io.StringIO()
+    nd.configure_logging({"logging": {"level": "INFO", "async": False}}, stream=out)
+    nd.print_stats(a.t_end, a.stats)
+    nd.shutdown_logging()
+    assert "parallel      : workers=2 window_us=50.0 APPROXIMATE" in out.getvalue()
+
+
+@pytest.mark.parametrize("dies,seeds", [(2, (7, 11)), (4, (7,))])
+def test_partitions_match_serial_distribution(dies, seeds):
+    ser_ops, par_ops = Counter(), Counter()
+    ser_die, par_die = Counter(), Counter()
+    for seed in seeds:
+        ref = nd.simulate(_cfg(dies, seed, False))
+        got = nd.simulate(_cfg(dies, seed, True))
+        ser_ops.update(r["op_name"] for r in ref.rows); par_ops.update(r["op_name"] for r in got.rows)
+        ser_die.update(r["die"] for r in ref.rows); par_die.update(r["die"] for r in got.rows)
+    n_ser, n_par = sum(ser_ops.values()), sum(par_ops.values())
+    assert abs(n_par - n_ser) <= 0.1 * n_ser
+    # 뒤 partition 의 bootstrap 종료가 최대 2*(workers-1) window 늦게 보여 앞 die 의 policy 시작이 그만큼 밀린다
+    for die in range(dies):
+        assert abs(par_die[die] - ser_die[die]) <= 0.15 * ser_die[die]
+    for name in set(ser_ops) | set(par_ops):
+        assert abs(par_ops[name] / n_par - ser_ops[name] / n_ser) <= 0.02, name
+
+
+def test_window_shorter_than_bus_reach_rejected():
+    cfg = _cfg(2, 7, True)
+    cfg["parallel"]["window_us"] = 0.2
+    with pytest.raises(ValueError, match="bus reach"):
+        nd.simulate(cfg)
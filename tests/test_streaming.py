@@ -0,0 +1,64 @@
+"""iter_ops 스트리밍: run 과 같은 op 순서, 같은 종료 처리, 이력 버퍼 크기 상한."""
+import json
+
+import nandsim_demo as nd
+from conftest import small_cfg
+
+
+def _streaming_cfg(run_us: float):
+    cfg = small_cfg(run_until_us=run_us)
+    cfg["export"]["buffer_timeline"] = False
+    cfg["export"]["buffer_history"] = False
+    return cfg
+
+
+def _sched_rows(sch, t_end):
+    rows = []
+    gen = sch.iter_ops(t_end)
+    while True:
+        try:
+            rec = next(gen)
+        except StopIteration as stop:
+            return rows, stop.value
+        if rec["event"] == "sched":
+            rows.extend(rec["rows"])
+
+
+def test_iter_ops_matches_run_with_history_pruned():
+    ref = nd.Simulator(small_cfg(run_until_us=6000.0)).run(6000.0)
+    sim = nd.Simulator(_streaming_cfg(6000.0))
+    rows, st = _sched_rows(sim.sch, 6000.0)
+    assert rows == ref.rows
+    assert sim.logger.rows == [] and sim.rejlog.rows == []
+    assert st is sim.sch.final_stats
+    assert st["scheduled"] == ref.stats["scheduled"] and st["events"] == ref.stats["events"]
+    assert dict(sim.rejlog.stats) == dict(ref.rejlog.stats)
+
+
+def test_iter_ops_ticks_and_finalizes_telemetry(tmp_path):
+    path = tmp_path / "tel.jsonl"
+    cfg = _streaming_cfg(3000.0)
+    cfg["telemetry"].update(enabled=True, path=str(path), wall_interval_s=0.0, sim_interval_us=500.0)
+    sim = nd.Simulator(cfg)
+    _sched_rows(sim.sch, 3000.0)
+    recs = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(recs) > 2
+    assert recs[-1]["final"] and not any(r["final"] for r in recs[:-1])
+    assert recs[-1]["scheduled"] == sim.sch.final_stats["scheduled"]
+
+
+def test_history_buffers_stay_bounded():
+    def sizes(run_us):
+        sim = nd.Simulator(_streaming_cfg(run_us))
+        _sched_rows(sim.sch, run_us)
+        st, excl = sim.state_timeline, sim.sch.excl
+        return (sum(len(v) for v in st.by_plane.values()) + len(st._global_index)
+                + sum(len(v) for v in st._die_index.values()),
+                len(excl.global_windows) + sum(len(v) for v in excl.die_windows.values()),
+                sim.sch.final_stats["scheduled"])
+
+    seg_s, win_s, n_s = sizes(3000.0)
+    seg_l, win_l, n_l = sizes(12000.0)
+    assert n_l > 3 * n_s
+    assert seg_l <= 2 * seg_s + 64
+    assert win_l <= 2 * win_s + 16
@@ -0,0 +1,29 @@
+"""time_base=ticks: 코어 시각은 정수 tick 그대로, 출력 row 는 float 모드와 같다."""
+import nandsim_demo as nd
+from conftest import small_cfg
+
+
+def _cfg(time_base: str):
+    cfg = small_cfg(dies=2, run_until_us=4000.0)
+    cfg["bootstrap"]["enabled"] = True
+    cfg["time_base"] = time_base
+    return cfg
+
+
+def test_ticks_rows_match_float():
+    ref = nd.Simulator(_cfg("float")).run()
+    got = nd.Simulator(_cfg("ticks")).run()
+    assert got.rows == ref.rows
+    assert got.stats["scheduled"] == ref.stats["scheduled"]
+
+
+def test_ticks_core_state_stays_integer():
+    sim = nd.Simulator(_cfg("ticks"))
+    sch = sim.sch
+    sch.run_until(2000.0)
+    assert type(sch.now) is int and sch.now == sch.tb.key(sch.tb.us(sch.now))
+    assert all(type(t) is int for row in sch.addr.available for t in row)
+    segs = [s for lst in sim.state_timeline.by_plane.values() for s in lst]
+    assert segs and all(type(s.start_us) is int for s in segs)
+    assert all(type(it.ob.deadline_us) is int for it in sim.obl.heap)
+    assert all(type(t) is int for t in (sch.cc.hook_horizon_k, sch.cc.queue_refill_period_k))
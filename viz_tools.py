@@ -5,16 +5,14 @@
 # - plot_block_page_sequence_3d / plot_block_page_sequence_3d_by_die
 # - validate_timeline: rule-checker (duplicates, read-before-program, busy overlaps)
 #
-# Requirements: pandas, matplotlib
+# Requirements: pandas, matplotlib (함수 안에서 지연 import: 시뮬레이션 코어만 쓰는 headless 실행은 로드하지 않음)
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Sequence, Tuple
-import pandas as pd
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
-import matplotlib.patches as mpatches
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 import os, json, math, csv
+if TYPE_CHECKING:
+    import pandas as pd
 
 # -------------------- Colors (can be customized) --------------------
 DEFAULT_COLORS = {
@@ -66,14 +64,15 @@ class TimelineLogger:
                 "page":     int(page),
                 "op_name":     label,          # alias-aware (SIN_/MUL_ for multi/single)
                 "op_base": op.base.name,  # ERASE/PROGRAM/READ/DOUT/SR/...
-                "source":   op.meta.get("source"),
-                "op_uid":   int(op.meta.get("uid", -1)),
-                "arity":    int(op.meta.get("arity", 1)),
-                "phase_key_used": op.meta.get("phase_key_used"),
-                "state_key_at_schedule": op.meta.get("state_key_at_schedule"),
+                "source":   op.source,
+                "op_uid":   op.uid if op.uid is not None else -1,
+                "arity":    int(op.arity),
+                "phase_key_used": op.phase_key_used,
+                "state_key_at_schedule": op.state_key_at_schedule,
             })
 
     def to_dataframe(self) -> pd.DataFrame:
+        import pandas as pd
         df = pd.DataFrame(self.rows)
         if not df.empty:
             df = df.sort_values(["die", "block", "start_us", "end_us"]).reset_index(drop=True)
@@ -95,6 +94,8 @@ def plot_gantt(df: pd.DataFrame,
     """
     Gantt-like timeline: y=(die, block), x=time(us), color=op_base.
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
     if df.empty:
         print("[plot_gantt] empty dataframe"); return
     d = df if die is None else df[df["die"] == die]
@@ -171,6 +172,8 @@ def plot_block_page_sequence_3d(df: pd.DataFrame,
         * "global_die": seq_global_die (die 전체 순번)
     - 동일 block 내 포인트들을 얇은 선으로 연결하여 '흐름'을 표시(draw_lines=True).
     """
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
     if df.empty:
         print("[plot_block_page_sequence_3d] empty dataframe"); return
 
@@ -455,6 +458,7 @@ def print_validation_report(report: Dict[str, Any], max_rows: int = 20):
               f"time=({isu.t0:.2f},{isu.t1:.2f})  {isu.detail}")
 
 def violations_to_dataframe(report: Dict[str, Any]) -> pd.DataFrame:
+    import pandas as pd
     rows = []
     for isu in report.get("issues", []):
         rows.append({
@@ -494,6 +498,7 @@ def pattern_build_ops_from_timeline(df: pd.DataFrame, cfg: Dict[str, Any]) -> Li
     - time은 그룹의 start_us 최소값에 time.scale/round_decimals 적용
     - payload는 CFG.pattern_export.payload 규칙 적용
     """
+    import pandas as pd
     pe = _get_pattern_cfg(cfg)
     if df is None or df.empty:
         return []
@@ -701,6 +706,7 @@ def pattern_split_rows(rows: List[Dict[str, Any]], cfg: Dict[str, Any]) -> List[
     return parts
 
 def pattern_rows_to_dataframe(rows: List[Dict[str, Any]], cfg: Dict[str, Any]) -> pd.DataFrame:
+    import pandas as pd
     pe = _get_pattern_cfg(cfg)
     cols = list(pe.get("columns", ["seq","time","op_id","op_name","payload"]))
     time_col = pe.get("time", {}).get("out_col", "time")
@@ -772,6 +778,7 @@ def plot_target_heatmap(df: pd.DataFrame,
     kinds: 필터할 op_base 목록 (예: ("PROGRAM","READ")); None이면 전체 사용
     dies: None이면 모든 die 포함, 아니면 지정한 die만 포함
     """
+    import matplotlib.pyplot as plt
     if df is None or df.empty:
         print("[plot_target_heatmap] empty dataframe"); return None, None
     d = df.copy()
@@ -836,6 +843,7 @@ def plot_target_heatmap(df: pd.DataFrame,
 
 # -------------------- Target Address Statistics --------------------
 def _weighted_quantile(values: pd.Series, weights: pd.Series, q: float) -> float:
+    import pandas as pd
     if values.empty:
         return float("nan")
     d = pd.DataFrame({"v": values.astype(float), "w": weights.astype(float)})
@@ -870,6 +878,7 @@ def compute_block_usage_stats(df: pd.DataFrame,
       - summary_die: die, op_base, metrics...
       - summary_die_plane: die, plane, op_base, metrics...
     """
+    import pandas as pd
     out: Dict[str, pd.DataFrame] = {}
     if df is None or df.empty:
         out["detail"] = pd.DataFrame()
@@ -957,6 +966,7 @@ def compute_block_usage_stats(df: pd.DataFrame,
     return out
 
 def save_block_usage_stats(stats: Dict[str, pd.DataFrame], prefix: str = "block_usage") -> List[str]:
+    import pandas as pd
     paths: List[str] = []
     detail = stats.get("detail")
     if isinstance(detail, pd.DataFrame) and not detail.empty: